@@ -1,28 +1,66 @@
 import os
-from dotenv import load_dotenv
+import sys
+import functools
+from dotenv import dotenv_values
 from utils.file_tools import paths
 
+ENV_LOADED_FLAG = "ARENALAB_ENV_LOADED"
+
+
+@functools.cache
+def _load_env_once():
+	"""
+	Load environment variables from the secrets file once per process tree.
+
+	Child processes (uvicorn workers, reloaders) inherit the flag through the
+	environment and skip re-reading the file. Variables already set in the
+	environment take precedence over the file, as with load_dotenv().
+	"""
+	if os.environ.get(ENV_LOADED_FLAG):
+		return
+
+	# First try the main env file in workspace, fallback to development env file
+	values = dotenv_values(os.path.join(paths.CONFIG_DIR, "secrets.env"))
+	if not values:
+		values = dotenv_values("../config/.env.development")
+
+	os.environ.update({k: v for k, v in values.items() if v is not None and k not in os.environ})
+	os.environ.setdefault(ENV_LOADED_FLAG, "1")
+
+
 # Load enviornment variables
-# First try the main env file in workspace
-env_path = os.path.join(paths.CONFIG_DIR, "secrets.env")
-if os.path.exists(env_path):
-	load_dotenv(env_path)
-else:
-	# Fallback to development env file
-	load_dotenv("../config/.env.development")
+_load_env_once()
 
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi import APIRouter
-from fastapi.responses import RedirectResponse, StreamingResponse, Response
-from db import users
-from auth import hash_password
-from routers import auth_router, experiments_router, runs_router, settings_router, revisions_router, environments_router, files_router, plugins_router
-import os
-import httpx
+from fastapi.responses import RedirectResponse, StreamingResponse, Response, JSONResponse
+from starlette.background import BackgroundTask
+import importlib
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+	"""Mount the routers, then bootstrap in the background so requests are served right away"""
+	include_routers()
+	_init_tb_client(app)
+	bootstrap_task = asyncio.create_task(asyncio.to_thread(_bootstrap))
+	bootstrap_task.add_done_callback(_report_bootstrap_error)
+	app.state.bootstrap_task = bootstrap_task
+	# Plugin files are loaded in a thread, the plugins router waits for it
+	app.state.plugins_future = asyncio.get_running_loop().run_in_executor(None, _discover_plugins)
+	try:
+		yield
+	finally:
+		bootstrap_task.cancel()
+		await app.state.tb_client.aclose()
+		await asyncio.to_thread(_cleanup_runs)
 
 
 app = FastAPI(
+	lifespan=lifespan,
 	title="ArenaLab API",
 	description="""
 	ArenaLab is a platform designed to simplify experimentation with **Unity ML-Agents**.
@@ -82,26 +120,63 @@ app = FastAPI(
 		}
 	]
 )
+# Explicit origins (comma separated in CORS_ORIGINS); a "*" wildcard can't be combined with credentials
+ALLOWED_ORIGINS = sorted(set(filter(None, (
+	origin.strip() for origin in os.getenv("CORS_ORIGINS", "http://localhost:3000").split(",")
+))))
+
 app.add_middleware(
 	CORSMiddleware,
-	allow_origins=["*"],
+	allow_origins=ALLOWED_ORIGINS,
 	allow_credentials=True,
 	allow_methods=["*"],
 	allow_headers=["*"],
 )
 
 
-# Routers
-api_router = APIRouter(prefix="/api")
-api_router.include_router(auth_router.router)
-api_router.include_router(experiments_router.router)
-api_router.include_router(runs_router.router)
-api_router.include_router(settings_router.router)
-api_router.include_router(revisions_router.router)
-api_router.include_router(environments_router.router)
-api_router.include_router(files_router.router)
-api_router.include_router(plugins_router.router)
-app.include_router(api_router)
+# Routers (module, attribute), imported at startup instead of at module import
+ROUTERS = [
+	("routers.auth_router", "router"),
+	("routers.experiments_router", "router"),
+	("routers.runs_router", "router"),
+	("routers.settings_router", "router"),
+	("routers.revisions_router", "router"),
+	("routers.environments_router", "router"),
+	("routers.files_router", "router"),
+	("routers.plugins_router", "router"),
+]
+
+
+@functools.cache
+def include_routers():
+	"""Import the API routers and mount them under /api (only the first call does work)"""
+	api_router = APIRouter(prefix="/api")
+	for module_name, attr in ROUTERS:
+		module = importlib.import_module(module_name)
+		api_router.include_router(getattr(module, attr))
+	app.include_router(api_router)
+	# Drop any schema generated before the routers were mounted
+	app.openapi_schema = None
+
+
+
+def _cleanup_runs():
+	"""Stop the training processes still running, if the runner was loaded"""
+	runner = sys.modules.get("runner")
+	if runner is not None:
+		runner.cleanup_all_runs()
+
+
+_httpx = None
+
+
+def _get_httpx():
+	"""Import httpx on first use, it is only needed by the TensorBoard proxy"""
+	global _httpx
+	if _httpx is None:
+		import httpx
+		_httpx = httpx
+	return _httpx
 
 
 # Next.js now serves frontend on port 3000, no static file serving needed
@@ -112,74 +187,86 @@ def root():
 	return {"status": "ok", "message": "ArenaLab API is running"}
 
 
-@app.api_route("/tb", methods=["GET", "POST", "PUT", "DELETE", "PATCH", "OPTIONS", "HEAD"])
-async def tb_root(request: Request):
-	"""Proxy requests to TensorBoard root"""
-	# When TensorBoard uses --path_prefix=/tb, we need to forward /tb to /tb/ (with trailing slash)
-	tensorboard_url = "http://localhost:6006/tb/"
+@app.get("/ready")
+def ready(request: Request):
+	"""Readiness check, OK once the startup bootstrap has finished"""
+	task = getattr(request.app.state, "bootstrap_task", None)
+	if task is None or not task.done():
+		return JSONResponse({"status": "starting"}, status_code=503)
+	if task.cancelled() or task.exception() is not None:
+		return JSONResponse({"status": "error", "message": "Startup bootstrap failed"}, status_code=503)
+	return {"status": "ready"}
 
-	# Forward query parameters
-	if request.url.query:
-		tensorboard_url += f"?{request.url.query}"
 
-	async with httpx.AsyncClient() as client:
-		response = await client.request(
-			method=request.method,
-			url=tensorboard_url,
-			headers={key: value for key, value in request.headers.items() if key.lower() not in ['host', 'content-length']},
-			content=await request.body(),
-			follow_redirects=True
-		)
-		content = await response.aread()
-		filtered_headers = {key: value for key, value in response.headers.items()
-		                   if key.lower() not in ['content-encoding', 'transfer-encoding', 'connection', 'content-length']}
-		return Response(
-			content=content,
-			status_code=response.status_code,
-			headers=filtered_headers,
-			media_type=response.headers.get("content-type")
-		)
+# TensorBoard runs with --path_prefix=/tb on port 6006
+TENSORBOARD_URL = "http://localhost:6006"
+
+# Headers not forwarded to TensorBoard / back to the client, as lowercase raw header names
+_REQUEST_SKIP_HEADERS = frozenset({b"host", b"content-length"})
+_RESPONSE_SKIP_HEADERS = frozenset({b"transfer-encoding", b"connection", b"content-length"})
+
 
+def _init_tb_client(app: FastAPI):
+	"""Create the shared HTTP client used by the TensorBoard proxy"""
+	httpx = _get_httpx()
+	# TensorBoard's server only speaks HTTP/1.1, so requests share a pool of keep-alive connections
+	app.state.tb_client = httpx.AsyncClient(
+		base_url=TENSORBOARD_URL,
+		timeout=httpx.Timeout(30.0),
+		limits=httpx.Limits(max_keepalive_connections=32)
+	)
 
-@app.api_route("/tb/{path:path}", methods=["GET", "POST", "PUT", "DELETE", "PATCH", "OPTIONS", "HEAD"])
-async def tensorboard_proxy(request: Request, path: str):
+
+async def _forward_to_tensorboard(request: Request, tensorboard_path: str) -> StreamingResponse:
+	"""Forward a request to TensorBoard and stream its response back without buffering it"""
+	client = request.app.state.tb_client
+	upstream_request = client.build_request(
+		method=request.method,
+		url=tensorboard_path,
+		params=request.query_params,
+		# ASGI header names are already lowercase bytes, so they are filtered without decoding
+		headers=[(key, value) for key, value in request.headers.raw if key not in _REQUEST_SKIP_HEADERS],
+		content=await request.body()
+	)
+	upstream = await client.send(upstream_request, stream=True, follow_redirects=True)
+
+	response = StreamingResponse(
+		upstream.aiter_raw(),
+		status_code=upstream.status_code,
+		background=BackgroundTask(upstream.aclose)
+	)
+	# Raw (still encoded) bytes are relayed, so content-encoding is kept. Repeated
+	# headers such as set-cookie are copied one by one instead of being merged
+	response.raw_headers.extend(
+		(name, value) for key, value in upstream.headers.raw
+		if (name := key.lower()) not in _RESPONSE_SKIP_HEADERS
+	)
+	return response
+
+
+@app.api_route("/tb{path:path}", methods=["GET", "POST", "PUT", "DELETE", "PATCH", "OPTIONS", "HEAD"], include_in_schema=False)
+async def tensorboard_proxy(request: Request, path: str = ""):
 	"""Proxy requests to TensorBoard running on port 6006"""
-	# TensorBoard is configured with --path_prefix=/tb, so forward /tb/{path} to http://localhost:6006/tb/{path}
-	tensorboard_url = f"http://localhost:6006/tb/{path}"
-
-	# Forward query parameters
-	if request.url.query:
-		tensorboard_url += f"?{request.url.query}"
-
-	async with httpx.AsyncClient() as client:
-		# Forward the request to TensorBoard
-		response = await client.request(
-			method=request.method,
-			url=tensorboard_url,
-			headers={key: value for key, value in request.headers.items() if key.lower() not in ['host', 'content-length']},
-			content=await request.body(),
-			follow_redirects=True
-		)
+	# TensorBoard is configured with --path_prefix=/tb, so forward /tb{path} to http://localhost:6006/tb{path}
+	# and /tb to /tb/ (with trailing slash)
+	return await _forward_to_tensorboard(request, "/tb" + (path or "/"))
 
-		# Read the full response content
-		content = await response.aread()
 
-		# Return the response with appropriate headers
-		filtered_headers = {key: value for key, value in response.headers.items()
-		                   if key.lower() not in ['content-encoding', 'transfer-encoding', 'connection', 'content-length']}
+def _report_bootstrap_error(task: asyncio.Task):
+	if not task.cancelled() and task.exception() is not None:
+		print(f"[bootstrap] Error: {task.exception()!r}")
 
-		return Response(
-			content=content,
-			status_code=response.status_code,
-			headers=filtered_headers,
-			media_type=response.headers.get("content-type")
-		)
 
+def _bootstrap():
+	"""Create the indexes and the admin user, run in a worker thread at startup"""
+	from db import users, ensure_indexes
+	from auth import hash_password
+
+	ensure_indexes()
+	_init_plugin_db()
 
-@app.on_event("startup")
-def on_start():
 	# bootstrap admin
-	if users.count_documents({}) == 0:
+	if users.estimated_count() == 0:
 		email = os.getenv("ADMIN_EMAIL")
 		pw = os.getenv("ADMIN_PASSWORD")
 
@@ -194,11 +281,28 @@ def on_start():
 			role="admin"
 		)
 		print(f"[bootstrap] Admin creado: {email}")
-	
-	# Initialize plugins (auto-discovery happens on import)
+
+
+
+def _init_plugin_db():
+	"""Create the plugin collections' indexes, skipped if the plugin package can't be imported"""
+	try:
+		from plugins.core.database import init_plugin_db
+	except ImportError:
+		print("[bootstrap] Warning: Could not initialize plugin database")
+		return
+	init_plugin_db()
+
+
+def _discover_plugins():
+	"""Load the plugin files, run in a worker thread at startup"""
 	try:
-		from plugins import list_plugins
+		from plugins import discover_plugins, list_plugins
+		discover_plugins()
 		registered_plugins = list_plugins()
 		print(f"[bootstrap] Registered {len(registered_plugins)} plugins: {', '.join(registered_plugins)}")
 	except ImportError:
-		print("[bootstrap] Warning: Could not initialize plugins")
\ No newline at end of file
+		print("[bootstrap] Warning: Could not initialize plugins")
+	except Exception as e:
+		# The plugins router awaits this, a failure here would fail every plugins request
+		print(f"[bootstrap] Warning: Plugin discovery failed: {e}")
\ No newline at end of file
@@ -1,40 +1,92 @@
 import os
-from datetime import datetime, timedelta
-from typing import Optional
+import time
+import asyncio
+import functools
+from typing import Optional, Dict, Any, Tuple
 from jose import jwt, JWTError
-from passlib.hash import argon2
+from argon2 import PasswordHasher
+from argon2.exceptions import VerificationError, InvalidHashError
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from db import users
 
 
 ALGO = "HS256"
+ALGOS = (ALGO,)
 SCHEME = HTTPBearer()
 
 
+@functools.cache
+def _jwt_secret() -> str:
+	# Read on first use rather than at import, so the env file is loaded by then
+	return os.getenv("JWT_SECRET", "devsecret")
+
+
+# Hashes carry their own parameters, so existing hashes keep verifying if these change
+_PASSWORD_HASHER = PasswordHasher(time_cost=2, memory_cost=64 * 1024, parallelism=1)
+
+
+# Short-lived cache of user documents by email, so authenticated requests don't
+# hit MongoDB every time. Kept short so role/status changes propagate quickly.
+USER_CACHE_TTL = 30  # seconds
+USER_CACHE_MAXSIZE = 4096
+_user_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+
+# Fields of the user document needed by authenticated endpoints (never the password hash)
+USER_PROJECTION = {"email": 1, "name": 1, "role": 1, "created_at": 1, "last_login": 1, "is_active": 1}
+
+
+def _get_cached_user(email: str) -> Optional[Dict[str, Any]]:
+	entry = _user_cache.get(email)
+	if entry is None:
+		return None
+	expires_at, user = entry
+	if expires_at < time.monotonic():
+		_user_cache.pop(email, None)
+		return None
+	return user
+
+
+def _cache_user(email: str, user: Dict[str, Any]) -> None:
+	if len(_user_cache) >= USER_CACHE_MAXSIZE:
+		# Evict the oldest entry (dicts keep insertion order)
+		_user_cache.pop(next(iter(_user_cache)), None)
+	_user_cache[email] = (time.monotonic() + USER_CACHE_TTL, user)
+
+
+def invalidate_user(email: str) -> None:
+	"""Drop a user from the auth cache, call after updating or deleting the user"""
+	_user_cache.pop(email, None)
+
+
 def hash_password(pw: str) -> str:
-	return argon2.hash(pw)
+	return _PASSWORD_HASHER.hash(pw)
 
 
 def verify_password(pw: str, hashed: str) -> bool:
-	return argon2.verify(pw, hashed)
+	try:
+		return _PASSWORD_HASHER.verify(hashed, pw)
+	except (VerificationError, InvalidHashError):
+		return False
 
 
 def create_access_token(sub: str, expires_minutes: int = 1440) -> str:
-	secret = os.getenv("JWT_SECRET", "devsecret")
-	exp = datetime.utcnow() + timedelta(minutes=expires_minutes)
-	return jwt.encode({"sub": sub, "exp": exp}, secret, algorithm=ALGO)
+	exp = int(time.time()) + expires_minutes * 60
+	return jwt.encode({"sub": sub, "exp": exp}, _jwt_secret(), algorithm=ALGO)
 
 
 async def get_current_user(token: HTTPAuthorizationCredentials = Depends(SCHEME)):
-	secret = os.getenv("JWT_SECRET", "devsecret")
 	try:
-		payload = jwt.decode(token.credentials, secret, algorithms=[ALGO])
+		payload = jwt.decode(token.credentials, _jwt_secret(), algorithms=ALGOS)
 		email = payload.get("sub")
 	except JWTError:
 		raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token inválido")
 	
-	user = users.find_by_email(email)
-	if not user:
-		raise HTTPException(status_code=401, detail="Usuario no encontrado")
+	user = _get_cached_user(email)
+	if user is None:
+		# Only a cache miss goes to Mongo, in a thread so the event loop keeps serving
+		user = await asyncio.to_thread(users.find_by_email, email, projection=USER_PROJECTION)
+		if not user:
+			raise HTTPException(status_code=401, detail="Usuario no encontrado")
+		_cache_user(email, user)
 	return user
\ No newline at end of file
@@ -1,5 +1,5 @@
 import os
-from pymongo import MongoClient, ASCENDING
+from pymongo import MongoClient, ASCENDING, DESCENDING, ReturnDocument
 from pymongo.collection import Collection
 from typing import Dict, Any, Optional, List
 from datetime import datetime
@@ -15,19 +15,32 @@ def get_db():
 	if _db is None:
 		uri = os.getenv("MONGODB_URI", "mongodb://localhost:27017")
 		name = os.getenv("MONGO_DB", "mlagents_lab")
-		_client = MongoClient(uri)
+		# The only client of the process: every collection, plugins included, shares its pool
+		_client = MongoClient(
+			uri,
+			maxPoolSize=int(os.getenv("MONGO_MAX_POOL_SIZE", "100")),
+			# Keep a few connections open so bursts after idle periods don't pay connection setup
+			minPoolSize=int(os.getenv("MONGO_MIN_POOL_SIZE", "5")),
+			appname="arenalab",
+		)
 		_db = _client[name]
-		
-		# Create indexes
-		_db.experiments.create_index([("name", ASCENDING)], unique=False)
-		_db.runs.create_index([("experiment_id", ASCENDING)])
-		_db.users.create_index([("email", ASCENDING)], unique=True)
-		_db.revisions.create_index([("experiment_id", ASCENDING)])
-		_db.environments.create_index([("name", ASCENDING)])
-		
 	return _db
 
 
+def ensure_indexes():
+	"""Create the indexes used by the application (called once at app startup)"""
+	db = get_db()
+	db.experiments.create_index([("name", ASCENDING)], unique=False)
+	db.runs.create_index([("experiment_id", ASCENDING)])
+	db.users.create_index([("email", ASCENDING)], unique=True)
+	db.revisions.create_index([("experiment_id", ASCENDING)])
+	db.revisions.create_index([("experiment_id", ASCENDING), ("version", DESCENDING)])
+	# Latest revision of an experiment (plugin API)
+	db.revisions.create_index([("experiment_id", ASCENDING), ("created_at", DESCENDING)], name="exp_created_desc")
+	db.environments.create_index([("name", ASCENDING)])
+	db.environments.create_index([("name", ASCENDING), ("version", DESCENDING)])
+
+
 class BaseCollection:
 	"""Base class for MongoDB collection operations"""
 	
@@ -35,20 +48,31 @@ class BaseCollection:
 		self.db = get_db()
 		self.collection: Collection = self.db[collection_name]
 	
-	def find_one(self, filter_dict: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-		return self.collection.find_one(filter_dict)
+	def find_one(self, filter_dict: Dict[str, Any], projection: Dict[str, Any] = None) -> Optional[Dict[str, Any]]:
+		return self.collection.find_one(filter_dict, projection)
 	
-	def find_many(self, filter_dict: Dict[str, Any] = None, limit: int = None) -> List[Dict[str, Any]]:
-		cursor = self.collection.find(filter_dict or {})
+	def find_many(self, filter_dict: Dict[str, Any] = None, limit: int = None,
+				  projection: Dict[str, Any] = None) -> List[Dict[str, Any]]:
+		cursor = self.collection.find(filter_dict or {}, projection)
 		if limit:
 			cursor = cursor.limit(limit)
 		return list(cursor)
 	
 	def insert_one(self, document: Dict[str, Any]) -> str:
-		if "_id" not in document:
-			document["_id"] = str(ObjectId())
-		result = self.collection.insert_one(document)
-		return str(result.inserted_id)
+		# _id is stored as the ObjectId hex string: routers, services, plugins and
+		# workspace directory names all use string ids, and existing data does too
+		document.setdefault("_id", str(ObjectId()))
+		self.collection.insert_one(document)
+		return str(document["_id"])
+	
+	def insert_many(self, documents: List[Dict[str, Any]]) -> List[str]:
+		"""Insert several documents in a single round trip, returns their ids"""
+		if not documents:
+			return []
+		for document in documents:
+			document.setdefault("_id", str(ObjectId()))
+		self.collection.insert_many(documents, ordered=False)
+		return [str(document["_id"]) for document in documents]
 	
 	def update_one(self, filter_dict: Dict[str, Any], update_dict: Dict[str, Any]) -> bool:
 		result = self.collection.update_one(filter_dict, {"$set": update_dict})
@@ -58,8 +82,53 @@ class BaseCollection:
 		result = self.collection.delete_one(filter_dict)
 		return result.deleted_count > 0
 	
+	def delete_many(self, filter_dict: Dict[str, Any]) -> int:
+		result = self.collection.delete_many(filter_dict)
+		return result.deleted_count
+	
 	def count_documents(self, filter_dict: Dict[str, Any] = None) -> int:
 		return self.collection.count_documents(filter_dict or {})
+	
+	def estimated_count(self) -> int:
+		"""Document count from collection metadata, without scanning"""
+		return self.collection.estimated_document_count()
+	
+	def toggle_field(self, document_id: str, field: str) -> bool:
+		"""Atomically flip a boolean field (missing counts as False) in a single update"""
+		result = self.collection.update_one(
+			{"_id": document_id},
+			[{"$set": {field: {"$not": [f"${field}"]}}}]
+		)
+		return result.matched_count > 0
+	
+	def next_version(self, counter_id: str, filter_dict: Dict[str, Any]) -> int:
+		"""
+		Atomically get the next version number from the counters collection.
+		
+		The counter is seeded from the highest existing version matching filter_dict
+		the first time it is used, so data created before counters existed keeps
+		counting from where it was.
+		"""
+		counters = self.db.counters
+		counter = counters.find_one_and_update(
+			{"_id": counter_id},
+			{"$inc": {"seq": 1}},
+			return_document=ReturnDocument.AFTER
+		)
+		if counter is None:
+			last = self.collection.find_one(filter_dict, sort=[("version", -1)], projection={"version": 1})
+			# $max keeps concurrent seeders from moving the counter backwards
+			counters.update_one(
+				{"_id": counter_id},
+				{"$max": {"seq": last["version"] if last else 0}},
+				upsert=True
+			)
+			counter = counters.find_one_and_update(
+				{"_id": counter_id},
+				{"$inc": {"seq": 1}},
+				return_document=ReturnDocument.AFTER
+			)
+		return counter["seq"]
 
 
 class UsersCollection(BaseCollection):
@@ -68,11 +137,13 @@ class UsersCollection(BaseCollection):
 	def __init__(self):
 		super().__init__("users")
 	
-	def find_by_email(self, email: str) -> Optional[Dict[str, Any]]:
-		return self.find_one({"email": email})
+	def find_by_email(self, email: str, projection: Dict[str, Any] = None) -> Optional[Dict[str, Any]]:
+		return self.find_one({"email": email}, projection)
 	
-	def create_user(self, email: str, name: str, password_hash: str, role: str = "user") -> str:
-		user_doc = {
+	@staticmethod
+	def _user_document(email: str, name: str, password_hash: str, role: str = "user") -> Dict[str, Any]:
+		return {
+			"_id": str(ObjectId()),
 			"email": email,
 			"name": name,
 			"password_hash": password_hash,
@@ -81,7 +152,13 @@ class UsersCollection(BaseCollection):
 			"last_login": None,
 			"is_active": True
 		}
-		return self.insert_one(user_doc)
+	
+	def create_user(self, email: str, name: str, password_hash: str, role: str = "user") -> str:
+		return self.insert_one(self._user_document(email, name, password_hash, role))
+	
+	def create_users(self, users: List[Dict[str, Any]]) -> List[str]:
+		"""Create several users (dicts with the create_user arguments) in one round trip"""
+		return self.insert_many([self._user_document(**user) for user in users])
 	
 	def update_last_login(self, user_id: str) -> bool:
 		return self.update_one(
@@ -96,8 +173,8 @@ class ExperimentsCollection(BaseCollection):
 	def __init__(self):
 		super().__init__("experiments")
 	
-	def find_by_name(self, name: str) -> Optional[Dict[str, Any]]:
-		return self.find_one({"name": name})
+	def find_by_name(self, name: str, projection: Dict[str, Any] = None) -> Optional[Dict[str, Any]]:
+		return self.find_one({"name": name}, projection)
 	
 	def create_experiment(self, name: str, description: str = "", tags: List[str] = None, enabled_plugins: List[dict] = None) -> str:
 		exp_doc = {
@@ -113,11 +190,7 @@ class ExperimentsCollection(BaseCollection):
 	
 	def toggle_favorite(self, experiment_id: str) -> bool:
 		"""Toggle the favorite status of an experiment"""
-		experiment = self.find_one({"_id": experiment_id})
-		if not experiment:
-			return False
-		new_status = not experiment.get("is_favorite", False)
-		return self.update_one({"_id": experiment_id}, {"is_favorite": new_status})
+		return self.toggle_field(experiment_id, "is_favorite")
 
 
 class RunsCollection(BaseCollection):
@@ -160,11 +233,7 @@ class RunsCollection(BaseCollection):
 	
 	def toggle_favorite(self, run_id: str) -> bool:
 		"""Toggle the favorite status of a run"""
-		run = self.find_one({"_id": run_id})
-		if not run:
-			return False
-		new_status = not run.get("is_favorite", False)
-		return self.update_one({"_id": run_id}, {"is_favorite": new_status})
+		return self.toggle_field(run_id, "is_favorite")
 
 
 class RevisionsCollection(BaseCollection):
@@ -181,11 +250,7 @@ class RevisionsCollection(BaseCollection):
 						yaml_path: str, environment_id: str,
 						cli_flags: Dict[str, Any] = None) -> str:
 		# Get next version number
-		last_revision = self.collection.find_one(
-			{"experiment_id": experiment_id}, 
-			sort=[("version", -1)]
-		)
-		version = (last_revision["version"] + 1) if last_revision else 1
+		version = self.next_version(f"revisions:{experiment_id}", {"experiment_id": experiment_id})
 		
 		revision_doc = {
 			"version": version,
@@ -204,11 +269,7 @@ class RevisionsCollection(BaseCollection):
 	
 	def toggle_favorite(self, revision_id: str) -> bool:
 		"""Toggle the favorite status of a revision"""
-		revision = self.find_one({"_id": revision_id})
-		if not revision:
-			return False
-		new_status = not revision.get("is_favorite", False)
-		return self.update_one({"_id": revision_id}, {"is_favorite": new_status})
+		return self.toggle_field(revision_id, "is_favorite")
 
 
 class EnvironmentsCollection(BaseCollection):
@@ -217,16 +278,12 @@ class EnvironmentsCollection(BaseCollection):
 	def __init__(self):
 		super().__init__("environments")
 	
-	def find_by_name(self, name: str) -> Optional[Dict[str, Any]]:
-		return self.find_one({"name": name})
+	def find_by_name(self, name: str, projection: Dict[str, Any] = None) -> Optional[Dict[str, Any]]:
+		return self.find_one({"name": name}, projection)
 	
 	def create_environment(self, name: str, description: str, file_info: dict = None, env_path: str = None, git_commit_url: str = None) -> str:
 		# Get next version number for this name
-		last_env = self.collection.find_one(
-			{"name": name}, 
-			sort=[("version", -1)]
-		)
-		version = (last_env["version"] + 1) if last_env else 1
+		version = self.next_version(f"environments:{name}", {"name": name})
 		
 		env_doc = {
 			"version": version,
@@ -282,13 +339,24 @@ class SettingsCollection(BaseCollection):
 		return result.upserted_id is not None or result.modified_count > 0
 
 
-# Collection instances for easy access
-users = UsersCollection()
-experiments = ExperimentsCollection()
-runs = RunsCollection()
-revisions = RevisionsCollection()
-environments = EnvironmentsCollection()
-settings = SettingsCollection()
+# Collection instances for easy access, created on first attribute access
+# (`from db import users` works as usual) so importing db doesn't touch MongoDB
+_COLLECTIONS = {
+	"users": UsersCollection,
+	"experiments": ExperimentsCollection,
+	"runs": RunsCollection,
+	"revisions": RevisionsCollection,
+	"environments": EnvironmentsCollection,
+	"settings": SettingsCollection,
+}
+
+
+def __getattr__(name: str):
+	collection_class = _COLLECTIONS.get(name)
+	if collection_class is None:
+		raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+	instance = globals()[name] = collection_class()
+	return instance
 
 # Plugin collections will be added dynamically when plugin system initializes
 # This avoids circular imports while keeping the plugin system separate
\ No newline at end of file
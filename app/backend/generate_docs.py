@@ -8,157 +8,223 @@ This script generates OpenAPI documentation and can export it to various formats
 import json
 import yaml
 import argparse
+from collections import Counter
+import functools
+import hashlib
 from pathlib import Path
 import sys
+import warnings
+
+try:
+    import orjson
+except ImportError:  # optional, only speeds up writing the JSON files
+    orjson = None
 
 # Add the current directory to Python path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from app import app
+from app import app, include_routers
+
+# Routers are normally mounted at startup, which doesn't run here
+include_routers()
+
+# Invariant parts of the Postman collection, shared by every generated item
+_POSTMAN_HEADER = [{"key": "Content-Type", "value": "application/json", "type": "text"}]
+_POSTMAN_HOST = ["{{base_url}}"]
+_POSTMAN_RAW_JSON_OPTIONS = {"raw": {"language": "json"}}
+_POSTMAN_AUTH = {
+    "type": "bearer",
+    "bearer": [{"key": "token", "value": "{{auth_token}}", "type": "string"}]
+}
+_POSTMAN_VARIABLES = [
+    {"key": "base_url", "value": "http://localhost:8000", "type": "string"},
+    {"key": "auth_token", "value": "", "type": "string"}
+]
+_BODY_METHODS = frozenset({"POST", "PUT", "PATCH"})
+
+# Each output file has the signature it was last generated from next to it, as .<name>.sig
+SIGNATURE_SUFFIX = ".sig"
+
+
+def _iter_routes(routes, prefix: str = ""):
+    """Yield (path, route) for all routes, descending into included routers"""
+    for route in routes:
+        router = getattr(route, "original_router", None)
+        if router is not None:
+            yield from _iter_routes(router.routes, prefix + getattr(router, "prefix", ""))
+        else:
+            yield prefix + route.path, route
+
+
+def routes_signature() -> str:
+    """
+    Hash the app routes and the source files of every backend module loaded.
+
+    The schema is built from those modules (routers, models, request body
+    helpers, the app metadata in app.py, ...), so any change to them changes
+    the signature and unchanged docs can be detected without building it.
+    """
+    entries = []
+    for path, route in _iter_routes(app.routes):
+        endpoint = getattr(route, "endpoint", None)
+        methods = sorted(getattr(route, "methods", None) or [])
+        entries.append((path, methods, getattr(endpoint, "__qualname__", "")))
+    backend_dir = Path(__file__).parent.resolve()
+    source_files = set()
+    for module in list(sys.modules.values()):
+        source_file = getattr(module, "__file__", None)
+        if source_file and Path(source_file).resolve().is_relative_to(backend_dir):
+            source_files.add(str(Path(source_file).resolve()))
+    for source_file in sorted(source_files):
+        stat = Path(source_file).stat()
+        entries.append((source_file, stat.st_mtime_ns, stat.st_size))
+    return hashlib.sha256(repr(entries).encode()).hexdigest()
+
+
+def _signature_path(output_path: Path) -> Path:
+    """Path of the signature stored for an output file."""
+    return output_path.with_name(f".{output_path.name}{SIGNATURE_SUFFIX}")
 
 
-def generate_openapi_json(output_path: str = "openapi.json"):
+def _is_up_to_date(output_path: Path, signature: str) -> bool:
+    """Whether output_path exists and was generated from the current signature."""
+    signature_path = _signature_path(output_path)
+    return (
+        output_path.exists()
+        and signature_path.exists()
+        and signature_path.read_text() == signature
+    )
+
+
+def generate_openapi_json(output_path: str = "openapi.json", schema: dict = None):
     """Generate OpenAPI JSON documentation."""
-    openapi_schema = app.openapi()
+    openapi_schema = schema or app.openapi()
     
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(openapi_schema, f, indent=2, ensure_ascii=False)
+    _write_json(openapi_schema, output_path)
     
     print(f"OpenAPI JSON documentation generated: {output_path}")
     return openapi_schema
 
 
-def generate_openapi_yaml(output_path: str = "openapi.yaml"):
+@functools.cache
+def _yaml_dumper():
+    """Return the libyaml-backed dumper, or the pure Python one (warning once) if it isn't available."""
+    try:
+        return yaml.CSafeDumper
+    except AttributeError:
+        warnings.warn("libyaml is not available, falling back to the slower pure Python YAML dumper")
+        return yaml.SafeDumper
+
+
+def generate_openapi_yaml(output_path: str = "openapi.yaml", schema: dict = None):
     """Generate OpenAPI YAML documentation."""
-    openapi_schema = app.openapi()
+    openapi_schema = schema or app.openapi()
     
     with open(output_path, "w", encoding="utf-8") as f:
-        yaml.dump(openapi_schema, f, default_flow_style=False, allow_unicode=True)
+        yaml.dump(openapi_schema, f, Dumper=_yaml_dumper(), default_flow_style=False,
+                  allow_unicode=True, sort_keys=False)
     
     print(f"OpenAPI YAML documentation generated: {output_path}")
     return openapi_schema
 
 
-def print_api_summary():
+def print_api_summary(schema: dict = None):
     """Print a summary of available API endpoints."""
-    openapi_schema = app.openapi()
+    openapi_schema = schema or app.openapi()
     paths = openapi_schema.get("paths", {})
     
-    print("\n" + "="*60)
-    print("ArenaLab API Endpoints Summary")
-    print("="*60)
+    lines = ["", "="*60, "ArenaLab API Endpoints Summary", "="*60]
     
+    # Count endpoints by tag in the same pass that lists them
+    tag_counts = Counter()
+    endpoint_count = 0
     for path, methods in paths.items():
-        print(f"\n📍 {path}")
+        lines.append(f"\n📍 {path}")
         for method, details in methods.items():
-            method_upper = method.upper()
-            summary = details.get("summary", "No summary")
-            tags = details.get("tags", [])
+            get = details.get
+            tags = get("tags", ())
+            tag_counts.update(tags)
             tag_str = f" [{', '.join(tags)}]" if tags else ""
-            print(f"  {method_upper:6} - {summary}{tag_str}")
+            lines.append(f"  {method.upper():6} - {get('summary', 'No summary')}{tag_str}")
+        endpoint_count += len(methods)
     
-    print(f"\nTotal endpoints: {sum(len(methods) for methods in paths.values())}")
-    print(f"Total paths: {len(paths)}")
-    
-    # Count by tags
-    tag_counts = {}
-    for methods in paths.values():
-        for details in methods.values():
-            for tag in details.get("tags", []):
-                tag_counts[tag] = tag_counts.get(tag, 0) + 1
+    lines.append(f"\nTotal endpoints: {endpoint_count}")
+    lines.append(f"Total paths: {len(paths)}")
     
     if tag_counts:
-        print(f"\nEndpoints by category:")
-        for tag, count in sorted(tag_counts.items()):
-            print(f"  {tag}: {count} endpoints")
+        lines.append("\nEndpoints by category:")
+        lines.extend(f"  {tag}: {count} endpoints" for tag, count in sorted(tag_counts.items()))
+    
+    sys.stdout.write("\n".join(lines) + "\n")
+
 
+def _write_json(data, output_path: str):
+    """Write data as indented JSON, using orjson when it is installed."""
+    if orjson is not None:
+        with open(output_path, "wb") as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(output_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
 
-def generate_postman_collection(output_path: str = "arenalab.postman_collection.json"):
+
+def generate_postman_collection(output_path: str = "arenalab.postman_collection.json", schema: dict = None):
     """Generate Postman collection from OpenAPI schema."""
-    openapi_schema = app.openapi()
+    openapi_schema = schema or app.openapi()
+    info = openapi_schema.get("info", {})
+    json_dumps = json.dumps
+    
+    def _make_item(path: str, method: str, details: dict) -> dict:
+        method_upper = method.upper()
+        stripped_path = path.strip("/")
+        request_item = {
+            "name": details.get("summary", f"{method_upper} {path}"),
+            "request": {
+                "method": method_upper,
+                "header": _POSTMAN_HEADER,
+                "url": {
+                    "raw": f"{{{{base_url}}}}{path}",
+                    "host": _POSTMAN_HOST,
+                    "path": stripped_path.split("/") if stripped_path else []
+                },
+                "description": details.get("description", "")
+            }
+        }
+        
+        # Add request body if present
+        request_body = details.get("requestBody")
+        if request_body and method_upper in _BODY_METHODS:
+            json_content = request_body.get("content", {}).get("application/json")
+            example = json_content.get("schema", {}).get("example") if json_content else None
+            if example:
+                request_item["request"]["body"] = {
+                    "mode": "raw",
+                    "raw": json_dumps(example, indent=2),
+                    "options": _POSTMAN_RAW_JSON_OPTIONS
+                }
+        return request_item
+    
+    # Convert paths to Postman requests
+    paths = openapi_schema.get("paths", {})
+    items = [
+        _make_item(path, method, details)
+        for path, methods in paths.items()
+        for method, details in methods.items()
+    ]
     
-    # Basic Postman collection structure
     postman_collection = {
         "info": {
-            "name": openapi_schema.get("info", {}).get("title", "ArenaLab API"),
-            "description": openapi_schema.get("info", {}).get("description", ""),
-            "version": openapi_schema.get("info", {}).get("version", "1.0.0"),
+            "name": info.get("title", "ArenaLab API"),
+            "description": info.get("description", ""),
+            "version": info.get("version", "1.0.0"),
             "schema": "https://schema.getpostman.com/json/collection/v2.1.0/collection.json"
         },
-        "item": [],
-        "auth": {
-            "type": "bearer",
-            "bearer": [
-                {
-                    "key": "token", 
-                    "value": "{{auth_token}}",
-                    "type": "string"
-                }
-            ]
-        },
-        "variable": [
-            {
-                "key": "base_url",
-                "value": "http://localhost:8000",
-                "type": "string"
-            },
-            {
-                "key": "auth_token",
-                "value": "",
-                "type": "string"
-            }
-        ]
+        "item": items,
+        "auth": _POSTMAN_AUTH,
+        "variable": _POSTMAN_VARIABLES
     }
     
-    # Convert paths to Postman requests
-    servers = openapi_schema.get("servers", [{"url": "http://localhost:8000"}])
-    base_url = servers[0].get("url", "http://localhost:8000")
-    
-    paths = openapi_schema.get("paths", {})
-    for path, methods in paths.items():
-        for method, details in methods.items():
-            request_item = {
-                "name": details.get("summary", f"{method.upper()} {path}"),
-                "request": {
-                    "method": method.upper(),
-                    "header": [
-                        {
-                            "key": "Content-Type",
-                            "value": "application/json",
-                            "type": "text"
-                        }
-                    ],
-                    "url": {
-                        "raw": f"{{{{base_url}}}}{path}",
-                        "host": ["{{base_url}}"],
-                        "path": path.strip("/").split("/") if path.strip("/") else []
-                    },
-                    "description": details.get("description", "")
-                }
-            }
-            
-            # Add request body if present
-            request_body = details.get("requestBody")
-            if request_body and method.upper() in ["POST", "PUT", "PATCH"]:
-                content = request_body.get("content", {})
-                if "application/json" in content:
-                    schema = content["application/json"].get("schema", {})
-                    example = schema.get("example", {})
-                    if example:
-                        request_item["request"]["body"] = {
-                            "mode": "raw",
-                            "raw": json.dumps(example, indent=2),
-                            "options": {
-                                "raw": {
-                                    "language": "json"
-                                }
-                            }
-                        }
-            
-            postman_collection["item"].append(request_item)
-    
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(postman_collection, f, indent=2, ensure_ascii=False)
+    _write_json(postman_collection, output_path)
     
     print(f"Postman collection generated: {output_path}")
 
@@ -183,6 +249,7 @@ Examples:
     parser.add_argument("--summary", action="store_true", help="Print API summary")
     parser.add_argument("--all", action="store_true", help="Generate all formats")
     parser.add_argument("--output-dir", default="docs", help="Output directory for documentation")
+    parser.add_argument("--force", action="store_true", help="Regenerate files even if routes are unchanged")
     
     args = parser.parse_args()
     
@@ -197,17 +264,31 @@ Examples:
     if not any([args.json, args.yaml, args.postman, args.summary]):
         args.summary = True
     
+    outputs = []
     if args.json:
-        generate_openapi_json(str(output_dir / "openapi.json"))
-    
+        outputs.append((generate_openapi_json, output_dir / "openapi.json"))
     if args.yaml:
-        generate_openapi_yaml(str(output_dir / "openapi.yaml"))
-    
+        outputs.append((generate_openapi_yaml, output_dir / "openapi.yaml"))
     if args.postman:
-        generate_postman_collection(str(output_dir / "arenalab.postman_collection.json"))
+        outputs.append((generate_postman_collection, output_dir / "arenalab.postman_collection.json"))
+    
+    # Skip the files generated from the same routes and sources by an earlier run
+    signature = routes_signature()
+    if not args.force and outputs:
+        stale = [(generate, path) for generate, path in outputs if not _is_up_to_date(path, signature)]
+        if not stale:
+            print("Documentation files are up to date, skipping generation (use --force to regenerate)")
+        outputs = stale
+    
+    # Build the schema once and share it between all generators
+    schema = app.openapi() if outputs or args.summary else None
+    
+    for generate, path in outputs:
+        generate(str(path), schema=schema)
+        _signature_path(path).write_text(signature)
     
     if args.summary:
-        print_api_summary()
+        print_api_summary(schema=schema)
     
     print(f"\n📚 Documentation generated in: {output_dir.absolute()}")
     print("🌐 To view interactive docs, start the server and visit:")
@@ -1,17 +1,68 @@
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, ConfigDict, Field, StringConstraints, field_validator
 from typing import Union
-from typing import Optional, Literal
+from typing import Annotated, Any, Optional, Literal
+from typing_extensions import NotRequired, TypedDict
 from datetime import datetime
 from enum import Enum
-import re
+import string
+
+def _only_word_chars(s: str, extra: str = "") -> bool:
+	r"""True if s only holds regex \w characters (or ones in extra), an empty string included"""
+	for c in extra:
+		s = s.replace(c, "")
+	s = s.replace("_", "")
+	return not s or s.isalnum()
+
+def _is_email(v: str) -> bool:
+	r"""
+	Same check as the regex \A[\w.-]+@[\w.-]+\.\w+\Z, written as string scans.
+
+	str.partition/rfind/isalnum run in C and avoid the regex engine's backtracking.
+	"""
+	local, at, domain = v.partition('@')
+	dot = domain.rfind('.')
+	return (
+		bool(local) and bool(at) and 0 < dot < len(domain) - 1
+		and _only_word_chars(local, '.-')
+		and _only_word_chars(domain[:dot], '.-')
+		and _only_word_chars(domain[dot + 1:])
+	)
+
+# Password character classes, checked with set.isdisjoint (a single C-level scan each)
+_PW_LETTERS = frozenset(string.ascii_letters)
+_PW_DIGITS = frozenset(string.digits)
+
+def _validate_email(cls, v: str) -> str:
+	"""Shared email validator of the user models"""
+	if not _is_email(v):
+		raise ValueError('Invalid email format')
+	return v.lower()
+
+# Names are stripped (and then length-checked) by pydantic-core instead of a Python validator
+NameStr = Annotated[str, StringConstraints(strip_whitespace=True)]
+
+# Flag values stay untyped: plugins store nested hyperparameter dicts in cli_flags
+CliFlags = dict[str, Any]
+
+# Known keys of an enabled plugin entry get typed validators, other keys are kept as is
+
+class PluginEnable(TypedDict):
+	__pydantic_config__ = ConfigDict(extra='allow')
+	name: str
+	enabled: NotRequired[bool]
+	settings: NotRequired[dict[str, Any]]
+	enabled_at: NotRequired[str]
 
 class UserRole(str, Enum):
 	USER = "user"
 	ADMIN = "admin"
 
+# Value -> member table built by the Enum metaclass, a plain dict lookup instead of UserRole(value)
+USER_ROLES = UserRole._value2member_map_
+
 class ExperimentModel(BaseModel):
 	id: str = Field(..., alias="_id", description="MongoDB ObjectId")
-	name: str = Field(..., min_length=1, max_length=100, description="Experiment name")
+	name: NameStr = Field(..., min_length=1, max_length=100, description="Experiment name")
 	description: str = Field("", max_length=500, description="Experiment description")
 	tags: list[str] = Field(default=[], description="List of tags")
 	created_at: datetime
@@ -19,64 +70,44 @@ class ExperimentModel(BaseModel):
 	results_text: str = Field(default="", description="Experiment results text")
 	is_favorite: bool = Field(default=False, description="Whether experiment is marked as favorite")
 	
-	class Config:
-		populate_by_name = True
-	
-	@validator('name')
-	def validate_name(cls, v):
-		if not v.strip():
-			raise ValueError('Name cannot be empty or whitespace')
-		return v.strip()
+	model_config = ConfigDict(populate_by_name=True)
 	
 class ExperimentBody(BaseModel):
-	name: str = Field(..., min_length=1, max_length=100, description="Experiment name")
+	name: NameStr = Field(..., min_length=1, max_length=100, description="Experiment name")
 	description: str = Field("", max_length=500, description="Experiment description")
 	tags: list[str] = Field(default=[], description="List of tags")
 	results_text: str = Field(default="", description="Experiment results text")
 	is_favorite: bool = Field(default=False, description="Whether experiment is marked as favorite")
-	enabled_plugins: list[dict] = Field(default=[], description="List of enabled plugins with settings")
-
-	@validator('name')
-	def validate_name(cls, v):
-		if not v.strip():
-			raise ValueError('Name cannot be empty or whitespace')
-		return v.strip()
+	enabled_plugins: list[PluginEnable] = Field(default=[], description="List of enabled plugins with settings")
 
 class RevisionModel(BaseModel):
 	id: str = Field(..., alias="_id", description="MongoDB ObjectId")
 	version: int = Field(..., ge=1, description="Revision version number")
 	experiment_id: str = Field(..., description="Parent experiment ID")
-	name: str = Field(..., min_length=1, max_length=100, description="Revision name")
+	name: NameStr = Field(..., min_length=1, max_length=100, description="Revision name")
 	description: str = Field(..., max_length=500, description="Revision description")
 	parent_revision_id: Optional[str] = Field(None, description="Parent revision ID")
 	parent_run_id: Optional[str] = Field(None, description="Parent run ID")
 	created_at: datetime
 	yaml_path: str = Field(..., description="Path to YAML configuration")
-	cli_flags: dict = Field(default={}, description="CLI flags for ML-Agents")
+	cli_flags: CliFlags = Field(default={}, description="CLI flags for ML-Agents")
 	environment_id: str = Field(..., description="Environment ID")
 	results_text: str = Field(default="", description="Revision results text")
 	is_favorite: bool = Field(default=False, description="Whether revision is marked as favorite")
 	
-	class Config:
-		populate_by_name = True
+	model_config = ConfigDict(populate_by_name=True)
 
 class RevisionBody(BaseModel):
 	experiment_id: str = Field(..., description="Parent experiment ID")
-	name: str = Field(..., min_length=1, max_length=100, description="Revision name")
+	name: NameStr = Field(..., min_length=1, max_length=100, description="Revision name")
 	description: str = Field(..., max_length=500, description="Revision description")
 	parent_revision_id: Optional[str] = Field(None, description="Parent revision ID")
 	parent_run_id: Optional[str] = Field(None, description="Parent run ID")
 	yaml: str = Field(..., min_length=1, description="YAML configuration content")
-	cli_flags: dict = Field(default={}, description="CLI flags for ML-Agents")
+	cli_flags: CliFlags = Field(default={}, description="CLI flags for ML-Agents")
 	environment_id: str = Field(..., description="Environment ID")
 	results_text: str = Field(default="", description="Revision results text")
 	is_favorite: bool = Field(default=False, description="Whether revision is marked as favorite")
-	
-	@validator('name')
-	def validate_name(cls, v):
-		if not v.strip():
-			raise ValueError('Name cannot be empty or whitespace')
-		return v.strip()
 
 class RunModel(BaseModel):
 	id: str = Field(..., alias="_id", description="MongoDB ObjectId")
@@ -90,15 +121,14 @@ class RunModel(BaseModel):
 	execution_count: int = Field(default=0, description="Number of times run has been executed/restarted")
 	last_restarted_at: Optional[datetime] = Field(None, description="Last restart timestamp")
 	yaml_path: str = Field(..., description="Path to YAML configuration")
-	cli_flags: dict = Field(default={}, description="CLI flags for ML-Agents")
+	cli_flags: CliFlags = Field(default={}, description="CLI flags for ML-Agents")
 	tb_logdir: Optional[str] = Field(None, description="TensorBoard log directory")
 	stdout_log_path: Optional[str] = Field(None, description="Stdout log file path")
 	description: str = Field(..., max_length=500, description="Run description")
 	results_text: str = Field(default="", description="Run results text")
 	is_favorite: bool = Field(default=False, description="Whether run is marked as favorite")
 	
-	class Config:
-		populate_by_name = True
+	model_config = ConfigDict(populate_by_name=True)
 
 class RunBody(BaseModel):
 	revision_id: str = Field(..., description="Revision ID")
@@ -106,7 +136,7 @@ class RunBody(BaseModel):
 	parent_revision_id: Optional[str] = Field(None, description="Parent revision ID")
 	parent_run_id: Optional[str] = Field(None, description="Parent run ID")
 	yaml: str = Field(..., min_length=1, description="YAML configuration content")
-	cli_flags: dict = Field(default={}, description="CLI flags for ML-Agents")
+	cli_flags: CliFlags = Field(default={}, description="CLI flags for ML-Agents")
 	description: str = Field(..., max_length=500, description="Run description")
 	results_text: str = Field(default="", description="Run results text")
 	is_favorite: bool = Field(default=False, description="Whether run is marked as favorite")
@@ -114,7 +144,7 @@ class RunBody(BaseModel):
 class EnvironmentModel(BaseModel):
 	id: str = Field(..., alias="_id", description="MongoDB ObjectId")
 	version: int = Field(..., ge=1, description="Environment version number")
-	name: str = Field(..., min_length=1, max_length=100, description="Environment name")
+	name: NameStr = Field(..., min_length=1, max_length=100, description="Environment name")
 	description: str = Field(..., max_length=500, description="Environment description")
 	created_at: datetime
 	env_path: str = Field(..., description="Path to environment directory")
@@ -124,76 +154,42 @@ class EnvironmentModel(BaseModel):
 	compressed_file_path: str = Field(..., description="Path to original compressed file")
 	git_commit_url: Optional[str] = Field(None, description="Git commit URL for environment source code")
 	
-	class Config:
-		populate_by_name = True
-	
-	@validator('name')
-	def validate_name(cls, v):
-		if not v.strip():
-			raise ValueError('Name cannot be empty or whitespace')
-		return v.strip()
+	model_config = ConfigDict(populate_by_name=True)
 	
 class EnvironmentBody(BaseModel):
-	name: str = Field(..., min_length=1, max_length=100, description="Environment name")
+	name: NameStr = Field(..., min_length=1, max_length=100, description="Environment name")
 	description: str = Field(..., max_length=500, description="Environment description")
 	git_commit_url: Optional[str] = Field(None, description="Git commit URL for environment source code")
-	
-	@validator('name')
-	def validate_name(cls, v):
-		if not v.strip():
-			raise ValueError('Name cannot be empty or whitespace')
-		return v.strip()
 
 class UserModel(BaseModel):
 	id: str = Field(..., alias="_id", description="MongoDB ObjectId")
 	email: str = Field(..., description="User email address")
-	name: str = Field(..., min_length=1, max_length=100, description="User full name")
+	name: NameStr = Field(..., min_length=1, max_length=100, description="User full name")
 	password_hash: str = Field(..., description="Hashed password")
 	role: UserRole = Field(UserRole.USER, description="User role")
 	created_at: datetime
 	last_login: Optional[datetime] = Field(None, description="Last login timestamp")
 	is_active: bool = Field(True, description="User account status")
 	
-	class Config:
-		populate_by_name = True
-	
-	@validator('email')
-	def validate_email(cls, v):
-		if not re.match(r'^[\w\.-]+@[\w\.-]+\.\w+$', v):
-			raise ValueError('Invalid email format')
-		return v.lower()
+	model_config = ConfigDict(populate_by_name=True)
 	
-	@validator('name')
-	def validate_name(cls, v):
-		if not v.strip():
-			raise ValueError('Name cannot be empty or whitespace')
-		return v.strip()
+	validate_email = field_validator('email')(_validate_email)
 
 class UserBody(BaseModel):
 	email: str = Field(..., description="User email address")
-	name: str = Field(..., min_length=1, max_length=100, description="User full name")
+	name: NameStr = Field(..., min_length=1, max_length=100, description="User full name")
 	password: str = Field(..., min_length=8, description="User password")
 	role: UserRole = Field(UserRole.USER, description="User role")
 	
-	@validator('name')
-	def validate_name(cls, v):
-		if not v.strip():
-			raise ValueError('Name cannot be empty or whitespace')
-		return v.strip()
+	validate_email = field_validator('email')(_validate_email)
 	
-	@validator('email')
-	def validate_email(cls, v):
-		if not re.match(r'^[\w\.-]+@[\w\.-]+\.\w+$', v):
-			raise ValueError('Invalid email format')
-		return v.lower()
-	
-	@validator('password')
-	def validate_password(cls, v):
-		if len(v) < 8:
-			raise ValueError('Password must be at least 8 characters long')
-		if not re.search(r'[A-Za-z]', v):
+	@field_validator('password')
+	@classmethod
+	def validate_password(cls, v: str) -> str:
+		# The minimum length is enforced by the field constraint
+		if _PW_LETTERS.isdisjoint(v):
 			raise ValueError('Password must contain at least one letter')
-		if not re.search(r'[0-9]', v):
+		if _PW_DIGITS.isdisjoint(v):
 			raise ValueError('Password must contain at least one number')
 		return v
 
@@ -201,13 +197,21 @@ class LoginBody(BaseModel):
 	email: str = Field(..., description="User email address")
 	password: str = Field(..., min_length=1, description="User password")
 	
-	@validator('email')
-	def validate_email(cls, v):
-		if not re.match(r'^[\w\.-]+@[\w\.-]+\.\w+$', v):
-			raise ValueError('Invalid email format')
-		return v.lower()
+	validate_email = field_validator('email')(_validate_email)
+
+class TrustedResponse(BaseModel):
+	"""Base for response models, which can be built from stored documents without re-validation"""
+	# Responses are write-once; unknown document fields are dropped
+	model_config = ConfigDict(populate_by_name=True, frozen=True, extra='ignore')
+	
+	@classmethod
+	def from_trusted(cls, doc: dict):
+		"""Build the response from a MongoDB document, skipping validation (it was validated on write)"""
+		if not isinstance(doc.get("_id", ""), str):
+			doc = {**doc, "_id": str(doc["_id"])}
+		return cls.model_construct(**doc)
 
-class UserResponse(BaseModel):
+class UserResponse(TrustedResponse):
 	id: str = Field(..., alias="_id", description="MongoDB ObjectId")
 	email: str = Field(..., description="User email address")
 	name: str = Field(..., description="User full name")
@@ -215,11 +219,8 @@ class UserResponse(BaseModel):
 	created_at: datetime
 	last_login: Optional[datetime] = Field(None, description="Last login timestamp")
 	is_active: bool = Field(..., description="User account status")
-	
-	class Config:
-		populate_by_name = True
 
-class ExperimentResponse(BaseModel):
+class ExperimentResponse(TrustedResponse):
 	id: str = Field(..., alias="_id", description="MongoDB ObjectId")
 	name: str = Field(..., description="Experiment name")
 	description: str = Field(..., description="Experiment description")
@@ -230,10 +231,7 @@ class ExperimentResponse(BaseModel):
 	is_favorite: bool = Field(default=False, description="Whether experiment is marked as favorite")
 	enabled_plugins: list[dict] = Field(default=[], description="List of enabled plugins with settings")
 
-	class Config:
-		populate_by_name = True
-
-class RevisionResponse(BaseModel):
+class RevisionResponse(TrustedResponse):
 	id: str = Field(..., alias="_id", description="MongoDB ObjectId")
 	version: int = Field(..., description="Revision version number")
 	experiment_id: str = Field(..., description="Parent experiment ID")
@@ -247,11 +245,8 @@ class RevisionResponse(BaseModel):
 	environment_id: str = Field(..., description="Environment ID")
 	results_text: str = Field(default="", description="Revision results text")
 	is_favorite: bool = Field(default=False, description="Whether revision is marked as favorite")
-	
-	class Config:
-		populate_by_name = True
 
-class RunResponse(BaseModel):
+class RunResponse(TrustedResponse):
 	id: str = Field(..., alias="_id", description="MongoDB ObjectId")
 	revision_id: str = Field(..., description="Revision ID")
 	experiment_id: str = Field(..., description="Experiment ID")
@@ -269,11 +264,8 @@ class RunResponse(BaseModel):
 	description: str = Field(..., description="Run description")
 	results_text: str = Field(..., description="Run results text")
 	is_favorite: bool = Field(default=False, description="Whether run is marked as favorite")
-	
-	class Config:
-		populate_by_name = True
 
-class EnvironmentResponse(BaseModel):
+class EnvironmentResponse(TrustedResponse):
 	id: str = Field(..., alias="_id", description="MongoDB ObjectId")
 	version: int = Field(..., description="Environment version number")
 	name: str = Field(..., description="Environment name")
@@ -284,7 +276,4 @@ class EnvironmentResponse(BaseModel):
 	original_filename: str = Field(..., description="Original compressed file name")
 	file_format: str = Field(..., description="Compressed file format")
 	compressed_file_path: str = Field(..., description="Path to original compressed file")
-	git_commit_url: Optional[str] = Field(None, description="Git commit URL for environment source code")
-	
-	class Config:
-		populate_by_name = True
\ No newline at end of file
+	git_commit_url: Optional[str] = Field(None, description="Git commit URL for environment source code")
\ No newline at end of file
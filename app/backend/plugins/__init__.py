@@ -8,7 +8,7 @@ Write a function, control experiments. That's it!
 1. Create a new file in the plugins/ directory with a name ending in `_plugin.py`
 2. Write a function that takes (context, api) parameters
 3. Register it with the @register_plugin decorator
-4. Done! The plugin will be auto-discovered and available.
+4. Done! The plugin will be auto-discovered (on first use) and available.
 
 Example plugin file (my_awesome_plugin.py):
 ```python
@@ -36,9 +36,14 @@ To remove a plugin, simply delete its file.
 """
 
 import os
+import ast
+import functools
 import importlib
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Any, Dict, List, Optional
 
 logger = logging.getLogger(__name__)
 
@@ -63,36 +68,176 @@ from .core import (
 
 # Also initialize database schema
 from .core import database
+from .core.registry import _global_registry
+
+@functools.lru_cache(maxsize=1)
+def _plugin_modules(plugins_dir: str, mtime_ns: int) -> tuple:
+    """
+    Return the names of the plugin modules in plugins_dir.
+
+    Cached by the directory mtime, which changes when plugin files are added,
+    removed or renamed.
+    """
+    with os.scandir(plugins_dir) as entries:
+        return tuple(sorted(
+            entry.name[:-3] for entry in entries
+            if entry.name.endswith("_plugin.py") and entry.is_file()
+        ))
+
+
+# Positional parameters of the @register_plugin / @plugin decorators
+_DECORATOR_PARAMS = ("name", "scope", "description", "version", "author",
+                     "settings_schema", "enabled_by_default", "tags", "icon")
+_DECORATOR_NAMES = frozenset({"register_plugin", "plugin"})
+# Names that let a plugin file register without the scanned decorators
+_REGISTRY_NAMES = frozenset({"_global_registry", "PluginRegistry", "register", "register_lazy"})
+
+
+def _scan_plugin_file(path: Path) -> Optional[List[Dict[str, Any]]]:
+    """
+    Read the plugin registrations of a plugin file without executing it.
+
+    Returns the decorator arguments of each registered plugin, or None when
+    they can't be determined statically (no decorator found, non-literal
+    arguments, aliased or indirect uses of the decorators, direct registry
+    calls, syntax errors), in which case the module has to be imported.
+    """
+    try:
+        tree = ast.parse(path.read_bytes(), filename=str(path))
+    except (OSError, SyntaxError, ValueError):
+        return None
+
+    def decorator_name(call: ast.Call) -> Optional[str]:
+        func = call.func
+        return func.id if isinstance(func, ast.Name) else func.attr if isinstance(func, ast.Attribute) else None
+
+    registrations = []
+    decorator_funcs = set()
+    for node in tree.body:
+        if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            continue
+        for decorator in node.decorator_list:
+            if isinstance(decorator, ast.Call) and decorator_name(decorator) in _DECORATOR_NAMES:
+                decorator_funcs.add(id(decorator.func))
+                try:
+                    args = dict(zip(_DECORATOR_PARAMS, (ast.literal_eval(arg) for arg in decorator.args)))
+                    args.update((kw.arg, ast.literal_eval(kw.value)) for kw in decorator.keywords)
+                except (ValueError, TypeError, SyntaxError):
+                    return None
+                if "name" not in args or "scope" not in args or not set(args) <= set(_DECORATOR_PARAMS):
+                    return None
+                registrations.append(args)
+
+    if not registrations:
+        return None
+
+    # Any other reference to the decorators (calls, aliases, assignments) or to
+    # the registry means the file registers in ways the scan can't follow
+    for node in ast.walk(tree):
+        if isinstance(node, ast.alias):
+            if node.asname and node.name in _DECORATOR_NAMES:
+                return None
+            name = node.name
+        elif isinstance(node, ast.Name):
+            name = node.id
+        elif isinstance(node, ast.Attribute):
+            name = node.attr
+        else:
+            continue
+        if name in _REGISTRY_NAMES or (name in _DECORATOR_NAMES and id(node) not in decorator_funcs
+                                       and not isinstance(node, ast.alias)):
+            return None
+    return registrations
+
 
 # Auto-discover and load all plugin files
 def _discover_and_load_plugins():
     """
-    Auto-discover and load all plugin files in the plugins directory.
+    Auto-discover all plugin files in the plugins directory.
 
     Plugin files must:
     - End with _plugin.py
     - Be in the plugins/ directory (not in subdirectories like core/)
+
+    Files whose registrations can be read statically are registered lazily and
+    only imported when one of their plugins is executed; the rest are imported.
     """
     plugins_dir = Path(__file__).parent
-    plugin_files = list(plugins_dir.glob("*_plugin.py"))
+    plugin_module_names = _plugin_modules(str(plugins_dir), plugins_dir.stat().st_mtime_ns)
+    if not plugin_module_names:
+        logger.info("Plugin auto-discovery complete: loaded 0 plugin files")
+        return
 
-    loaded_count = 0
-    for plugin_file in plugin_files:
-        plugin_module_name = plugin_file.stem  # filename without .py
+    to_import = []
+    lazy_count = 0
+    for plugin_module_name in plugin_module_names:
+        # Like imports, a plugin file that fails is logged and skipped, not raised
         try:
-            # Import the plugin module (this will trigger the @register_plugin decorator)
-            importlib.import_module(f".{plugin_module_name}", package="plugins")
-            loaded_count += 1
-            logger.info(f"Loaded plugin module: {plugin_module_name}")
+            registrations = _scan_plugin_file(plugins_dir / f"{plugin_module_name}.py")
+            if registrations is None:
+                to_import.append(plugin_module_name)
+                continue
+            for args in registrations:
+                _global_registry.register_lazy(module=f"{__name__}.{plugin_module_name}", **args)
+            lazy_count += 1
         except Exception as e:
-            logger.error(f"Failed to load plugin {plugin_module_name}: {e}")
-            logger.exception(e)
+            logger.error(f"Failed to register plugin {plugin_module_name}: {e}")
+
+    loaded_count = 0
+    if to_import:
+        # File reads and bytecode unmarshalling of the plugin modules (and their
+        # dependencies) overlap across threads, the import lock covers the rest
+        with ThreadPoolExecutor(max_workers=min(8, len(to_import))) as executor:
+            loaded_count = sum(executor.map(_safe_import, to_import))
+
+    logger.info(f"Plugin auto-discovery complete: {lazy_count} plugin files registered lazily, "
+                f"{loaded_count} loaded")
 
-    logger.info(f"Plugin auto-discovery complete: loaded {loaded_count} plugin files")
 
+def _safe_import(plugin_module_name: str) -> bool:
+    """Import a plugin module, logging (not raising) any error. Returns whether it loaded."""
+    _loading.active = True
+    try:
+        # Import the plugin module (this will trigger the @register_plugin decorator)
+        importlib.import_module(f".{plugin_module_name}", package="plugins")
+        logger.info(f"Loaded plugin module: {plugin_module_name}")
+        return True
+    except Exception as e:
+        logger.error(f"Failed to load plugin {plugin_module_name}: {e}")
+        logger.exception(e)
+        return False
+    finally:
+        _loading.active = False
 
-# Run auto-discovery on import
-_discover_and_load_plugins()
+
+_discovery_lock = threading.RLock()
+_discovered = False
+# Set once loading has finished, lets later lookups skip the lock
+_discovery_done = False
+# Set in the threads importing plugin modules, so registry lookups made while
+# importing don't wait for the discovery that is running them
+_loading = threading.local()
+
+
+def discover_plugins():
+    """
+    Load the plugin files on first use instead of at import time.
+
+    Safe to call from several threads, only the first call does the work.
+    The registry lookups (get_plugin, list_plugins, ...) call it themselves.
+    """
+    global _discovered, _discovery_done
+    if _discovery_done or getattr(_loading, "active", False):
+        return
+    with _discovery_lock:
+        if _discovered:
+            return
+        # Set before loading so lookups made by plugin modules while importing don't recurse
+        _discovered = True
+        try:
+            _discover_and_load_plugins()
+        finally:
+            _discovery_done = True
 
 # Export the ultra-simple interface
 __all__ = [
@@ -101,6 +246,7 @@ __all__ = [
     "register_plugin",  # Manual registration if needed
 
     # Plugin discovery (for API/frontend)
+    "discover_plugins",
     "list_plugins",
     "get_plugins_info",
     "get_plugin",
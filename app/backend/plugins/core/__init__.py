@@ -46,14 +46,21 @@ from .database import (
     PluginExecutionsCollection,
     PluginSettingsCollection,
     extend_existing_collections,
+    init_plugin_db,
     add_plugin_to_experiment,
     remove_plugin_from_experiment,
     add_plugin_to_run,
     add_plugin_note,
+    add_plugins_to_experiment_bulk,
+    add_plugins_to_run_bulk,
+    add_plugin_notes_bulk,
     mark_revision_as_plugin_created,
     get_plugin_executions_for_target,
+    get_plugin_executions_for_targets,
     get_experiment_plugins,
+    get_experiment_plugins_bulk,
     get_run_plugins,
+    get_run_plugins_bulk,
     get_plugin_database
 )
 
@@ -92,13 +99,20 @@ __all__ = [
     "PluginExecutionsCollection",
     "PluginSettingsCollection",
     "extend_existing_collections",
+    "init_plugin_db",
     "add_plugin_to_experiment",
     "remove_plugin_from_experiment",
     "add_plugin_to_run",
     "add_plugin_note",
+    "add_plugins_to_experiment_bulk",
+    "add_plugins_to_run_bulk",
+    "add_plugin_notes_bulk",
     "mark_revision_as_plugin_created",
     "get_plugin_executions_for_target",
+    "get_plugin_executions_for_targets",
     "get_experiment_plugins",
+    "get_experiment_plugins_bulk",
     "get_run_plugins",
+    "get_run_plugins_bulk",
     "get_plugin_database"
 ]
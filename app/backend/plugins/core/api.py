@@ -5,20 +5,124 @@ This module provides a clean, simple interface for plugin developers.
 Plugins are just functions that receive context and api objects.
 """
 
+import os
+import re
+import json
 import time
+import random
 import logging
 import asyncio
-from typing import Dict, Any, List, Optional, Callable
+import threading
+from collections import OrderedDict, defaultdict
+from io import StringIO
+from typing import Dict, Any, List, Optional, Callable, Tuple
 from datetime import datetime, timezone
 from dataclasses import dataclass
 
+import yaml as yaml_lib
+from pymongo import UpdateOne
+from pymongo.errors import PyMongoError
+
 from db import get_db
-from utils.file_tools import sanitize_name
+from utils import file_tools, yaml_tools
+from utils.file_tools import sanitize_name, tail_file_lines
 from services.revisions_service import RevisionsService
 from models import RevisionBody
+from .database import MAX_PLUGIN_NOTES
 
 logger = logging.getLogger(__name__)
 
+# The runner module, imported on first use (it can't be imported with this module)
+_runner = None
+
+
+def _get_runner():
+    """Return the runner module, importing it the first time."""
+    global _runner
+    if _runner is None:
+        import runner
+        _runner = runner
+    return _runner
+
+# Run statuses of runs that haven't finished yet
+ACTIVE_RUN_STATUSES = ["running", "starting"]
+
+# Training progress line of mlagents-learn ("[INFO] Agent. Step: 50000. Time Elapsed: ...")
+_STEP_PATTERN = re.compile(r"\bStep: (\d+)")
+
+# Fields of the runs and revisions returned by PluginAPI.get_experiment_data by default
+EXPERIMENT_DATA_FIELDS: Dict[str, Optional[Dict[str, int]]] = {
+    "runs": {"status": 1, "created_at": 1, "revision_id": 1, "cli_flags": 1},
+    "revisions": {"name": 1, "created_at": 1, "parent_revision_id": 1},
+}
+
+
+def _to_columns(docs: List[Dict[str, Any]], projection: Optional[Dict[str, int]]) -> Dict[str, List[Any]]:
+    """Turn documents into one list of values per field (None where a document lacks the field)."""
+    if projection is not None:
+        names = ["_id", *(name for name, included in projection.items() if included)]
+    else:
+        names = list(dict.fromkeys(name for doc in docs for name in doc))
+    return {name: [doc.get(name) for doc in docs] for name in names}
+
+# Parsed revision YAML files: path -> (mtime_ns, size, config, has comments),
+# least recently used first
+_YAML_CACHE: "OrderedDict[str, Tuple[int, int, Any, bool]]" = OrderedDict()
+_YAML_CACHE_SIZE = 100
+_yaml_cache_lock = threading.Lock()
+
+# libyaml-backed dumper for configs without comments, when available
+_YAML_FAST_DUMPER = getattr(yaml_lib, "CSafeDumper", yaml_lib.SafeDumper)
+
+
+def _cached_load_yaml(path: str) -> Tuple[Any, Any]:
+    """
+    load_yaml_with_comments with an LRU cache validated by the file's mtime and size.
+
+    Plugins that spawn many revisions (PBT, grid search) load the same parent
+    YAML over and over. The returned config is the cached object, shared by
+    all callers: it must not be modified, the yaml_tools merge helpers copy
+    only the parts they change. Callers get a new YAML handler. Files without
+    comments have nothing to preserve: they come back as plain Python objects
+    with no handler, for _dump_yaml's faster PyYAML path.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return yaml_tools.load_yaml_with_comments(path)
+    key = (stat.st_mtime_ns, stat.st_size)
+
+    with _yaml_cache_lock:
+        entry = _YAML_CACHE.get(path)
+        if entry is not None and entry[:2] == key:
+            _YAML_CACHE.move_to_end(path)
+        else:
+            entry = None
+    if entry is not None:
+        config, commented = entry[2:]
+        return config, yaml_tools.new_yaml_handler() if commented else None
+
+    config, yaml_handler = yaml_tools.load_yaml_with_comments(path)
+    commented = yaml_tools.has_comments(config)
+    if not commented:
+        config, yaml_handler = yaml_tools.to_plain_config(config), None
+    with _yaml_cache_lock:
+        _YAML_CACHE[path] = (*key, config, commented)
+        _YAML_CACHE.move_to_end(path)
+        while len(_YAML_CACHE) > _YAML_CACHE_SIZE:
+            _YAML_CACHE.popitem(last=False)
+    return config, yaml_handler
+
+
+def _dump_yaml(config: Any, yaml_handler: Any = None) -> str:
+    """Serialize a config, with the comment-preserving handler it was loaded with if any."""
+    if yaml_handler is None:
+        return yaml_lib.dump(config, Dumper=_YAML_FAST_DUMPER, default_flow_style=False,
+                             sort_keys=False, allow_unicode=True, width=4096)
+    yaml_stream = StringIO()
+    yaml_handler.dump(config, yaml_stream)
+    return yaml_stream.getvalue()
+
 
 @dataclass
 class PluginContext:
@@ -39,10 +143,91 @@ class PluginContext:
 class PluginAPI:
     """Simple API for plugin operations."""
 
+    # Seconds a cached "latest revision" lookup stays valid
+    LATEST_REVISION_TTL = 2.0
+    # Buffered notes of a target that trigger a write
+    NOTE_FLUSH_THRESHOLD = 16
+    # Fields read by _get_doc: runs are only used for their ids, experiments and
+    # revisions are passed on to the runner whole except for the (growing) notes
+    _DOC_PROJECTIONS = {
+        "runs": {"experiment_id": 1, "revision_id": 1},
+        "experiments": {"plugin_notes": 0},
+        "revisions": None,
+    }
+
     def __init__(self, context: PluginContext):
         self.context = context
         self.db = get_db()
         self.revisions_service = RevisionsService()
+        # Documents read during this plugin execution, by (collection, _id)
+        self._doc_cache: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        # experiment_id -> (monotonic time of the query, latest revision)
+        self._latest_rev_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        # Notes not written yet as (time.time(), message), by (collection, _id) of the target
+        self._note_buffer: Dict[Tuple[str, str], List[Tuple[float, str]]] = defaultdict(list)
+        # (parent revision, config change) -> revision created by applying it, see _find_applied_revision
+        self._revision_memo: Dict[str, str] = {}
+
+    def _get_doc(self, collection: str, doc_id: str) -> Optional[Dict[str, Any]]:
+        """Find a document by _id, reusing the result for the rest of the plugin execution."""
+        key = (collection, doc_id)
+        doc = self._doc_cache.get(key)
+        if doc is None:
+            doc = getattr(self.db, collection).find_one({"_id": doc_id}, self._DOC_PROJECTIONS[collection])
+            if doc is not None:
+                self._doc_cache[key] = doc
+        return doc
+
+    def _get_experiment(self, experiment_id: str) -> Optional[Dict[str, Any]]:
+        return self._get_doc("experiments", experiment_id)
+
+    def _get_revision(self, revision_id: str) -> Optional[Dict[str, Any]]:
+        return self._get_doc("revisions", revision_id)
+
+    def _get_experiment_id(self) -> str:
+        """ID of the plugin's experiment (the run's experiment for run/revision scoped plugins)."""
+        if self.context.scope == 'experiment':
+            return self.context.target_id
+        # experiment_id and revision_id of a run never change, so the cached run is enough
+        return self._get_doc("runs", self.context.target_id)["experiment_id"]
+
+    def _get_latest_revision(self, experiment_id: str) -> Optional[Dict[str, Any]]:
+        """Most recent revision of the experiment, cached for LATEST_REVISION_TTL seconds."""
+        now = time.monotonic()
+        cached = self._latest_rev_cache.get(experiment_id)
+        if cached is not None and now - cached[0] < self.LATEST_REVISION_TTL:
+            return cached[1]
+        revision = self.db.revisions.find_one(
+            {"experiment_id": experiment_id},
+            sort=[("created_at", -1)]
+        )
+        if revision is not None:
+            self._latest_rev_cache[experiment_id] = (now, revision)
+        return revision
+
+    @staticmethod
+    def _change_key(parent_revision_id: str, change: Any) -> str:
+        return json.dumps([parent_revision_id, change], sort_keys=True, default=str)
+
+    def _find_applied_revision(self, parent_revision_id: str, change: Any) -> Optional[str]:
+        """Revision this execution already created by applying change to parent_revision_id."""
+        return self._revision_memo.get(self._change_key(parent_revision_id, change))
+
+    def _remember_applied_revision(self, parent_revision_id: str, change: Any, revision_id: str):
+        """
+        Record that applying change to parent_revision_id created revision_id.
+
+        The merges are idempotent, so applying the same change to revision_id
+        again would reproduce it as well.
+        """
+        self._revision_memo[self._change_key(parent_revision_id, change)] = revision_id
+        self._revision_memo[self._change_key(revision_id, change)] = revision_id
+
+    def _create_revision(self, revision_body: RevisionBody) -> Dict[str, Any]:
+        """Create a revision through the service; it becomes the experiment's latest revision."""
+        created_revision = self.revisions_service.create_revision(revision_body)
+        self._latest_rev_cache.pop(revision_body.experiment_id, None)
+        return created_revision
     
     def create_run(self, config: Dict[str, Any], description: str = "") -> 'SimpleRun':
         """
@@ -58,29 +243,25 @@ class PluginAPI:
             SimpleRun object for the created run
         """
         try:
-            # Import runner here to avoid circular imports
-            from runner import create_run, execute_run
+            runner = _get_runner()
 
             # Get experiment and revision info
             if self.context.scope == 'experiment':
                 experiment_id = self.context.target_id
                 # Get latest revision for this experiment
-                revision = self.db.revisions.find_one(
-                    {"experiment_id": experiment_id},
-                    sort=[("created_at", -1)]
-                )
+                revision = self._get_latest_revision(experiment_id)
             else:
                 # For run-scoped plugins, get experiment info from the run
-                run = self.db.runs.find_one({"_id": self.context.target_id})
+                run = self._get_doc("runs", self.context.target_id)
                 experiment_id = run["experiment_id"]
                 revision_id = run["revision_id"]
-                revision = self.db.revisions.find_one({"_id": revision_id})
+                revision = self._get_revision(revision_id)
 
             if not revision:
                 raise ValueError(f"No revision found for experiment {experiment_id}. Please create a revision first before running this plugin.")
 
             # Get experiment details
-            experiment = self.db.experiments.find_one({"_id": experiment_id})
+            experiment = self._get_experiment(experiment_id)
             if not experiment:
                 raise ValueError(f"Could not find experiment {experiment_id}")
 
@@ -88,8 +269,7 @@ class PluginAPI:
             yaml_path = revision.get("yaml_path", "")
             if yaml_path:
                 # Read YAML content from file
-                from utils.file_tools import ensure_workspace_path
-                yaml_full_path = ensure_workspace_path(yaml_path)
+                yaml_full_path = file_tools.ensure_workspace_path(yaml_path)
                 try:
                     with open(yaml_full_path, 'r') as f:
                         yaml_text = f.read()
@@ -104,7 +284,7 @@ class PluginAPI:
 
             # Create run using runner (creates DB record and directory structure)
             # config contains only CLI flags (time_scale, no_graphics, num_envs, etc.)
-            run_id = create_run(
+            run_id = runner.create_run(
                 experiment=experiment,
                 revision=revision,
                 yaml_text=yaml_text,
@@ -113,7 +293,7 @@ class PluginAPI:
             )
 
             # Execute the run immediately
-            execute_run(run_id)
+            runner.execute_run(run_id)
 
             logger.info(f"Plugin {self.context.plugin_name} created and executed run {run_id}")
             return SimpleRun(run_id, self)
@@ -127,7 +307,8 @@ class PluginAPI:
         name: str,
         hyperparameters: Dict[str, Any],
         behavior_name: str = None,
-        notes: str = ""
+        notes: str = "",
+        force: bool = False
     ) -> str:
         """
         Create a new revision with hyperparameter updates.
@@ -140,6 +321,8 @@ class PluginAPI:
             hyperparameters: Dict of hyperparameters to update (e.g., {"learning_rate": 0.001})
             behavior_name: Specific behavior to update, or None to update all behaviors
             notes: Description or notes for the revision
+            force: Create the revision even if this execution already created one with
+                   the same hyperparameters from the same parent (whose ID is otherwise returned)
 
         Returns:
             Created revision ID
@@ -152,29 +335,15 @@ class PluginAPI:
             )
         """
         try:
-            from utils.file_tools import ensure_workspace_path
-            from utils.yaml_tools import (
-                load_yaml_with_comments,
-                merge_hyperparameters_into_config,
-                validate_mlagents_config
-            )
-            from io import StringIO
-
             # Get experiment ID
-            experiment_id = self.context.target_id
-            if self.context.scope != 'experiment':
-                run = self.db.runs.find_one({"_id": self.context.target_id})
-                experiment_id = run["experiment_id"]
+            experiment_id = self._get_experiment_id()
 
-            experiment = self.db.experiments.find_one({"_id": experiment_id})
+            experiment = self._get_experiment(experiment_id)
             if not experiment:
                 raise ValueError(f"Experiment {experiment_id} not found")
 
             # Get latest revision
-            latest_revision = self.db.revisions.find_one(
-                {"experiment_id": experiment_id},
-                sort=[("created_at", -1)]
-            )
+            latest_revision = self._get_latest_revision(experiment_id)
             if not latest_revision:
                 raise ValueError(
                     f"No parent revision found for experiment {experiment_id}. "
@@ -184,24 +353,30 @@ class PluginAPI:
             parent_revision_id = str(latest_revision["_id"])
             environment_id = latest_revision.get("environment_id")
 
+            # The same hyperparameters applied again would produce the same config
+            change = ("hyperparameters", behavior_name, hyperparameters)
+            applied_revision_id = self._find_applied_revision(parent_revision_id, change)
+            if applied_revision_id and not force:
+                logger.info(f"Plugin {self.context.plugin_name} reused revision {applied_revision_id} "
+                            "with unchanged hyperparameters")
+                return applied_revision_id
+
             # Load parent YAML with comment preservation
-            parent_yaml_path = ensure_workspace_path(latest_revision["yaml_path"])
-            base_config, yaml_handler = load_yaml_with_comments(parent_yaml_path)
+            parent_yaml_path = file_tools.ensure_workspace_path(latest_revision["yaml_path"])
+            base_config, yaml_handler = _cached_load_yaml(parent_yaml_path)
 
             # Merge hyperparameters into correct nested location
-            updated_config = merge_hyperparameters_into_config(
+            updated_config = yaml_tools.merge_hyperparameters_into_config(
                 base_config,
                 hyperparameters,
                 behavior_name
             )
 
             # Validate the updated config
-            validate_mlagents_config(updated_config)
+            yaml_tools.validate_mlagents_config(updated_config)
 
             # Convert config to YAML string (preserve comments if possible)
-            yaml_stream = StringIO()
-            yaml_handler.dump(updated_config, yaml_stream)
-            yaml_content = yaml_stream.getvalue()
+            yaml_content = _dump_yaml(updated_config, yaml_handler)
 
             # Create RevisionBody for service
             revision_body = RevisionBody(
@@ -216,8 +391,9 @@ class PluginAPI:
             )
 
             # Use service to create revision (handles all directory creation and DB operations)
-            created_revision = self.revisions_service.create_revision(revision_body)
+            created_revision = self._create_revision(revision_body)
             revision_id = created_revision["_id"]
+            self._remember_applied_revision(parent_revision_id, change, revision_id)
 
             logger.info(f"Plugin {self.context.plugin_name} created revision {revision_id} with hyperparameters")
             return revision_id
@@ -231,7 +407,8 @@ class PluginAPI:
         name: str,
         config_updates: Dict[str, Any],
         merge_strategy: str = "deep",
-        notes: str = ""
+        notes: str = "",
+        force: bool = False
     ) -> str:
         """
         Create a new revision with custom configuration updates.
@@ -243,6 +420,8 @@ class PluginAPI:
             config_updates: Dictionary of config updates to merge
             merge_strategy: "deep" (recursive merge) or "shallow" (top-level merge)
             notes: Description or notes for the revision
+            force: Create the revision even if this execution already created one with
+                   the same updates from the same parent (whose ID is otherwise returned)
 
         Returns:
             Created revision ID
@@ -263,29 +442,15 @@ class PluginAPI:
             )
         """
         try:
-            from utils.file_tools import ensure_workspace_path
-            from utils.yaml_tools import (
-                load_yaml_with_comments,
-                deep_merge_dict,
-                validate_mlagents_config
-            )
-            from io import StringIO
-
             # Get experiment ID
-            experiment_id = self.context.target_id
-            if self.context.scope != 'experiment':
-                run = self.db.runs.find_one({"_id": self.context.target_id})
-                experiment_id = run["experiment_id"]
+            experiment_id = self._get_experiment_id()
 
-            experiment = self.db.experiments.find_one({"_id": experiment_id})
+            experiment = self._get_experiment(experiment_id)
             if not experiment:
                 raise ValueError(f"Experiment {experiment_id} not found")
 
             # Get latest revision
-            latest_revision = self.db.revisions.find_one(
-                {"experiment_id": experiment_id},
-                sort=[("created_at", -1)]
-            )
+            latest_revision = self._get_latest_revision(experiment_id)
             if not latest_revision:
                 raise ValueError(
                     f"No parent revision found for experiment {experiment_id}. "
@@ -295,25 +460,31 @@ class PluginAPI:
             parent_revision_id = str(latest_revision["_id"])
             environment_id = latest_revision.get("environment_id")
 
+            # The same updates applied again would produce the same config
+            change = ("config_updates", merge_strategy, config_updates)
+            applied_revision_id = self._find_applied_revision(parent_revision_id, change)
+            if applied_revision_id and not force:
+                logger.info(f"Plugin {self.context.plugin_name} reused revision {applied_revision_id} "
+                            "with unchanged config updates")
+                return applied_revision_id
+
             # Load parent YAML with comment preservation
-            parent_yaml_path = ensure_workspace_path(latest_revision["yaml_path"])
-            base_config, yaml_handler = load_yaml_with_comments(parent_yaml_path)
+            parent_yaml_path = file_tools.ensure_workspace_path(latest_revision["yaml_path"])
+            base_config, yaml_handler = _cached_load_yaml(parent_yaml_path)
 
             # Merge based on strategy
             if merge_strategy == "deep":
-                updated_config = deep_merge_dict(base_config, config_updates)
+                updated_config = yaml_tools.deep_merge_dict(base_config, config_updates)
             else:
                 # Shallow merge
                 updated_config = dict(base_config)
                 updated_config.update(config_updates)
 
             # Validate the updated config
-            validate_mlagents_config(updated_config)
+            yaml_tools.validate_mlagents_config(updated_config)
 
             # Convert config to YAML string (preserve comments if possible)
-            yaml_stream = StringIO()
-            yaml_handler.dump(updated_config, yaml_stream)
-            yaml_content = yaml_stream.getvalue()
+            yaml_content = _dump_yaml(updated_config, yaml_handler)
 
             # Create RevisionBody for service
             revision_body = RevisionBody(
@@ -328,8 +499,9 @@ class PluginAPI:
             )
 
             # Use service to create revision (handles all directory creation and DB operations)
-            created_revision = self.revisions_service.create_revision(revision_body)
+            created_revision = self._create_revision(revision_body)
             revision_id = created_revision["_id"]
+            self._remember_applied_revision(parent_revision_id, change, revision_id)
 
             logger.info(f"Plugin {self.context.plugin_name} created revision {revision_id} with config updates")
             return revision_id
@@ -348,37 +520,22 @@ class PluginAPI:
         This method uses RevisionsService for proper revision creation.
         """
         try:
-            from utils.file_tools import ensure_workspace_path
-            from utils.yaml_tools import (
-                load_yaml_with_comments,
-                deep_merge_dict,
-                validate_mlagents_config
-            )
-            from io import StringIO
-            import yaml as yaml_lib
-
             # Get experiment ID
-            experiment_id = self.context.target_id
-            if self.context.scope != 'experiment':
-                run = self.db.runs.find_one({"_id": self.context.target_id})
-                experiment_id = run["experiment_id"]
+            experiment_id = self._get_experiment_id()
 
-            experiment = self.db.experiments.find_one({"_id": experiment_id})
+            experiment = self._get_experiment(experiment_id)
             if not experiment:
                 raise ValueError(f"Experiment {experiment_id} not found")
 
             # If no parent revision specified, try to get the latest one
             if not parent_revision_id:
-                latest_revision = self.db.revisions.find_one(
-                    {"experiment_id": experiment_id},
-                    sort=[("created_at", -1)]
-                )
+                latest_revision = self._get_latest_revision(experiment_id)
                 parent_revision_id = str(latest_revision["_id"]) if latest_revision else None
 
             # Get environment_id from parent revision if not provided
             if not environment_id:
                 if parent_revision_id:
-                    parent_rev = self.db.revisions.find_one({"_id": parent_revision_id})
+                    parent_rev = self._get_revision(parent_revision_id)
                     environment_id = parent_rev.get("environment_id") if parent_rev else None
 
                 if not environment_id:
@@ -391,11 +548,11 @@ class PluginAPI:
             if not yaml_content:
                 # Load parent revision and merge with new config
                 if parent_revision_id:
-                    parent_rev = self.db.revisions.find_one({"_id": parent_revision_id})
+                    parent_rev = self._get_revision(parent_revision_id)
                     if parent_rev and parent_rev.get("yaml_path"):
-                        parent_yaml_path = ensure_workspace_path(parent_rev["yaml_path"])
+                        parent_yaml_path = file_tools.ensure_workspace_path(parent_rev["yaml_path"])
                         try:
-                            base_config, yaml_handler = load_yaml_with_comments(parent_yaml_path)
+                            base_config, yaml_handler = _cached_load_yaml(parent_yaml_path)
                         except Exception as e:
                             logger.warning(f"Could not load parent YAML with comments: {e}, using basic load")
                             with open(parent_yaml_path, 'r') as f:
@@ -409,21 +566,16 @@ class PluginAPI:
                     yaml_handler = None
 
                 # Deep merge configs
-                updated_config = deep_merge_dict(base_config, config)
+                updated_config = yaml_tools.deep_merge_dict(base_config, config)
 
                 # Validate config
                 try:
-                    validate_mlagents_config(updated_config)
+                    yaml_tools.validate_mlagents_config(updated_config)
                 except Exception as e:
                     logger.warning(f"Config validation warning: {e}")
 
                 # Convert to YAML string
-                if yaml_handler:
-                    yaml_stream = StringIO()
-                    yaml_handler.dump(updated_config, yaml_stream)
-                    yaml_content = yaml_stream.getvalue()
-                else:
-                    yaml_content = yaml_lib.dump(updated_config, default_flow_style=False)
+                yaml_content = _dump_yaml(updated_config, yaml_handler)
 
             # Create RevisionBody for service
             revision_body = RevisionBody(
@@ -438,7 +590,7 @@ class PluginAPI:
             )
 
             # Use service to create revision (handles all directory creation and DB operations)
-            created_revision = self.revisions_service.create_revision(revision_body)
+            created_revision = self._create_revision(revision_body)
             revision_id = created_revision["_id"]
 
             logger.info(f"Plugin {self.context.plugin_name} created revision {revision_id}")
@@ -448,49 +600,121 @@ class PluginAPI:
             logger.error(f"Error creating revision in plugin {self.context.plugin_name}: {e}")
             raise
     
-    def wait(self, seconds: int = None, minutes: int = None, steps: int = None):
-        """Wait for specified time or steps."""
+    def wait(self, seconds: int = None, minutes: int = None, steps: int = None,
+             run: 'SimpleRun' = None, timeout_minutes: int = 60):
+        """
+        Wait for specified time or steps.
+
+        With steps and a run, waits until the run reports that many more
+        training steps (or stops running, or timeout_minutes pass), checking
+        with a backoff from 0.5s up to 30s. The steps are counted from the
+        first step the run reports, if it hasn't reported any yet.
+        """
         if seconds:
             time.sleep(seconds)
         elif minutes:
             time.sleep(minutes * 60)
         elif steps:
-            # For steps, we simulate by waiting proportional time
-            # In real implementation, this would monitor actual training steps
-            time.sleep(steps / 100)  # Rough approximation
+            if run is None:
+                # Without a run to watch, approximate with a proportional time
+                time.sleep(steps / 100)
+                return
+            deadline = time.monotonic() + timeout_minutes * 60
+            target_step = None
+            delay = 0.5
+            while run.is_running():
+                step = run.get_step()
+                if step is not None:
+                    if target_step is None:
+                        target_step = step + steps
+                    elif step >= target_step:
+                        break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                time.sleep(min(delay, remaining))
+                delay = min(delay * 1.5, 30)
     
     def wait_for_completion(self, runs: List['SimpleRun'], timeout_minutes: int = 60):
-        """Wait for runs to complete."""
-        start_time = time.time()
-        timeout_seconds = timeout_minutes * 60
-        
-        while time.time() - start_time < timeout_seconds:
-            all_completed = True
+        """
+        Wait for runs to complete.
+
+        Wakes up on changes to the runs through a change stream when MongoDB
+        supports them (replica sets), otherwise polls with a backoff.
+        """
+        # Notes written so far are visible while the runs train
+        self.flush_notes()
+        run_ids = [run.run_id for run in runs]
+        if not run_ids:
+            return
+        try:
+            self._wait_for_runs(run_ids, timeout_minutes)
+        finally:
+            # Status checks after the wait must see the final state
             for run in runs:
-                if run.is_running():
-                    all_completed = False
-                    break
-            
-            if all_completed:
+                run.refresh()
+
+    def _wait_for_runs(self, run_ids: List[str], timeout_minutes: int):
+        """Block until none of the runs is active or the timeout expires."""
+        deadline = time.monotonic() + timeout_minutes * 60
+        active_filter = {"_id": {"$in": run_ids}, "status": {"$in": ACTIVE_RUN_STATUSES}}
+
+        def any_active() -> bool:
+            # One query for all runs instead of one per run
+            return self.db.runs.find_one(active_filter, {"_id": 1}) is not None
+
+        try:
+            # Opened before the first check so no status change is missed in between
+            with self.db.runs.watch(
+                [{"$match": {"documentKey._id": {"$in": run_ids}}}],
+                max_await_time_ms=10000
+            ) as stream:
+                while any_active() and time.monotonic() < deadline:
+                    stream.try_next()
+            return
+        except (PyMongoError, NotImplementedError) as e:
+            # Standalone servers have no change streams
+            logger.debug(f"Change stream unavailable, polling run status: {e}")
+
+        delay = 2
+        while any_active():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
                 break
-                
-            time.sleep(10)  # Check every 10 seconds
+            time.sleep(min(delay, remaining))
+            delay = min(delay * 2, 30)
     
-    def get_experiment_data(self) -> Dict[str, Any]:
-        """Get experiment data and history."""
-        experiment_id = self.context.target_id
-        if self.context.scope != 'experiment':
-            run = self.db.runs.find_one({"_id": self.context.target_id})
-            experiment_id = run["experiment_id"]
+    def get_experiment_data(self, fields: Optional[Dict[str, Optional[Dict[str, int]]]] = None,
+                            as_arrays: bool = False) -> Dict[str, Any]:
+        """
+        Get experiment data and history.
+
+        Args:
+            fields: MongoDB projections by collection ("runs", "revisions"), replacing
+                    EXPERIMENT_DATA_FIELDS for that collection. None returns whole documents.
+            as_arrays: Return runs and revisions as columns ({field: [values]}) instead of
+                       lists of documents
+
+        Returns:
+            Dict with the experiment document, its runs and its revisions
+        """
+        experiment_id = self._get_experiment_id()
+        projections = {**EXPERIMENT_DATA_FIELDS, **(fields or {})}
         
-        # Get experiment
+        # Get experiment (read fresh, plugins may keep and modify the returned data)
         experiment = self.db.experiments.find_one({"_id": experiment_id})
         
-        # Get all runs for this experiment
-        runs = list(self.db.runs.find({"experiment_id": experiment_id}))
+        # Get all runs and revisions for this experiment, only with the fields needed
+        runs = list(self.db.runs.find(
+            {"experiment_id": experiment_id}, projections["runs"], batch_size=500
+        ))
+        revisions = list(self.db.revisions.find(
+            {"experiment_id": experiment_id}, projections["revisions"], batch_size=500
+        ))
         
-        # Get all revisions
-        revisions = list(self.db.revisions.find({"experiment_id": experiment_id}))
+        if as_arrays:
+            runs = _to_columns(runs, projections["runs"])
+            revisions = _to_columns(revisions, projections["revisions"])
         
         return {
             "experiment": experiment,
@@ -499,44 +723,59 @@ class PluginAPI:
         }
     
     def add_note(self, message: str, target_type: str = "experiment"):
-        """Add a note to experiment or run."""
-        timestamp = datetime.now(timezone.utc).isoformat()
-        note = f"[{timestamp}] {self.context.plugin_name}: {message}"
-        
+        """
+        Add a note to experiment or run.
+
+        Notes are buffered and written in batches, when NOTE_FLUSH_THRESHOLD
+        notes are pending for a target, when waiting for runs and when the
+        plugin finishes (see flush_notes).
+        """
         if target_type == "experiment" or self.context.scope == "experiment":
             # Add to experiment notes
-            experiment_id = self.context.target_id
-            if self.context.scope != 'experiment':
-                run = self.db.runs.find_one({"_id": self.context.target_id})
-                experiment_id = run["experiment_id"]
-            
-            self.db.experiments.update_one(
-                {"_id": experiment_id},
-                {"$push": {"plugin_notes": note}}
-            )
+            target = ("experiments", self._get_experiment_id())
         else:
             # Add to run notes
-            run_id = self.context.target_id
-            self.db.runs.update_one(
-                {"_id": run_id},
-                {"$push": {"plugin_notes": note}}
+            target = ("runs", self.context.target_id)
+        
+        # Formatted when written, see flush_notes
+        notes = self._note_buffer[target]
+        notes.append((time.time(), message))
+        if len(notes) >= self.NOTE_FLUSH_THRESHOLD:
+            self.flush_notes()
+    
+    def flush_notes(self):
+        """Write the buffered notes, one bulk write per collection."""
+        if not self._note_buffer:
+            return
+        buffered, self._note_buffer = self._note_buffer, defaultdict(list)
+        
+        prefix = f"] {self.context.plugin_name}: "
+        updates: Dict[str, List[UpdateOne]] = defaultdict(list)
+        for (collection, target_id), notes in buffered.items():
+            formatted = [
+                f"[{datetime.fromtimestamp(timestamp, timezone.utc).isoformat()}{prefix}{message}"
+                for timestamp, message in notes
+            ]
+            updates[collection].append(
+                UpdateOne({"_id": target_id}, {"$push": {"plugin_notes": {"$each": formatted, "$slice": -MAX_PLUGIN_NOTES}}})
             )
+            self._doc_cache.pop((collection, target_id), None)
+        for collection, requests in updates.items():
+            getattr(self.db, collection).bulk_write(requests, ordered=False)
     
     def mutate_config(self, base_config: Dict[str, Any], 
                      mutation_rate: float = 0.2) -> Dict[str, Any]:
         """Create a mutated version of a configuration."""
-        import random
-        import copy
-        
-        new_config = copy.deepcopy(base_config)
+        # Only top-level values are replaced, so a shallow copy is enough (copy() keeps
+        # the type and comments of a ruamel CommentedMap, like the yaml_tools merges)
+        new_config = base_config.copy()
+        rand, uniform = random.random, random.uniform
         
-        # Simple mutation strategy for numeric values
-        for key, value in new_config.items():
-            if isinstance(value, (int, float)) and random.random() < mutation_rate:
-                if isinstance(value, int):
-                    new_config[key] = int(value * (1 + random.uniform(-0.2, 0.2)))
-                else:
-                    new_config[key] = value * (1 + random.uniform(-0.2, 0.2))
+        # Simple mutation strategy for numeric values (bools are flags, not numbers)
+        for key, value in base_config.items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool) and rand() < mutation_rate:
+                factor = 1 + uniform(-0.2, 0.2)
+                new_config[key] = int(value * factor) if isinstance(value, int) else value * factor
         
         return new_config
     
@@ -550,44 +789,71 @@ class PluginAPI:
 class SimpleRun:
     """Simple wrapper around run data for plugin convenience."""
     
+    # Fields of the run document used by the methods below
+    _PROJECTION = {"status": 1, "cli_flags": 1, "stdout_log_path": 1}
+    
     def __init__(self, run_id: str, api: PluginAPI):
         self.run_id = run_id
         self.api = api
+        # (monotonic time of the query, run document), reused for _doc_ttl seconds
+        self._doc_cache: Optional[Tuple[float, Optional[Dict[str, Any]]]] = None
+        self._doc_ttl = 1.0
+        # Fake performance for demo, see get_reward
+        self._fake_reward = 100.0 + hash(run_id) % 100
+    
+    def _fetch(self, force: bool = False) -> Optional[Dict[str, Any]]:
+        """Get the run document, reusing a query made less than _doc_ttl seconds ago."""
+        now = time.monotonic()
+        if not force and self._doc_cache is not None and now - self._doc_cache[0] < self._doc_ttl:
+            return self._doc_cache[1]
+        run = self.api.db.runs.find_one({"_id": self.run_id}, self._PROJECTION)
+        self._doc_cache = (now, run)
+        return run
+    
+    def refresh(self):
+        """Forget the cached run document, the next call reads the current state."""
+        self._doc_cache = None
     
     def is_running(self) -> bool:
         """Check if run is still active."""
-        run = self.api.db.runs.find_one({"_id": self.run_id})
-        return run and run.get("status") in ["running", "starting"]
+        run = self._fetch()
+        return run and run.get("status") in ACTIVE_RUN_STATUSES
     
     def is_completed(self) -> bool:
         """Check if run completed successfully."""
-        run = self.api.db.runs.find_one({"_id": self.run_id})
+        run = self._fetch()
         return run and run.get("status") == "completed"
     
     def get_status(self) -> str:
         """Get current run status."""
-        run = self.api.db.runs.find_one({"_id": self.run_id})
+        run = self._fetch()
         return run.get("status", "unknown") if run else "not_found"
     
     def get_reward(self) -> float:
         """Extract reward/performance from run (placeholder)."""
         # Placeholder implementation
         # In real implementation, this would parse TensorBoard logs or training output
-        return 100.0 + hash(self.run_id) % 100  # Fake performance for demo
+        return self._fake_reward
     
     def get_logs(self, last_lines: int = 100) -> List[str]:
         """Get recent log lines from run."""
-        run = self.api.db.runs.find_one({"_id": self.run_id})
+        run = self._fetch()
         if not run or not run.get("stdout_log_path"):
             return []
         
         try:
-            with open(run["stdout_log_path"], 'r') as f:
-                lines = f.readlines()
-                return [line.strip() for line in lines[-last_lines:]]
+            return [line.strip() for line in tail_file_lines(run["stdout_log_path"], last_lines)]
         except Exception:
             return []
     
+    def get_step(self) -> Optional[int]:
+        """Latest training step reported in the run's log, None before the first report."""
+        for line in reversed(self.get_logs(50)):
+            match = _STEP_PATTERN.search(line)
+            if match:
+                return int(match.group(1))
+        return None
+    
     def add_note(self, message: str):
         """Add note to this run."""
         self.api.add_note(message, target_type="run")
@@ -595,5 +861,5 @@ class SimpleRun:
     @property 
     def config(self) -> Dict[str, Any]:
         """Get run configuration."""
-        run = self.api.db.runs.find_one({"_id": self.run_id})
+        run = self._fetch()
         return run.get("cli_flags", {}) if run else {}
\ No newline at end of file
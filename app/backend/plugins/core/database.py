@@ -6,53 +6,163 @@ plugin fields to existing collections.
 """
 
 import os
-from typing import Dict, Any, List, Optional
+import logging
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
-from pymongo import ASCENDING
-from db import BaseCollection, get_db
+from pymongo import ASCENDING, IndexModel, UpdateOne
+from pymongo.write_concern import WriteConcern
+from pymongo.errors import OperationFailure, PyMongoError
+from db import BaseCollection, get_db, experiments, runs, revisions
+
+logger = logging.getLogger(__name__)
+
+# Index already exists under another name (IndexOptionsConflict) or with other options (IndexKeySpecsConflict)
+_INDEX_CONFLICT_CODES = (85, 86)
+_INDEX_OPTIONS_CONFLICT = 85
+
+# Notes kept per experiment or run, older ones are dropped when new notes are pushed
+MAX_PLUGIN_NOTES = 500
+
+# Collections that plugin notes can be added to, by target type
+_NOTE_TARGETS = {"experiment": experiments, "run": runs}
+
+
+def _create_indexes(collection, indexes: List[IndexModel]) -> None:
+    """Create the indexes in one command, logging (not raising) failures."""
+    try:
+        collection.create_indexes(indexes)
+    except OperationFailure as e:
+        if e.code not in _INDEX_CONFLICT_CODES:
+            logger.error(f"Could not create indexes on {collection.name}: {e}")
+        else:
+            # An equivalent index already exists (e.g. created before it was named)
+            logger.debug(f"Indexes on {collection.name} already exist: {e}")
+    except PyMongoError as e:
+        logger.error(f"Could not create indexes on {collection.name}: {e}")
 
 
 class PluginExecutionsCollection(BaseCollection):
     """Collection for tracking plugin execution state."""
     
+    # Fields returned by find_active, enough to identify the executions without their (large) metadata
+    ACTIVE_PROJECTION = {"execution_id": 1, "target_id": 1, "plugin_name": 1, "status": 1, "updated_at": 1, "_id": 0}
+    
+    # Statuses that end an execution and set completed_at
+    TERMINAL_STATUSES = frozenset({"completed", "failed", "stopped"})
+    # Finished executions are removed by MongoDB this long after completed_at
+    RETENTION_SECONDS = int(os.getenv("PLUGIN_EXECUTION_RETENTION_DAYS", "30")) * 24 * 3600
+    
+    # Indexes of the target and active lookups (equality fields first), also used as query hints
+    TARGET_INDEX = [("target_id", ASCENDING), ("scope", ASCENDING), ("status", ASCENDING)]
+    ACTIVE_INDEX = [("status", ASCENDING), ("updated_at", ASCENDING)]
+    
     def __init__(self):
         super().__init__("plugin_executions")
-        # Create indexes
-        self.collection.create_index([("execution_id", ASCENDING)], unique=True)
-        self.collection.create_index([("target_id", ASCENDING)])
-        self.collection.create_index([("plugin_name", ASCENDING)])
-        self.collection.create_index([("status", ASCENDING)])
+        # Unacknowledged writes, for status updates the caller doesn't wait for
+        self._unacknowledged = self.collection.with_options(write_concern=WriteConcern(w=0))
+    
+    def ensure_indexes(self) -> None:
+        """Create the collection indexes (called once at app startup)."""
+        _create_indexes(self.collection, [
+            IndexModel([("execution_id", ASCENDING)], unique=True),
+            IndexModel(self.TARGET_INDEX),
+            IndexModel(self.ACTIVE_INDEX),
+        ])
+        self._ensure_ttl_index()
+    
+    def _ensure_ttl_index(self) -> None:
+        """
+        Create the TTL index, only finished executions have a completed_at date.
+        
+        Created on its own so a changed retention can't block the other indexes.
+        If the index exists with another expireAfterSeconds, it is updated in place.
+        """
+        key = [("completed_at", ASCENDING)]
+        try:
+            self.collection.create_index(key, expireAfterSeconds=self.RETENTION_SECONDS)
+        except OperationFailure as e:
+            if e.code != _INDEX_OPTIONS_CONFLICT:
+                logger.error(f"Could not create the TTL index on {self.collection.name}: {e}")
+                return
+            try:
+                self.db.command({
+                    "collMod": self.collection.name,
+                    "index": {"keyPattern": dict(key), "expireAfterSeconds": self.RETENTION_SECONDS},
+                })
+                logger.info(f"Plugin execution retention on {self.collection.name} set to {self.RETENTION_SECONDS}s")
+            except PyMongoError as e:
+                logger.warning(f"Could not update the plugin execution retention on {self.collection.name}: {e}")
+        except PyMongoError as e:
+            logger.error(f"Could not create the TTL index on {self.collection.name}: {e}")
+    
+    def _find_hinted(self, query: Dict[str, Any], index: List[Tuple[str, int]],
+                     projection: Dict[str, Any] = None, batch_size: int = 256) -> List[Dict[str, Any]]:
+        """
+        Find with the query pinned to index, so the plan cache can't switch to a
+        worse plan (e.g. an old single-field index). Falls back to an unhinted
+        query if the index doesn't exist yet (it is created at app startup).
+        
+        batch_size sets the documents per server reply (the server's default first
+        batch is 101), so the expected results come back in a single round-trip.
+        """
+        try:
+            return list(self.collection.find(query, projection).hint(index).batch_size(batch_size))
+        except OperationFailure as e:
+            logger.warning(f"Hinted query on {self.collection.name} failed, retrying without hint: {e}")
+            return self.find_many(query, projection=projection)
     
     def find_by_target(self, target_id: str, scope: str = None) -> List[Dict[str, Any]]:
         """Find all executions for a target."""
         query = {"target_id": target_id}
         if scope:
             query["scope"] = scope
-        return self.find_many(query)
+        return self._find_hinted(query, self.TARGET_INDEX)
+    
+    def find_by_targets(self, target_ids: List[str], scope: str = None) -> List[Dict[str, Any]]:
+        """Find all executions for several targets in one query."""
+        query = {"target_id": {"$in": list(target_ids)}}
+        if scope:
+            query["scope"] = scope
+        return self._find_hinted(query, self.TARGET_INDEX)
     
     def find_active(self) -> List[Dict[str, Any]]:
         """Find all active (running) executions."""
-        return self.find_many({"status": {"$in": ["running", "pending"]}})
+        return self._find_hinted(
+            {"status": {"$in": ["running", "pending"]}},
+            self.ACTIVE_INDEX,
+            projection=self.ACTIVE_PROJECTION,
+            # Tens to hundreds of small projected documents, all in one reply
+            batch_size=500
+        )
     
     def update_status(self, execution_id: str, status: str, 
-                     error_message: str = None, metadata: Dict[str, Any] = None) -> bool:
-        """Update execution status."""
-        update_doc = {
-            "status": status,
-            "updated_at": datetime.utcnow()
-        }
+                     error_message: str = None, metadata: Dict[str, Any] = None,
+                     acknowledged: bool = True) -> bool:
+        """
+        Update execution status.
+        
+        The timestamps are set by the server. Repeating the current status with
+        no error message or metadata writes nothing and returns False, like an
+        unknown execution_id. With acknowledged=False the update is sent without
+        waiting for the server and True is returned without knowing whether a
+        document changed.
+        """
+        query = {"execution_id": execution_id}
+        update_doc = {"status": status}
         if error_message:
             update_doc["error_message"] = error_message
         if metadata:
             update_doc["metadata"] = metadata
-        if status in ["completed", "failed", "stopped"]:
-            update_doc["completed_at"] = datetime.utcnow()
+        if len(update_doc) == 1:
+            # Status-only update: matches nothing (no write, no oplog entry) when unchanged
+            query["status"] = {"$ne": status}
+        timestamps = {"updated_at": True}
+        if status in self.TERMINAL_STATUSES:
+            timestamps["completed_at"] = True
         
-        result = self.collection.update_one(
-            {"execution_id": execution_id},
-            {"$set": update_doc}
-        )
-        return result.modified_count > 0
+        collection = self.collection if acknowledged else self._unacknowledged
+        result = collection.update_one(query, {"$set": update_doc, "$currentDate": timestamps})
+        return result.modified_count > 0 if acknowledged else True
 
 
 class PluginSettingsCollection(BaseCollection):
@@ -60,9 +170,18 @@ class PluginSettingsCollection(BaseCollection):
     
     def __init__(self):
         super().__init__("plugin_settings")
-        # Create indexes
-        self.collection.create_index([("user_id", ASCENDING)])
-        self.collection.create_index([("plugin_name", ASCENDING)])
+    
+    def ensure_indexes(self) -> None:
+        """Create the collection indexes (called once at app startup)."""
+        _create_indexes(self.collection, [
+            # One settings document per user and plugin
+            IndexModel([("user_id", ASCENDING), ("plugin_name", ASCENDING)], unique=True),
+            # Only enabled plugins are listed per user
+            IndexModel(
+                [("user_id", ASCENDING), ("scope", ASCENDING)],
+                partialFilterExpression={"settings.enabled": True}
+            ),
+        ])
     
     def get_user_plugin_settings(self, user_id: str, plugin_name: str) -> Dict[str, Any]:
         """Get plugin settings for a user."""
@@ -72,17 +191,16 @@ class PluginSettingsCollection(BaseCollection):
     def update_user_plugin_settings(self, user_id: str, plugin_name: str, 
                                   settings: Dict[str, Any]) -> bool:
         """Update plugin settings for a user."""
+        # Upserted or updated (updated_at always changes), so success is the server's ack
         result = self.collection.update_one(
             {"user_id": user_id, "plugin_name": plugin_name},
             {
-                "$set": {
-                    "settings": settings,
-                    "updated_at": datetime.utcnow()
-                }
+                "$set": {"settings": settings},
+                "$currentDate": {"updated_at": True}
             },
             upsert=True
         )
-        return result.upserted_id is not None or result.modified_count > 0
+        return result.acknowledged
     
     def get_enabled_plugins(self, user_id: str, scope: str = None) -> List[str]:
         """Get list of enabled plugins for a user."""
@@ -90,8 +208,8 @@ class PluginSettingsCollection(BaseCollection):
         if scope:
             query["scope"] = scope
         
-        docs = self.find_many(query)
-        return [doc["plugin_name"] for doc in docs]
+        cursor = self.collection.find(query, {"plugin_name": 1, "_id": 0}).batch_size(256)
+        return [doc["plugin_name"] for doc in cursor]
 
 
 def extend_existing_collections():
@@ -99,46 +217,53 @@ def extend_existing_collections():
     db = get_db()
     
     # Add plugin-related indexes to existing collections
-    try:
-        # Experiments collection - for experiment-level plugins
-        db.experiments.create_index([("enabled_plugins", ASCENDING)])
-        
-        # Runs collection - for run-level plugins and plugin-generated notes
-        db.runs.create_index([("enabled_plugins", ASCENDING)])
-        
-        # Revisions collection - for plugin-generated revisions
-        db.revisions.create_index([("created_by_plugin", ASCENDING)])
-        
-    except Exception as e:
-        # Indexes might already exist
-        pass
+    # Experiments collection - for experiment-level plugins
+    _create_indexes(db.experiments, [IndexModel([("enabled_plugins", ASCENDING)], name="enabled_plugins_idx")])
+    
+    # Runs collection - for run-level plugins and plugin-generated notes
+    _create_indexes(db.runs, [IndexModel([("enabled_plugins", ASCENDING)], name="enabled_plugins_idx")])
+    
+    # Revisions collection - for plugin-generated revisions
+    _create_indexes(db.revisions, [IndexModel([("created_by_plugin", ASCENDING)], name="created_by_plugin_idx")])
+
+
+def init_plugin_db():
+    """Create the plugin-related indexes (called once at app startup)."""
+    plugin_executions.ensure_indexes()
+    plugin_settings.ensure_indexes()
+    extend_existing_collections()
 
 
 # Extension functions for existing collections
-def add_plugin_to_experiment(experiment_id: str, plugin_name: str, settings: Dict[str, Any] = None):
-    """Add a plugin to an experiment."""
-    from db import experiments
-    
-    plugin_config = {
-        "name": plugin_name,
-        "enabled": True,
-        "settings": settings or {},
-        "enabled_at": datetime.utcnow()
-    }
-    
-    experiments.collection.update_one(
-        {"_id": experiment_id},
+def _plugin_configs(plugins: Dict[str, Optional[Dict[str, Any]]], enabled_at: datetime) -> List[Dict[str, Any]]:
+    """Build the enabled_plugins entries for several plugins (name -> settings)."""
+    return [
+        {"name": plugin_name, "enabled": True, "settings": settings or {}, "enabled_at": enabled_at}
+        for plugin_name, settings in plugins.items()
+    ]
+
+
+def _add_plugins(target: BaseCollection, target_id: str, plugins: Dict[str, Optional[Dict[str, Any]]]):
+    """Push enabled_plugins entries (name -> settings) to an experiment or run in one update."""
+    if not plugins:
+        return
+    now = datetime.utcnow()
+    target.collection.update_one(
+        {"_id": target_id},
         {
-            "$push": {"enabled_plugins": plugin_config},
-            "$set": {"updated_at": datetime.utcnow()}
+            "$push": {"enabled_plugins": {"$each": _plugin_configs(plugins, now)}},
+            "$set": {"updated_at": now}
         }
     )
 
 
+def add_plugin_to_experiment(experiment_id: str, plugin_name: str, settings: Dict[str, Any] = None):
+    """Add a plugin to an experiment."""
+    _add_plugins(experiments, experiment_id, {plugin_name: settings})
+
+
 def remove_plugin_from_experiment(experiment_id: str, plugin_name: str):
     """Remove a plugin from an experiment."""
-    from db import experiments
-    
     experiments.collection.update_one(
         {"_id": experiment_id},
         {
@@ -150,51 +275,54 @@ def remove_plugin_from_experiment(experiment_id: str, plugin_name: str):
 
 def add_plugin_to_run(run_id: str, plugin_name: str, settings: Dict[str, Any] = None):
     """Add a plugin to a run."""
-    from db import runs
-    
-    plugin_config = {
-        "name": plugin_name,
-        "enabled": True,
-        "settings": settings or {},
-        "enabled_at": datetime.utcnow()
-    }
-    
-    runs.collection.update_one(
-        {"_id": run_id},
-        {
-            "$push": {"enabled_plugins": plugin_config},
-            "$set": {"updated_at": datetime.utcnow()}
-        }
-    )
+    _add_plugins(runs, run_id, {plugin_name: settings})
 
 
 def add_plugin_note(target_id: str, target_type: str, plugin_name: str, note: str):
     """Add a plugin-generated note to experiment or run."""
-    from db import experiments, runs
-    
-    note_doc = {
-        "plugin_name": plugin_name,
-        "content": note,
-        "timestamp": datetime.utcnow()
-    }
+    add_plugin_notes_bulk([(target_id, target_type, plugin_name, note)])
+
+
+def add_plugins_to_experiment_bulk(experiment_id: str, plugins: Dict[str, Optional[Dict[str, Any]]]):
+    """Add several plugins (name -> settings) to an experiment in one update."""
+    _add_plugins(experiments, experiment_id, plugins)
+
+
+def add_plugins_to_run_bulk(run_id: str, plugins: Dict[str, Optional[Dict[str, Any]]]):
+    """Add several plugins (name -> settings) to a run in one update."""
+    _add_plugins(runs, run_id, plugins)
+
+
+def add_plugin_notes_bulk(notes: List[Tuple[str, str, str, str]]):
+    """
+    Add several plugin-generated notes at once.
     
-    if target_type == "experiment":
-        experiments.collection.update_one(
-            {"_id": target_id},
-            {"$push": {"plugin_notes": note_doc}}
-        )
-    elif target_type == "run":
-        runs.collection.update_one(
-            {"_id": target_id},
-            {"$push": {"plugin_notes": note_doc}}
+    Each note is a (target_id, target_type, plugin_name, note) tuple, as the
+    arguments of add_plugin_note. The notes of each target are pushed in one
+    update, with one write per collection.
+    """
+    timestamp = datetime.utcnow()
+    by_target: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+    for target_id, target_type, plugin_name, note in notes:
+        by_target.setdefault((target_type, target_id), []).append(
+            {"plugin_name": plugin_name, "content": note, "timestamp": timestamp}
         )
+    
+    for target_type, target in _NOTE_TARGETS.items():
+        updates = [
+            ({"_id": target_id}, {"$push": {"plugin_notes": {"$each": note_docs, "$slice": -MAX_PLUGIN_NOTES}}})
+            for (note_type, target_id), note_docs in by_target.items()
+            if note_type == target_type
+        ]
+        if len(updates) == 1:
+            target.collection.update_one(*updates[0])
+        elif updates:
+            target.collection.bulk_write([UpdateOne(*update) for update in updates], ordered=False)
 
 
 def mark_revision_as_plugin_created(revision_id: str, plugin_name: str, 
                                   source_data: Dict[str, Any] = None):
     """Mark a revision as created by a plugin."""
-    from db import revisions
-    
     update_doc = {
         "created_by_plugin": plugin_name,
         "plugin_metadata": source_data or {}
@@ -211,29 +339,48 @@ def get_plugin_executions_for_target(target_id: str, scope: str = None) -> List[
     return plugin_executions.find_by_target(target_id, scope)
 
 
+def get_plugin_executions_for_targets(target_ids: List[str], scope: str = None) -> Dict[str, List[Dict[str, Any]]]:
+    """Get all plugin executions for several targets, keyed by target ID."""
+    executions = {target_id: [] for target_id in target_ids}
+    for doc in plugin_executions.find_by_targets(executions, scope):
+        executions[doc["target_id"]].append(doc)
+    return executions
+
+
+def _enabled_plugins_by_id(collection, ids: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+    """Read the enabled plugins of several documents in one query, keyed by _id."""
+    enabled = {doc_id: [] for doc_id in ids}
+    for doc in collection.find({"_id": {"$in": list(enabled)}}, {"enabled_plugins": 1}):
+        enabled[doc["_id"]] = doc.get("enabled_plugins", [])
+    return enabled
+
+
 def get_experiment_plugins(experiment_id: str) -> List[Dict[str, Any]]:
     """Get enabled plugins for an experiment."""
-    from db import experiments
-    
-    experiment = experiments.find_one({"_id": experiment_id})
+    experiment = experiments.find_one({"_id": experiment_id}, {"enabled_plugins": 1, "_id": 0})
     return experiment.get("enabled_plugins", []) if experiment else []
 
 
 def get_run_plugins(run_id: str) -> List[Dict[str, Any]]:
     """Get enabled plugins for a run."""
-    from db import runs
-    
-    run = runs.find_one({"_id": run_id})
+    run = runs.find_one({"_id": run_id}, {"enabled_plugins": 1, "_id": 0})
     return run.get("enabled_plugins", []) if run else []
 
 
+def get_experiment_plugins_bulk(experiment_ids: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+    """Get enabled plugins for several experiments, keyed by experiment ID."""
+    return _enabled_plugins_by_id(experiments.collection, experiment_ids)
+
+
+def get_run_plugins_bulk(run_ids: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+    """Get enabled plugins for several runs, keyed by run ID."""
+    return _enabled_plugins_by_id(runs.collection, run_ids)
+
+
 # Collection instances
 plugin_executions = PluginExecutionsCollection()
 plugin_settings = PluginSettingsCollection()
 
-# Initialize database extensions
-extend_existing_collections()
-
 
 # Export database extension function for use in main db module
 def get_plugin_database():
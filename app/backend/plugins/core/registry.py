@@ -5,19 +5,22 @@ Plugins are just functions that receive (context, api) parameters.
 No classes, no complex inheritance - just simple functions.
 """
 
+import importlib
 import logging
-from typing import Dict, Any, List, Callable, Optional
+import threading
+from types import MappingProxyType
+from typing import Dict, Any, List, Callable, Mapping, Optional, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class PluginInfo:
     """Information about a registered plugin."""
     name: str
-    function: Callable
+    function: Optional[Callable]  # None until the module of a lazily registered plugin is imported
     scope: str  # 'experiment', 'run', 'revision'
     description: str
     version: str = "1.0.0"
@@ -26,20 +29,25 @@ class PluginInfo:
     enabled_by_default: bool = False
     tags: List[str] = field(default_factory=list)
     icon: str = "⚙️"  # Default icon emoji
+    module: Optional[str] = None  # Module that registers the plugin, set for lazy entries
+    # to_dict() result, built once: a registered plugin is replaced, not modified
+    _cached_dict: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False, compare=False)
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for API responses."""
-        return {
-            "name": self.name,
-            "scope": self.scope,
-            "description": self.description,
-            "version": self.version,
-            "author": self.author,
-            "settings_schema": self.settings_schema,
-            "enabled_by_default": self.enabled_by_default,
-            "tags": self.tags,
-            "icon": self.icon
-        }
+        if self._cached_dict is None:
+            self._cached_dict = {
+                "name": self.name,
+                "scope": self.scope,
+                "description": self.description,
+                "version": self.version,
+                "author": self.author,
+                "settings_schema": self.settings_schema,
+                "enabled_by_default": self.enabled_by_default,
+                "tags": self.tags,
+                "icon": self.icon
+            }
+        return self._cached_dict
 
 
 class SimplePluginRegistry:
@@ -47,6 +55,10 @@ class SimplePluginRegistry:
     
     def __init__(self):
         self._plugins: Dict[str, PluginInfo] = {}
+        # Plugin modules may be imported (and register) from several threads
+        self._lock = threading.Lock()
+        # Results of the list/info lookups, which only change when plugins (un)register
+        self._lookup_cache: Dict[tuple, Any] = {}
     
     def register(self,
                  name: str,
@@ -74,9 +86,6 @@ class SimplePluginRegistry:
             tags: List of tags for categorization
             icon: Icon emoji for UI display
         """
-        if name in self._plugins:
-            logger.warning(f"Plugin '{name}' is already registered, overwriting")
-
         if scope not in ['experiment', 'run', 'revision']:
             raise ValueError(f"Invalid scope '{scope}'. Must be 'experiment', 'run', or 'revision'")
 
@@ -97,42 +106,91 @@ class SimplePluginRegistry:
             icon=icon
         )
 
-        self._plugins[name] = plugin_info
+        with self._lock:
+            existing = self._plugins.get(name)
+            # A lazy entry is replaced by the real plugin when its module is imported
+            if existing is not None and existing.function is not None:
+                logger.warning(f"Plugin '{name}' is already registered, overwriting")
+            self._plugins[name] = plugin_info
+            self._lookup_cache.clear()
         logger.info(f"Registered plugin '{name}' (scope: {scope})")
     
+    def register_lazy(self, name: str, module: str, scope: str, description: str = "",
+                      settings_schema: Dict[str, Any] = None, tags: List[str] = None, **info) -> None:
+        """
+        Register a plugin found by scanning its module, without importing it.
+
+        The module is imported when the plugin function is first requested,
+        its decorator then registers the real plugin in place of this entry.
+        The arguments default like those of register().
+        """
+        if scope not in ['experiment', 'run', 'revision']:
+            raise ValueError(f"Invalid scope '{scope}'. Must be 'experiment', 'run', or 'revision'")
+
+        plugin_info = PluginInfo(name=name, function=None, scope=scope, module=module, description=description,
+                                 settings_schema=settings_schema or {}, tags=tags or [], **info)
+        with self._lock:
+            # Never shadow a plugin that is already loaded
+            if name not in self._plugins:
+                self._plugins[name] = plugin_info
+                self._lookup_cache.clear()
+        logger.info(f"Registered lazy plugin '{name}' from {module} (scope: {scope})")
+    
     def unregister(self, name: str) -> bool:
         """Remove a plugin from registry."""
-        if name in self._plugins:
-            del self._plugins[name]
+        with self._lock:
+            removed = self._plugins.pop(name, None) is not None
+            self._lookup_cache.clear()
+        if removed:
             logger.info(f"Unregistered plugin '{name}'")
-            return True
-        return False
+        return removed
     
     def get_plugin(self, name: str) -> Optional[PluginInfo]:
         """Get plugin info by name."""
         return self._plugins.get(name)
     
-    def list_plugins(self, scope: str = None) -> List[str]:
+    def _cached(self, key: tuple, build: Callable[[], Any]) -> Any:
+        """Return the cached lookup result for key, building it on a miss."""
+        try:
+            return self._lookup_cache[key]
+        except KeyError:
+            pass
+        # Built under the lock so a concurrent registration can't leave a stale entry
+        with self._lock:
+            if key not in self._lookup_cache:
+                self._lookup_cache[key] = build()
+            return self._lookup_cache[key]
+    
+    def list_plugins(self, scope: str = None) -> Tuple[str, ...]:
         """List all registered plugin names, optionally filtered by scope."""
-        if scope:
-            return [name for name, info in self._plugins.items() if info.scope == scope]
-        return list(self._plugins.keys())
+        def build():
+            if scope:
+                return tuple(name for name, info in self._plugins.items() if info.scope == scope)
+            return tuple(self._plugins)
+        return self._cached(("list", scope), build)
     
-    def get_plugins_info(self, scope: str = None) -> List[Dict[str, Any]]:
+    def get_plugins_info(self, scope: str = None) -> Tuple[Dict[str, Any], ...]:
         """Get detailed info about all plugins."""
-        plugins = self._plugins.values()
-        if scope:
-            plugins = [info for info in plugins if info.scope == scope]
-        return [info.to_dict() for info in plugins]
+        def build():
+            plugins = self._plugins.values()
+            if scope:
+                plugins = [info for info in plugins if info.scope == scope]
+            return tuple(info.to_dict() for info in plugins)
+        return self._cached(("info", scope), build)
     
     def get_plugin_function(self, name: str) -> Optional[Callable]:
-        """Get the actual plugin function."""
-        plugin_info = self.get_plugin(name)
+        """Get the actual plugin function, importing the module of a lazy entry."""
+        plugin_info = self._plugins.get(name)
+        if plugin_info is not None and plugin_info.function is None and plugin_info.module:
+            importlib.import_module(plugin_info.module)
+            plugin_info = self._plugins.get(name)
         return plugin_info.function if plugin_info else None
     
-    def get_plugins_by_scope(self, scope: str) -> Dict[str, PluginInfo]:
-        """Get all plugins for a specific scope."""
-        return {name: info for name, info in self._plugins.items() if info.scope == scope}
+    def get_plugins_by_scope(self, scope: str) -> Mapping[str, PluginInfo]:
+        """Get all plugins for a specific scope (read-only view)."""
+        return self._cached(("by_scope", scope), lambda: MappingProxyType(
+            {name: info for name, info in self._plugins.items() if info.scope == scope}
+        ))
     
     def validate_plugin_settings(self, plugin_name: str, settings: Dict[str, Any]) -> bool:
         """Validate settings against plugin schema (basic validation)."""
@@ -196,33 +254,51 @@ def register_plugin(name: str,
     return decorator
 
 
+_discover_plugins = None
+
+
+def _ensure_discovered():
+    """Load the plugin files the first time the global registry is queried."""
+    global _discover_plugins
+    if _discover_plugins is None:
+        # Imported on first use, the plugins package imports this module
+        from .. import discover_plugins as _discover_plugins
+    _discover_plugins()
+
+
 def get_plugin(name: str) -> Optional[PluginInfo]:
     """Get plugin info from global registry."""
+    _ensure_discovered()
     return _global_registry.get_plugin(name)
 
 
 def get_plugin_function(name: str) -> Optional[Callable]:
     """Get plugin function from global registry."""
+    _ensure_discovered()
     return _global_registry.get_plugin_function(name)
 
 
-def list_plugins(scope: str = None) -> List[str]:
+def list_plugins(scope: str = None) -> Tuple[str, ...]:
     """List all registered plugins."""
+    _ensure_discovered()
     return _global_registry.list_plugins(scope)
 
 
-def get_plugins_info(scope: str = None) -> List[Dict[str, Any]]:
+def get_plugins_info(scope: str = None) -> Tuple[Dict[str, Any], ...]:
     """Get detailed info about all plugins."""
+    _ensure_discovered()
     return _global_registry.get_plugins_info(scope)
 
 
-def get_plugins_by_scope(scope: str) -> Dict[str, PluginInfo]:
+def get_plugins_by_scope(scope: str) -> Mapping[str, PluginInfo]:
     """Get all plugins for a specific scope."""
+    _ensure_discovered()
     return _global_registry.get_plugins_by_scope(scope)
 
 
 def validate_plugin_settings(plugin_name: str, settings: Dict[str, Any]) -> bool:
     """Validate plugin settings against schema."""
+    _ensure_discovered()
     return _global_registry.validate_plugin_settings(plugin_name, settings)
 
 
@@ -4,15 +4,19 @@ Simple plugin runner for background execution.
 Manages plugin lifecycle, status tracking, and execution.
 """
 
+import atexit
 import threading
 import time
 import logging
 import traceback
-from typing import Dict, Any, Optional, List
-from datetime import datetime, timezone
+from collections import OrderedDict, defaultdict
+from typing import Dict, Any, Optional, List, Tuple
+from datetime import datetime, timedelta, timezone
 from dataclasses import dataclass, field
 from enum import Enum
 
+from pymongo import UpdateOne
+
 from .api import PluginContext, PluginAPI
 from .registry import get_plugin_function, get_plugin
 from db import get_db
@@ -66,10 +70,29 @@ class PluginExecution:
 class SimplePluginRunner:
     """Manages execution of simple plugins."""
     
+    # Seconds the flusher waits after a state change, to batch the changes that follow it
+    WRITE_BEHIND_DELAY = 0.05
+    # Finished executions read from the database are cached (LRU) for this many seconds
+    DB_CACHE_TTL = 60.0
+    DB_CACHE_SIZE = 1024
+    _FINISHED_STATUSES = frozenset({"completed", "failed", "stopped"})
+    _FINISHED_EXECUTION_STATUSES = frozenset({PluginStatus.COMPLETED, PluginStatus.FAILED, PluginStatus.STOPPED})
+    
     def __init__(self):
         self._executions: Dict[str, PluginExecution] = {}
+        # Execution IDs per target, in start order (dicts used as ordered sets)
+        self._by_target: Dict[str, Dict[str, None]] = defaultdict(dict)
         self._lock = threading.Lock()
         self.db = get_db()
+        # Latest unsaved update per execution (write-behind, last write wins)
+        self._pending_writes: Dict[str, Dict[str, Any]] = {}
+        self._writes_cond = threading.Condition()
+        # Held while writing, so a later state of an execution is never overwritten by an earlier one
+        self._flush_lock = threading.Lock()
+        self._flusher: Optional[threading.Thread] = None
+        # execution_id -> (time read, document) of finished executions no longer in memory
+        self._db_cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._db_cache_lock = threading.Lock()
     
     def _generate_execution_id(self, plugin_name: str, target_id: str) -> str:
         """Generate unique execution ID."""
@@ -112,6 +135,7 @@ class SimplePluginRunner:
         
         with self._lock:
             self._executions[execution_id] = execution
+            self._by_target[target_id][execution_id] = None
         
         # Create context
         context = PluginContext(
@@ -141,6 +165,7 @@ class SimplePluginRunner:
         if not execution:
             return
         
+        api = None
         try:
             # Update status
             execution.status = PluginStatus.RUNNING
@@ -177,6 +202,13 @@ class SimplePluginRunner:
             logger.debug(f"Plugin error traceback: {traceback.format_exc()}")
         
         finally:
+            # Write the notes the plugin left buffered, even if it failed
+            if api is not None:
+                try:
+                    api.flush_notes()
+                except Exception as e:
+                    logger.error(f"Failed to save notes of plugin execution {execution_id}: {e}")
+            
             # Update database
             self._save_execution_to_db(execution_id, execution)
     
@@ -193,6 +225,7 @@ class SimplePluginRunner:
         execution.completed_at = datetime.now(timezone.utc)
         
         self._save_execution_to_db(execution_id, execution)
+        self.flush_executions()
         logger.info(f"Stopped plugin execution {execution_id}")
         return True
     
@@ -211,14 +244,28 @@ class SimplePluginRunner:
     
     def get_execution(self, execution_id: str) -> Optional[PluginExecution]:
         """Get execution info by ID from memory or database."""
-        # First check in-memory executions (for active runs)
-        if execution_id in self._executions:
-            return self._executions[execution_id]
+        # First check in-memory executions (for active runs), a single get can't race a cleanup
+        execution = self._executions.get(execution_id)
+        if execution is not None:
+            return execution
+
+        with self._db_cache_lock:
+            cached = self._db_cache.get(execution_id)
+            if cached is not None:
+                if time.monotonic() - cached[0] < self.DB_CACHE_TTL:
+                    self._db_cache.move_to_end(execution_id)
+                    return cached[1]
+                del self._db_cache[execution_id]
 
         # Fall back to database (for completed runs or after restart)
         try:
             doc = plugin_executions.collection.find_one({"execution_id": execution_id})
             if doc:
+                if doc.get("status") in self._FINISHED_STATUSES:
+                    with self._db_cache_lock:
+                        self._db_cache[execution_id] = (time.monotonic(), doc)
+                        if len(self._db_cache) > self.DB_CACHE_SIZE:
+                            self._db_cache.popitem(last=False)
                 # Return the raw document (it will be converted by the API endpoint)
                 return doc
         except Exception as e:
@@ -228,37 +275,47 @@ class SimplePluginRunner:
     
     def get_executions_for_target(self, target_id: str, scope: str = None) -> List[PluginExecution]:
         """Get all executions for a target (experiment, run, etc)."""
-        executions = []
-        for execution in self._executions.values():
-            if execution.target_id == target_id:
-                if scope is None or execution.scope == scope:
-                    executions.append(execution)
+        with self._lock:
+            executions = [self._executions[execution_id] for execution_id in self._by_target.get(target_id, ())]
+        if scope is not None:
+            executions = [execution for execution in executions if execution.scope == scope]
         return executions
     
     def get_active_executions(self) -> List[PluginExecution]:
         """Get all active (running) executions."""
-        return [ex for ex in self._executions.values() 
+        # list() snapshots the values in one step, starts can't break the iteration
+        return [ex for ex in list(self._executions.values()) 
                 if ex.status == PluginStatus.RUNNING]
     
     def cleanup_completed_executions(self, max_age_hours: int = 24):
         """Clean up old completed executions."""
-        cutoff_time = datetime.now(timezone.utc).timestamp() - (max_age_hours * 3600)
+        cutoff_time = datetime.now(timezone.utc) - timedelta(hours=max_age_hours)
         
-        to_remove = []
-        for exec_id, execution in self._executions.items():
-            if (execution.status in [PluginStatus.COMPLETED, PluginStatus.FAILED, PluginStatus.STOPPED] 
+        # Selected from a snapshot without the lock, which is only held to remove them
+        to_remove = [
+            (exec_id, execution) for exec_id, execution in list(self._executions.items())
+            if (execution.status in self._FINISHED_EXECUTION_STATUSES
                 and execution.completed_at 
-                and execution.completed_at.timestamp() < cutoff_time):
-                to_remove.append(exec_id)
+                and execution.completed_at < cutoff_time)
+        ]
         
+        removed = 0
         with self._lock:
-            for exec_id in to_remove:
+            for exec_id, execution in to_remove:
+                # Skip executions removed or replaced since the snapshot
+                if self._executions.get(exec_id) is not execution:
+                    continue
                 del self._executions[exec_id]
+                target_executions = self._by_target[execution.target_id]
+                target_executions.pop(exec_id, None)
+                if not target_executions:
+                    del self._by_target[execution.target_id]
+                removed += 1
         
-        logger.info(f"Cleaned up {len(to_remove)} old plugin executions")
+        logger.info(f"Cleaned up {removed} old plugin executions")
     
     def _save_execution_to_db(self, execution_id: str, execution: PluginExecution):
-        """Save execution state to database."""
+        """Queue the execution state for the background flusher to save."""
         try:
             doc = {
                 "execution_id": execution_id,
@@ -285,15 +342,42 @@ class SimplePluginRunner:
             if execution.error_message is None:
                 update_op["$unset"] = {"error_message": ""}
 
-            # Upsert to plugin_executions collection
-            plugin_executions.collection.update_one(
-                {"execution_id": execution_id},
-                update_op,
-                upsert=True
-            )
+            with self._db_cache_lock:
+                self._db_cache.pop(execution_id, None)
+            with self._writes_cond:
+                self._pending_writes[execution_id] = update_op
+                if self._flusher is None:
+                    self._flusher = threading.Thread(target=self._flush_loop, name="plugin-executions-flusher", daemon=True)
+                    self._flusher.start()
+                self._writes_cond.notify()
         except Exception as e:
             logger.error(f"Error saving plugin execution to database: {e}")
     
+    def _flush_loop(self):
+        """Save the queued execution states in batches (background thread)."""
+        while True:
+            with self._writes_cond:
+                while not self._pending_writes:
+                    self._writes_cond.wait()
+            time.sleep(self.WRITE_BEHIND_DELAY)
+            self.flush_executions()
+    
+    def flush_executions(self):
+        """Upsert the queued execution states to plugin_executions in one bulk write."""
+        with self._flush_lock:
+            with self._writes_cond:
+                pending, self._pending_writes = self._pending_writes, {}
+            if not pending:
+                return
+            try:
+                plugin_executions.collection.bulk_write(
+                    [UpdateOne({"execution_id": execution_id}, update_op, upsert=True)
+                     for execution_id, update_op in pending.items()],
+                    ordered=False
+                )
+            except Exception as e:
+                logger.error(f"Error saving plugin executions to database: {e}")
+    
     def load_executions_from_db(self):
         """Load active executions from database (for service restart)."""
         try:
@@ -320,6 +404,8 @@ class SimplePluginRunner:
 
 # Global runner instance
 _global_runner = SimplePluginRunner()
+# Save the states still queued when the process exits
+atexit.register(_global_runner.flush_executions)
 
 
 def start_plugin(plugin_name: str, target_id: str, scope: str, settings: Dict[str, Any] = None) -> str:
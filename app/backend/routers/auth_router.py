@@ -1,33 +1,37 @@
 from fastapi import APIRouter, HTTPException, Depends
 from db import users
-from auth import create_access_token, hash_password, verify_password, get_current_user
-from models import LoginBody, UserResponse
+from auth import create_access_token, hash_password, verify_password, get_current_user, invalidate_user
+from models import LoginBody, UserResponse, USER_ROLES
+from utils.request_body import json_body, json_body_openapi
 
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 
-@router.post("/login")
-async def login(body: LoginBody):
+@router.post("/login", openapi_extra=json_body_openapi(LoginBody))
+def login(body: LoginBody = Depends(json_body(LoginBody))):
 	user = users.find_by_email(body.email)
 	if not user or not verify_password(body.password, user["password_hash"]):
 		raise HTTPException(status_code=401, detail="Credenciales inválidas")
 	
 	# Update last login
 	users.update_last_login(user["_id"])
+	invalidate_user(body.email)
 	
 	token = create_access_token(body.email)
 	return {"token": token, "name": user['name']}
 
 
 @router.get("/me")
-async def get_me(user = Depends(get_current_user)):
-	return UserResponse(
-		_id=user["_id"],
-		email=user["email"],
-		name=user["name"],
-		role=user.get("role", "user"),
-		created_at=user["created_at"],
-		last_login=user.get("last_login"),
-		is_active=user.get("is_active", True)
-	)
+def get_me(user = Depends(get_current_user)):
+	# The user document was validated on write, so the response skips validation
+	role = user.get("role", "user")
+	return UserResponse.from_trusted({
+		"_id": user["_id"],
+		"email": user["email"],
+		"name": user["name"],
+		"role": USER_ROLES.get(role, role),
+		"created_at": user["created_at"],
+		"last_login": user.get("last_login"),
+		"is_active": user.get("is_active", True)
+	})
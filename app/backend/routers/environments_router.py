@@ -12,11 +12,11 @@ router = APIRouter(prefix="/environments", tags=["environments"])
 environment_service = EnvironmentsService()
 
 @router.get("")
-async def list_environments(user = Depends(get_current_user)):
+def list_environments(user = Depends(get_current_user)):
 	return environment_service.list_environments()
 
 @router.post("/upload")
-async def upload_environment(
+def upload_environment(
 	file: UploadFile = File(...),
 	name: str = Form(...),
 	description: str = Form(default=""),
@@ -47,14 +47,14 @@ if False:  # Keep old endpoint as fallback but disable it
 		)
 
 @router.get("/{id}")
-async def get_environment(id: str, user = Depends(get_current_user)):
+def get_environment(id: str, user = Depends(get_current_user)):
 	env = environment_service.get_environment(id)
 	if not env:
 		raise HTTPException(404, "Environment not found")
 	return env
 
 @router.get("/{id}/info")
-async def get_environment_info_endpoint(id: str, user = Depends(get_current_user)):
+def get_environment_info_endpoint(id: str, user = Depends(get_current_user)):
 	"""Get detailed information about an environment including filesystem status"""
 	try:
 		return environment_service.get_environment_info(id)
@@ -62,7 +62,7 @@ async def get_environment_info_endpoint(id: str, user = Depends(get_current_user
 		raise HTTPException(status_code=e.status_code, detail=e.detail)
 
 @router.get("/{id}/dependencies")
-async def check_environment_dependencies_endpoint(id: str, user = Depends(get_current_user)):
+def check_environment_dependencies_endpoint(id: str, user = Depends(get_current_user)):
 	"""Check dependencies for an environment before deletion."""
 	try:
 		return environment_service.check_dependencies(id)
@@ -71,7 +71,7 @@ async def check_environment_dependencies_endpoint(id: str, user = Depends(get_cu
 
 
 @router.delete("/{id}")
-async def delete_environment(id: str, confirmed: bool = Query(False), user = Depends(get_current_user)):
+def delete_environment(id: str, confirmed: bool = Query(False), user = Depends(get_current_user)):
 	"""
 	Delete an environment by moving it to trash.
 
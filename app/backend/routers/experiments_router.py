@@ -14,7 +14,7 @@ experiment_service = ExperimentService()
 
 
 @router.get("", response_model=List[ExperimentResponse])
-async def list_experiments(user=Depends(get_current_user)) -> List[Dict[str, Any]]:
+def list_experiments(user=Depends(get_current_user)) -> List[Dict[str, Any]]:
     """
     List all experiments, sorted by creation date.
     
@@ -36,11 +36,12 @@ async def list_experiments(user=Depends(get_current_user)) -> List[Dict[str, Any
     ]
     ```
     """
-    return experiment_service.list_experiments()
+    # Stored documents were validated on write, so they aren't validated again
+    return [ExperimentResponse.from_trusted(exp) for exp in experiment_service.list_experiments()]
 
 
 @router.post("", response_model=ExperimentResponse, status_code=status.HTTP_201_CREATED)
-async def create_experiment(
+def create_experiment(
     body: ExperimentBody = Body(
         example={
             "name": "New ML Experiment",
@@ -65,13 +66,13 @@ async def create_experiment(
     **Returns:** The created experiment with generated ID and timestamps
     """
     try:
-        return experiment_service.create_experiment(body)
+        return ExperimentResponse.from_trusted(experiment_service.create_experiment(body))
     except ExperimentError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.get("/{experiment_id}", response_model=ExperimentResponse)
-async def get_experiment(experiment_id: str, user=Depends(get_current_user)) -> Dict[str, Any]:
+def get_experiment(experiment_id: str, user=Depends(get_current_user)) -> Dict[str, Any]:
     """
     Get a specific experiment by ID.
     
@@ -89,11 +90,11 @@ async def get_experiment(experiment_id: str, user=Depends(get_current_user)) ->
     experiment = experiment_service.get_experiment(experiment_id)
     if not experiment:
         raise HTTPException(status_code=404, detail="Experiment not found")
-    return experiment
+    return ExperimentResponse.from_trusted(experiment)
 
 
 @router.get("/{experiment_id}/stats")
-async def get_experiment_stats(experiment_id: str, user=Depends(get_current_user)) -> Dict[str, Any]:
+def get_experiment_stats(experiment_id: str, user=Depends(get_current_user)) -> Dict[str, Any]:
     """
     Get comprehensive statistics for an experiment.
     
@@ -131,7 +132,7 @@ async def get_experiment_stats(experiment_id: str, user=Depends(get_current_user
 
 
 @router.put("/{experiment_id}/results")
-async def update_experiment_results(experiment_id: str, results_text: str, user=Depends(get_current_user)) -> Dict[str, Any]:
+def update_experiment_results(experiment_id: str, results_text: str, user=Depends(get_current_user)) -> Dict[str, Any]:
     """
     Update the results text for an experiment.
     
@@ -156,7 +157,7 @@ async def update_experiment_results(experiment_id: str, results_text: str, user=
 
 
 @router.put("/{experiment_id}/favorite")
-async def toggle_experiment_favorite(experiment_id: str, user=Depends(get_current_user)) -> Dict[str, Any]:
+def toggle_experiment_favorite(experiment_id: str, user=Depends(get_current_user)) -> Dict[str, Any]:
     """
     Toggle the favorite status of an experiment.
     
@@ -178,7 +179,7 @@ async def toggle_experiment_favorite(experiment_id: str, user=Depends(get_curren
 
 
 @router.get("/{experiment_id}/dependencies")
-async def check_experiment_dependencies_endpoint(experiment_id: str, user=Depends(get_current_user)) -> Dict[str, Any]:
+def check_experiment_dependencies_endpoint(experiment_id: str, user=Depends(get_current_user)) -> Dict[str, Any]:
     """Check dependencies for an experiment before deletion."""
     experiment = experiment_service.get_experiment(experiment_id)
     if not experiment:
@@ -189,7 +190,7 @@ async def check_experiment_dependencies_endpoint(experiment_id: str, user=Depend
 
 
 @router.delete("/{experiment_id}")
-async def delete_experiment(
+def delete_experiment(
     experiment_id: str,
     confirmed: bool = Query(False),
     user=Depends(get_current_user)
@@ -236,10 +237,6 @@ async def delete_experiment(
             }
         )
 
-    # Get all related data counts before deletion
-    revision_docs = revisions.find_many({"experiment_id": experiment_id})
-    run_docs = runs.find_many({"experiment_id": experiment_id})
-
     # Move experiment directory to trash
     moved_paths = []
     try:
@@ -251,17 +248,9 @@ async def delete_experiment(
         import logging
         logging.getLogger(__name__).error(f"Failed to move experiment to trash: {e}")
 
-    # Delete all revisions from database
-    revision_count = 0
-    for revision in revision_docs:
-        if revisions.delete_one({"_id": revision["_id"]}):
-            revision_count += 1
-
-    # Delete all runs from database
-    run_count = 0
-    for run in run_docs:
-        if runs.delete_one({"_id": run["_id"]}):
-            run_count += 1
+    # Delete all revisions and runs from database, one round-trip each
+    revision_count = revisions.delete_many({"experiment_id": experiment_id})
+    run_count = runs.delete_many({"experiment_id": experiment_id})
 
     # Delete the experiment from database
     try:
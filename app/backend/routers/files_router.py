@@ -1,13 +1,28 @@
 import os
-from fastapi import APIRouter, Depends, HTTPException
+import stat
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from fastapi.responses import FileResponse
 from auth import get_current_user
 from utils.file_tools import paths
 
 router = APIRouter(prefix="/workspace", tags=["files"])
 
+# Resolved once, WORKSPACE doesn't change while the app runs
+_WORKSPACE_ROOT = os.path.abspath(paths.WORKSPACE_ROOT)
+
+# Workspace files are user data behind auth, browsers may keep them but must revalidate
+_CACHE_CONTROL = "private, no-cache"
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+	"""Whether an If-None-Match header (a list of, possibly weak, ETags or *) matches etag"""
+	if if_none_match.strip() == "*":
+		return True
+	return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
 @router.get("/{file_path:path}")
-async def serve_workspace_file(file_path: str, user = Depends(get_current_user)):
+def serve_workspace_file(file_path: str, request: Request, user = Depends(get_current_user)):
 	"""
 	Serve files from the workspace directory.
 	
@@ -15,25 +30,36 @@ async def serve_workspace_file(file_path: str, user = Depends(get_current_user))
 	- /api/workspace/experiments/... -> ${WORKSPACE}/experiments/...
 	- /api/workspace/tb_logs/... -> ${WORKSPACE}/tb_logs/...
 	- etc.
-	"""
-	# Get workspace root from file_tools
-	workspace_root = paths.WORKSPACE_ROOT
 	
+	Responses carry an ETag, a request with a matching If-None-Match gets a
+	304 without the file being read again.
+	"""
 	# Build full path (file_path is already relative)
-	full_path = os.path.join(workspace_root, file_path)
+	full_path = os.path.join(_WORKSPACE_ROOT, file_path)
 	
-	# Normalize path to prevent directory traversal attacks
+	# Normalize path to prevent directory traversal attacks. Compared by path
+	# components, a plain prefix check would let /workspace_other through
 	full_path = os.path.normpath(full_path)
-	if not full_path.startswith(workspace_root):
+	if os.path.commonpath([full_path, _WORKSPACE_ROOT]) != _WORKSPACE_ROOT:
 		raise HTTPException(status_code=403, detail="Access denied: Path outside workspace")
 	
-	# Check if file exists
-	if not os.path.exists(full_path):
+	# One stat for the existence and type checks, the ETag and the response headers
+	try:
+		stat_result = os.stat(full_path)
+	except OSError:
+		# Also paths through a regular file, names too long, etc., like os.path.exists did
 		raise HTTPException(status_code=404, detail="File not found")
 	
 	# Only serve files, not directories
-	if not os.path.isfile(full_path):
+	if not stat.S_ISREG(stat_result.st_mode):
 		raise HTTPException(status_code=400, detail="Path is not a file")
 	
+	etag = f'"{stat_result.st_mtime_ns:x}-{stat_result.st_size:x}"'
+	headers = {"ETag": etag, "Cache-Control": _CACHE_CONTROL}
+	
+	if_none_match = request.headers.get("if-none-match")
+	if if_none_match and _etag_matches(if_none_match, etag):
+		return Response(status_code=304, headers=headers)
+	
 	# Return the file
-	return FileResponse(full_path)
\ No newline at end of file
+	return FileResponse(full_path, headers=headers, stat_result=stat_result)
\ No newline at end of file
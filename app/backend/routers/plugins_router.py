@@ -4,7 +4,7 @@ Plugins router for managing plugin discovery, configuration, and execution.
 Provides endpoints for plugin discovery, execution management, and status monitoring.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from typing import Dict, Any, List, Optional
 from pydantic import BaseModel
 from bson import ObjectId
@@ -18,7 +18,15 @@ from plugins import (
 )
 from plugins.core.database import plugin_executions, plugin_settings
 
-router = APIRouter(prefix="/plugins", tags=["plugins"])
+
+async def plugins_ready(request: Request):
+    """Wait for the plugin discovery started at app startup, if any."""
+    future = getattr(request.app.state, "plugins_future", None)
+    if future is not None:
+        await future
+
+
+router = APIRouter(prefix="/plugins", tags=["plugins"], dependencies=[Depends(plugins_ready)])
 
 
 def _serialize_execution(doc: Dict[str, Any]) -> Dict[str, Any]:
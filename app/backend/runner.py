@@ -1187,9 +1187,17 @@ def _setup_signal_handlers() -> None:
 		cleanup_all_runs()
 		exit(0)
 	
+	# Signal handlers can only be installed from the main thread; the module may be
+	# imported later from an app startup hook running elsewhere (e.g. test clients)
+	if threading.current_thread() is not threading.main_thread():
+		return
+
 	if os.name != 'nt':  # Unix-like systems
-		signal.signal(signal.SIGTERM, signal_handler)
-		signal.signal(signal.SIGINT, signal_handler)
+		for signum in (signal.SIGTERM, signal.SIGINT):
+			# Signals a server already handles are left alone: uvicorn installs its handlers
+			# before the routers import this module, and the app lifespan calls cleanup_all_runs
+			if signal.getsignal(signum) in (signal.SIG_DFL, signal.default_int_handler):
+				signal.signal(signum, signal_handler)
 
 # Setup signal handlers when module is imported
 _setup_signal_handlers()
\ No newline at end of file
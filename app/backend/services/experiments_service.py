@@ -63,7 +63,7 @@ class ExperimentService:
         """
         try:
             # Check if experiment with same name already exists
-            existing = self.experiments_db.find_by_name(experiment_data.name)
+            existing = self.experiments_db.find_by_name(experiment_data.name, projection={"_id": 1})
             if existing:
                 raise ExperimentError(f"Experiment with name '{experiment_data.name}' already exists")
             
@@ -111,9 +111,14 @@ class ExperimentService:
             if not experiment:
                 raise ExperimentError(f"Experiment {experiment_id} not found")
             
-            # Get all related data before deletion
-            revision_docs = self.revisions_db.find_many({"experiment_id": experiment_id})
-            run_docs = self.runs_db.find_many({"experiment_id": experiment_id})
+            # Get the file paths of related data before deletion
+            revision_docs = self.revisions_db.find_many(
+                {"experiment_id": experiment_id}, projection={"yaml_path": 1}
+            )
+            run_docs = self.runs_db.find_many(
+                {"experiment_id": experiment_id},
+                projection={"yaml_path": 1, "tb_logdir": 1, "stdout_log_path": 1}
+            )
             
             # Collect file paths to delete
             files_to_delete = []
@@ -142,15 +147,8 @@ class ExperimentService:
             delete_files(files_to_delete)
             
             # Delete database records
-            revision_count = 0
-            for revision in revision_docs:
-                if self.revisions_db.delete_one({"_id": revision["_id"]}):
-                    revision_count += 1
-            
-            run_count = 0
-            for run in run_docs:
-                if self.runs_db.delete_one({"_id": run["_id"]}):
-                    run_count += 1
+            revision_count = self.revisions_db.delete_many({"experiment_id": experiment_id})
+            run_count = self.runs_db.delete_many({"experiment_id": experiment_id})
             
             # Delete the experiment itself
             experiment_deleted = self.experiments_db.delete_one({"_id": experiment_id})
@@ -0,0 +1,67 @@
+"""
+Integration tests for the workspace files endpoint.
+"""
+
+import os
+import shutil
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi import HTTPException
+
+from routers import files_router
+
+
+@pytest.fixture
+def workspace_file(mock_workspace):
+    """Serve a temporary workspace containing logs/run.txt."""
+    os.makedirs(os.path.join(mock_workspace, "logs"))
+    with open(os.path.join(mock_workspace, "logs", "run.txt"), "w") as f:
+        f.write("Step: 1\n")
+    with patch.object(files_router, "_WORKSPACE_ROOT", os.path.abspath(mock_workspace)):
+        yield mock_workspace
+
+
+class TestFilesAPI:
+    """Integration tests for /api/workspace."""
+
+    @pytest.mark.integration
+    def test_unchanged_file_is_not_sent_again(self, test_client, override_dependencies, authenticated_headers, workspace_file):
+        """Test that a request with the current ETag gets a 304 and a modified file a 200."""
+        response = test_client.get("/api/workspace/logs/run.txt", headers=authenticated_headers)
+        assert response.status_code == 200
+        assert response.text == "Step: 1\n"
+        etag = response.headers["etag"]
+
+        cached = test_client.get("/api/workspace/logs/run.txt", headers={**authenticated_headers, "If-None-Match": etag})
+        assert cached.status_code == 304
+        assert cached.content == b""
+
+        with open(os.path.join(workspace_file, "logs", "run.txt"), "a") as f:
+            f.write("Step: 2\n")
+        refreshed = test_client.get("/api/workspace/logs/run.txt", headers={**authenticated_headers, "If-None-Match": etag})
+        assert refreshed.status_code == 200
+        assert refreshed.text == "Step: 1\nStep: 2\n"
+
+    @pytest.mark.integration
+    def test_paths_outside_workspace_are_denied(self, workspace_file, test_user):
+        """Test that traversal and sibling directories sharing the workspace prefix are rejected."""
+        sibling = workspace_file + "_other"
+        os.makedirs(sibling)
+        try:
+            with open(os.path.join(sibling, "secret.txt"), "w") as f:
+                f.write("secret")
+            for file_path in ("../" + os.path.basename(sibling) + "/secret.txt", sibling + "/secret.txt"):
+                with pytest.raises(HTTPException) as exc_info:
+                    files_router.serve_workspace_file(file_path, MagicMock(), test_user)
+                assert exc_info.value.status_code == 403
+        finally:
+            shutil.rmtree(sibling)
+
+    @pytest.mark.integration
+    def test_missing_file_and_directory(self, test_client, override_dependencies, authenticated_headers, workspace_file):
+        """Test that missing or invalid paths return 404 and directories 400."""
+        assert test_client.get("/api/workspace/logs/missing.txt", headers=authenticated_headers).status_code == 404
+        assert test_client.get("/api/workspace/logs/run.txt/inner", headers=authenticated_headers).status_code == 404
+        assert test_client.get("/api/workspace/" + "x" * 300, headers=authenticated_headers).status_code == 404
+        assert test_client.get("/api/workspace/logs", headers=authenticated_headers).status_code == 400
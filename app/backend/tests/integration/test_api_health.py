@@ -0,0 +1,56 @@
+"""
+Integration tests for the health and readiness endpoints.
+"""
+
+import signal
+import time
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+import runner
+from app import app
+
+
+class TestHealthAPI:
+    """Integration tests for / and /ready."""
+
+    @pytest.mark.integration
+    def test_root_is_live(self, test_client):
+        """Test that the health check answers without waiting for the bootstrap."""
+        response = test_client.get("/")
+
+        assert response.status_code == 200
+        assert response.json()["status"] == "ok"
+
+    @pytest.mark.integration
+    def test_ready_after_bootstrap(self, test_client):
+        """Test that /ready reports ready once the startup bootstrap finished."""
+        deadline = time.monotonic() + 10
+        response = test_client.get("/ready")
+        while response.status_code == 503 and response.json()["status"] == "starting" and time.monotonic() < deadline:
+            time.sleep(0.05)
+            response = test_client.get("/ready")
+
+        assert response.status_code == 200
+        assert response.json() == {"status": "ready"}
+
+    @pytest.mark.integration
+    def test_shutdown_stops_running_processes(self):
+        """Test that the lifespan shutdown stops the runs, the runner leaves the server's signal handlers alone."""
+        with patch.object(runner, "cleanup_all_runs") as mock_cleanup:
+            with TestClient(app) as client:
+                assert client.get("/").status_code == 200
+                mock_cleanup.assert_not_called()
+            mock_cleanup.assert_called_once_with()
+
+        def server_handler(signum, frame):
+            pass
+
+        previous = signal.signal(signal.SIGTERM, server_handler)
+        try:
+            runner._setup_signal_handlers()
+            assert signal.getsignal(signal.SIGTERM) is server_handler
+        finally:
+            signal.signal(signal.SIGTERM, previous)
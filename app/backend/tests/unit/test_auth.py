@@ -6,10 +6,15 @@ Tests password hashing, token creation, and validation.
 
 import pytest
 import os
+import asyncio
+import threading
 from datetime import datetime, timedelta
+from unittest.mock import patch
 from jose import jwt, JWTError
+from fastapi.security import HTTPAuthorizationCredentials
 
-from auth import hash_password, verify_password, create_access_token
+import auth
+from auth import hash_password, verify_password, create_access_token, get_current_user, invalidate_user
 
 
 @pytest.mark.unit
@@ -41,6 +46,10 @@ class TestPasswordHashing:
 
         assert verify_password(wrong_password, hashed) is False
 
+    def test_verify_password_malformed_hash(self):
+        """Test that a malformed hash is rejected instead of raising."""
+        assert verify_password("any_password", "not-an-argon2-hash") is False
+
     def test_hash_password_different_each_time(self):
         """Test that same password produces different hashes (salt)."""
         password = "same_password"
@@ -153,5 +162,74 @@ class TestTokenValidation:
             jwt.decode(token, wrong_secret, algorithms=["HS256"])
 
 
+@pytest.mark.unit
+class TestCurrentUserCache:
+    """Test the in-process user cache used by get_current_user."""
+
+    def _credentials(self, email):
+        return HTTPAuthorizationCredentials(scheme="Bearer", credentials=create_access_token(email))
+
+    def test_repeated_requests_hit_cache(self):
+        """Test that the user is only fetched from the database once."""
+        email = "cached@example.com"
+        user_doc = {"_id": "u1", "email": email}
+        invalidate_user(email)
+
+        with patch.object(auth, "users") as mock_users:
+            mock_users.find_by_email.return_value = user_doc
+            first = asyncio.run(get_current_user(self._credentials(email)))
+            second = asyncio.run(get_current_user(self._credentials(email)))
+
+        assert first == second == user_doc
+        mock_users.find_by_email.assert_called_once()
+
+    def test_invalidate_user_forces_refetch(self):
+        """Test that invalidate_user drops the cached entry."""
+        email = "refetch@example.com"
+        invalidate_user(email)
+
+        with patch.object(auth, "users") as mock_users:
+            mock_users.find_by_email.return_value = {"_id": "u2", "email": email}
+            asyncio.run(get_current_user(self._credentials(email)))
+            invalidate_user(email)
+            asyncio.run(get_current_user(self._credentials(email)))
+
+        assert mock_users.find_by_email.call_count == 2
+
+    def test_expired_entry_is_refetched(self):
+        """Test that entries older than the TTL are not served."""
+        email = "expired@example.com"
+        invalidate_user(email)
+
+        with patch.object(auth, "users") as mock_users, patch.object(auth, "USER_CACHE_TTL", -1):
+            mock_users.find_by_email.return_value = {"_id": "u3", "email": email}
+            asyncio.run(get_current_user(self._credentials(email)))
+            asyncio.run(get_current_user(self._credentials(email)))
+
+        assert mock_users.find_by_email.call_count == 2
+
+    def test_cache_miss_is_fetched_off_the_event_loop(self):
+        """Test that the database lookup of a cache miss runs in a worker thread."""
+        email = "threaded@example.com"
+        invalidate_user(email)
+        lookup_threads = []
+
+        def find_by_email(email, projection=None):
+            lookup_threads.append(threading.get_ident())
+            return {"_id": "u4", "email": email}
+
+        async def current_user():
+            return threading.get_ident(), await get_current_user(self._credentials(email))
+
+        with patch.object(auth, "users") as mock_users:
+            mock_users.find_by_email.side_effect = find_by_email
+            loop_thread, user = asyncio.run(current_user())
+
+        assert user == {"_id": "u4", "email": email}
+        assert len(lookup_threads) == 1
+        assert lookup_threads[0] != loop_thread
+        mock_users.find_by_email.assert_called_once_with(email, projection=auth.USER_PROJECTION)
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -25,16 +25,18 @@ class TestExperimentService:
             # Configure mocks to use the mock database
             mock_experiments.find_many = mock_db.experiments.find
             mock_experiments.find_one = mock_db.experiments.find_one
-            mock_experiments.find_by_name = lambda name: mock_db.experiments.find_one({"name": name})
+            mock_experiments.find_by_name = lambda name, projection=None: mock_db.experiments.find_one({"name": name}, projection)
             mock_experiments.create_experiment = mock_db.experiments.insert_one
             mock_experiments.update_one = mock_db.experiments.update_one
             mock_experiments.delete_one = mock_db.experiments.delete_one
             
             mock_revisions.find_many = mock_db.revisions.find
             mock_revisions.delete_one = mock_db.revisions.delete_one
+            mock_revisions.delete_many = lambda filter_dict: mock_db.revisions.delete_many(filter_dict).deleted_count
             
             mock_runs.find_many = mock_db.runs.find
             mock_runs.delete_one = mock_db.runs.delete_one
+            mock_runs.delete_many = lambda filter_dict: mock_db.runs.delete_many(filter_dict).deleted_count
             
             service = ExperimentService()
             service.experiments_db = mock_experiments
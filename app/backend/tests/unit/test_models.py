@@ -0,0 +1,72 @@
+"""
+Unit tests for the request/response models.
+
+Tests schema builds, name stripping, email and password validation.
+"""
+
+import re
+
+import pytest
+from pydantic import BaseModel, ValidationError
+
+import models
+from models import ExperimentBody, LoginBody, UserBody, _is_email
+
+
+@pytest.mark.unit
+def test_models_are_built_at_import():
+    """Test that no model defers its validator build to the first request."""
+    deferred = [
+        name for name, obj in vars(models).items()
+        if isinstance(obj, type) and issubclass(obj, BaseModel) and obj is not BaseModel
+        and not obj.__pydantic_complete__
+    ]
+    assert deferred == []
+
+
+@pytest.mark.unit
+class TestEmailValidation:
+    """Test the email check used by the user models."""
+
+    @pytest.mark.parametrize("email", [
+        "a@b.co", "first.last@sub.example.com", "a-b_c@d-e.fg", "...@x.co", "a@b.c_d", "ñ@dominio.es",
+        "", "@b.co", "a@", "a@.co", "a@b.", "a@bco", "a@b.c-d", "a@b@c.d", "a b@c.de", "a@b.co\n",
+    ])
+    def test_matches_reference_regex(self, email):
+        """Test that the scan accepts exactly what the original regex accepted."""
+        reference = re.compile(r'\A[\w.\-]+@[\w.\-]+\.\w+\Z')
+        assert _is_email(email) == bool(reference.match(email))
+
+    def test_email_is_lowercased(self):
+        """Test that valid emails are normalized to lowercase."""
+        assert LoginBody(email="User@Example.COM", password="x").email == "user@example.com"
+
+    def test_invalid_email_rejected(self):
+        """Test that invalid emails raise a validation error."""
+        with pytest.raises(ValidationError):
+            LoginBody(email="not-an-email", password="x")
+
+
+@pytest.mark.unit
+class TestFieldValidation:
+    """Test name and password constraints."""
+
+    def test_name_is_stripped(self):
+        """Test that names are stripped of surrounding whitespace."""
+        assert ExperimentBody(name="  My Experiment  ").name == "My Experiment"
+
+    def test_blank_name_rejected(self):
+        """Test that whitespace-only names are rejected."""
+        with pytest.raises(ValidationError):
+            ExperimentBody(name="   ")
+
+    @pytest.mark.parametrize("password,valid", [
+        ("abcd1234", True), ("abcdefgh", False), ("12345678", False), ("ab1", False),
+    ])
+    def test_password_rules(self, password, valid):
+        """Test that passwords need 8+ characters with a letter and a digit."""
+        if valid:
+            assert UserBody(email="a@b.co", name="A", password=password).password == password
+        else:
+            with pytest.raises(ValidationError):
+                UserBody(email="a@b.co", name="A", password=password)
@@ -5,6 +5,7 @@ Tests plugin registration, function-based plugins, and execution.
 """
 
 import pytest
+from datetime import datetime, timezone
 from unittest.mock import patch, MagicMock
 
 from plugins.core.registry import register_plugin, get_plugin, _global_registry, validate_plugin_settings
@@ -28,6 +29,163 @@ def test_plugin_registration():
     assert plugin_info.scope == "experiment"
 
 
+def test_plugin_discovery_runs_once_on_first_lookup():
+    """Test that plugin files are loaded lazily, the first time the registry is queried."""
+    import plugins
+
+    with patch.object(plugins, "_discovered", False), \
+         patch.object(plugins, "_discovery_done", False), \
+         patch.object(plugins, "_discover_and_load_plugins") as mock_load:
+        get_plugin("missing_plugin")
+        get_plugin("missing_plugin")
+        plugins.discover_plugins()
+
+    mock_load.assert_called_once()
+
+
+def test_failing_plugin_file_does_not_stop_discovery():
+    """Test that a plugin file failing to register is skipped, and discovery errors don't escape the startup task."""
+    import plugins
+    import app as app_module
+
+    def scan(path):
+        if path.stem == "broken_plugin":
+            raise RuntimeError("broken")
+        return [{"name": "healthy_test", "scope": "run", "description": "Healthy"}]
+
+    with patch.object(plugins, "_plugin_modules", return_value=("broken_plugin", "healthy_plugin")), \
+         patch.object(plugins, "_scan_plugin_file", side_effect=scan):
+        plugins._discover_and_load_plugins()
+    try:
+        assert _global_registry.get_plugin("healthy_test").module == "plugins.healthy_plugin"
+    finally:
+        _global_registry.unregister("healthy_test")
+
+    with patch.object(plugins, "discover_plugins", side_effect=RuntimeError("boom")):
+        app_module._discover_plugins()
+
+
+def test_plugin_lookups_are_cached_until_registration():
+    """Test that list lookups are cached and refreshed when a plugin registers."""
+    first = _global_registry.list_plugins()
+    assert _global_registry.list_plugins() is first
+
+    register_plugin("cache_test_plugin", "run", "Cache test plugin")(lambda context, api: None)
+
+    assert "cache_test_plugin" in _global_registry.list_plugins()
+    assert "cache_test_plugin" in [info["name"] for info in _global_registry.get_plugins_info("run")]
+    assert _global_registry.unregister("cache_test_plugin")
+    assert "cache_test_plugin" not in _global_registry.list_plugins()
+
+
+def test_plugin_info_dict_is_built_once():
+    """Test that to_dict returns the same dict until the plugin is registered again."""
+    register_plugin("dict_test_plugin", "run", "Dict test plugin")(lambda context, api: None)
+    try:
+        info = get_plugin("dict_test_plugin")
+        assert info.to_dict() is info.to_dict()
+        assert info.to_dict()["description"] == "Dict test plugin"
+
+        register_plugin("dict_test_plugin", "run", "Updated plugin")(lambda context, api: None)
+        assert get_plugin("dict_test_plugin").to_dict()["description"] == "Updated plugin"
+    finally:
+        _global_registry.unregister("dict_test_plugin")
+
+
+def test_plugin_files_are_scanned_without_importing(tmp_path):
+    """Test that literal decorator arguments are read statically and dynamic ones are not."""
+    import plugins
+
+    static_file = tmp_path / "static_plugin.py"
+    static_file.write_text(
+        '@register_plugin("static_test", "run", "Static", tags=["a"])\n'
+        'def static_test(context, api):\n'
+        '    return 1\n'
+    )
+    dynamic_file = tmp_path / "dynamic_plugin.py"
+    dynamic_file.write_text(
+        'NAME = "dynamic_test"\n'
+        '@register_plugin(NAME, "run")\n'
+        'def dynamic_test(context, api):\n'
+        '    return 1\n'
+    )
+
+    assert plugins._scan_plugin_file(static_file) == [
+        {"name": "static_test", "scope": "run", "description": "Static", "tags": ["a"]}
+    ]
+    assert plugins._scan_plugin_file(dynamic_file) is None
+
+
+def test_plugin_files_registering_indirectly_are_imported(tmp_path):
+    """Test that aliased decorators and direct registry calls make the scan fall back to importing."""
+    import plugins
+
+    sources = {
+        "aliased_plugin.py": (
+            'from .core import register_plugin as reg\n'
+            '@reg("aliased_test", "run")\n'
+            'def aliased_test(context, api):\n'
+            '    return 1\n'
+        ),
+        "direct_plugin.py": (
+            'from .core.registry import _global_registry\n'
+            'def direct_test(context, api):\n'
+            '    return 1\n'
+            '_global_registry.register("direct_test", "run", direct_test)\n'
+        ),
+        "assigned_plugin.py": (
+            'from .core import register_plugin\n'
+            'reg = register_plugin\n'
+            '@reg("assigned_test", "run")\n'
+            'def assigned_test(context, api):\n'
+            '    return 1\n'
+        ),
+        "empty_plugin.py": 'HELPER = 1\n',
+    }
+    for file_name, source in sources.items():
+        path = tmp_path / file_name
+        path.write_text(source)
+        assert plugins._scan_plugin_file(path) is None, file_name
+
+    # The plain import of the decorator is still read statically
+    plain_file = tmp_path / "plain_plugin.py"
+    plain_file.write_text(
+        'from .core import register_plugin\n'
+        '@register_plugin("plain_test", "run")\n'
+        'def plain_test(context, api):\n'
+        '    return 1\n'
+    )
+    assert plugins._scan_plugin_file(plain_file) == [{"name": "plain_test", "scope": "run"}]
+
+    # Arguments left out of the decorator get the same defaults as an imported registration
+    _global_registry.register_lazy(module="plugins.plain_plugin", **plugins._scan_plugin_file(plain_file)[0])
+    try:
+        info = _global_registry.get_plugin("plain_test")
+        assert (info.description, info.settings_schema, info.tags) == ("", {}, [])
+    finally:
+        _global_registry.unregister("plain_test")
+
+
+def test_lazy_plugin_imports_module_on_first_use():
+    """Test that a lazily registered plugin is replaced by the real one when its function is requested."""
+    def lazy_test(context, api):
+        return "loaded"
+
+    def import_module(module):
+        assert module == "plugins.lazy_test_plugin"
+        register_plugin("lazy_test", "run", "Lazy test plugin")(lazy_test)
+
+    _global_registry.register_lazy("lazy_test", "plugins.lazy_test_plugin", "run", description="Lazy test plugin")
+    try:
+        assert _global_registry.get_plugin("lazy_test").function is None
+        with patch("plugins.core.registry.importlib.import_module", side_effect=import_module) as mock_import:
+            assert _global_registry.get_plugin_function("lazy_test") is lazy_test
+            assert _global_registry.get_plugin_function("lazy_test") is lazy_test
+        mock_import.assert_called_once()
+    finally:
+        _global_registry.unregister("lazy_test")
+
+
 def test_plugin_function_execution():
     """Test that plugin functions can be executed."""
     
@@ -174,6 +332,478 @@ def test_multiple_plugin_registration():
     assert info_two.description == "Second plugin"
 
 
+def test_parent_yaml_is_cached_until_modified(tmp_path):
+    """Test that parent YAML files are parsed once, never modified by merges and reloaded when changed."""
+    from plugins.core import api as api_module
+    from utils import yaml_tools
+
+    yaml_file = tmp_path / "config.yaml"
+    yaml_file.write_text("behaviors:\n  Agent:\n    batch_size: 512  # tuned\n")
+
+    with patch("utils.yaml_tools.load_yaml_with_comments", wraps=yaml_tools.load_yaml_with_comments) as mock_load:
+        first, _ = api_module._cached_load_yaml(str(yaml_file))
+        merged = yaml_tools.merge_hyperparameters_into_config(first, {"batch_size": 1024})
+        yaml_tools.deep_merge_dict(first, {"behaviors": {"Agent": {"batch_size": 2048}}})
+        second, handler = api_module._cached_load_yaml(str(yaml_file))
+        assert mock_load.call_count == 1
+        # Merging copies the changed parts, the shared cached config stays intact
+        assert second["behaviors"]["Agent"]["batch_size"] == 512
+        assert "# tuned" in api_module._dump_yaml(second, handler)
+        assert "# tuned" in api_module._dump_yaml(merged, handler)
+
+        yaml_file.write_text("behaviors:\n  Agent:\n    batch_size: 2048  # retuned\n")
+        third, _ = api_module._cached_load_yaml(str(yaml_file))
+        assert mock_load.call_count == 2
+        assert third["behaviors"]["Agent"]["batch_size"] == 2048
+
+
+def test_mutate_config_scales_numbers_only():
+    """Test that mutation scales numeric values by at most 20% and leaves other values and the input alone."""
+    with patch('plugins.core.api.get_db'):
+        api = PluginAPI(PluginContext(plugin_name="test_plugin", scope="experiment",
+                                      target_id="test_exp_id", settings={}))
+    base_config = {"batch_size": 1000, "learning_rate": 0.5, "no_graphics": True, "name": "ppo"}
+
+    mutated = api.mutate_config(base_config, mutation_rate=1.0)
+
+    assert base_config == {"batch_size": 1000, "learning_rate": 0.5, "no_graphics": True, "name": "ppo"}
+    assert isinstance(mutated["batch_size"], int) and 800 <= mutated["batch_size"] <= 1200
+    assert 0.4 <= mutated["learning_rate"] <= 0.6
+    assert mutated["no_graphics"] is True
+    assert mutated["name"] == "ppo"
+
+
+def test_run_logs_return_last_lines(tmp_path):
+    """Test that get_logs returns the last lines of the run's stdout log."""
+    from plugins.core.api import SimpleRun
+
+    log_file = tmp_path / "stdout.log"
+    log_file.write_text("".join(f"step {i}\n" for i in range(5000)))
+
+    with patch('plugins.core.api.get_db') as mock_get_db:
+        mock_get_db.return_value.runs.find_one.return_value = {"_id": "run_1", "stdout_log_path": str(log_file)}
+        api = PluginAPI(PluginContext(plugin_name="test_plugin", scope="run", target_id="run_1", settings={}))
+        run = SimpleRun("run_1", api)
+
+        assert run.get_logs(3) == ["step 4997", "step 4998", "step 4999"]
+        assert len(run.get_logs(2000)) == 2000
+        assert run.get_logs(10000)[0] == "step 0"
+
+
+def test_experiment_data_is_projected(mock_db):
+    """Test that experiment data only carries the selected fields and can be returned as columns."""
+    mock_db.experiments.insert_one({"_id": "exp_1", "name": "Exp"})
+    mock_db.runs.insert_many([
+        {"_id": "run_1", "experiment_id": "exp_1", "status": "completed", "plugin_notes": ["note"]},
+        {"_id": "run_2", "experiment_id": "exp_1", "status": "failed", "plugin_notes": []},
+    ])
+
+    with patch('plugins.core.api.get_db', return_value=mock_db):
+        api = PluginAPI(PluginContext(plugin_name="test_plugin", scope="experiment", target_id="exp_1", settings={}))
+        data = api.get_experiment_data()
+        columns = api.get_experiment_data(fields={"runs": {"status": 1}}, as_arrays=True)
+
+    assert data["experiment"]["name"] == "Exp"
+    assert all("plugin_notes" not in run for run in data["runs"])
+    assert columns["runs"] == {"_id": ["run_1", "run_2"], "status": ["completed", "failed"]}
+    assert columns["revisions"]["_id"] == []
+
+
+def test_notes_are_buffered_until_flushed():
+    """Test that notes are written in one batch, in order, once the threshold is reached or on flush."""
+    with patch('plugins.core.api.get_db') as mock_get_db:
+        mock_db = mock_get_db.return_value
+        api = PluginAPI(PluginContext(plugin_name="test_plugin", scope="experiment", target_id="exp_1", settings={}))
+        for i in range(api.NOTE_FLUSH_THRESHOLD - 1):
+            api.add_note(f"note {i}")
+        mock_db.experiments.bulk_write.assert_not_called()
+
+        api.add_note("last")
+        (update,), _ = mock_db.experiments.bulk_write.call_args
+        notes = update[0]._doc["$push"]["plugin_notes"]["$each"]
+        assert update[0]._filter == {"_id": "exp_1"}
+        assert len(notes) == api.NOTE_FLUSH_THRESHOLD
+        assert notes[0].endswith("test_plugin: note 0") and notes[-1].endswith("test_plugin: last")
+        assert datetime.fromisoformat(notes[0][1:notes[0].index("]")]).tzinfo is not None
+
+        api.add_note("pending")
+        api.flush_notes()
+        assert mock_db.experiments.bulk_write.call_count == 2
+        api.flush_notes()
+        assert mock_db.experiments.bulk_write.call_count == 2
+
+
+def test_execution_states_are_written_behind_in_batches():
+    """Test that queued execution states are coalesced per execution and saved in one bulk write."""
+    from plugins.core.runner import SimplePluginRunner, PluginExecution, PluginStatus
+
+    with patch('plugins.core.runner.plugin_executions') as mock_executions:
+        runner = SimplePluginRunner()
+        runner._flusher = MagicMock()  # flushed explicitly below instead of by the background thread
+        first = PluginExecution(plugin_name="test_plugin", target_id="exp_1", scope="experiment")
+        second = PluginExecution(plugin_name="test_plugin", target_id="exp_2", scope="experiment")
+
+        runner._save_execution_to_db("exec_1", first)
+        first.status = PluginStatus.COMPLETED
+        first.error_message = "boom"
+        runner._save_execution_to_db("exec_1", first)
+        runner._save_execution_to_db("exec_2", second)
+        mock_executions.collection.bulk_write.assert_not_called()
+
+        runner.flush_executions()
+        (updates,), _ = mock_executions.collection.bulk_write.call_args
+        assert [update._filter for update in updates] == [{"execution_id": "exec_1"}, {"execution_id": "exec_2"}]
+        assert updates[0]._doc["$set"]["status"] == "completed"
+        assert updates[0]._doc["$set"]["error_message"] == "boom"
+        assert all(update._upsert for update in updates)
+
+        runner.flush_executions()
+        assert mock_executions.collection.bulk_write.call_count == 1
+
+
+def test_executions_are_indexed_by_target():
+    """Test that target lookups only see the target's executions, also after cleanup."""
+    from plugins.core.runner import SimplePluginRunner, PluginStatus
+
+    register_plugin("target_index_plugin", "run", "Target index plugin")(lambda context, api: None)
+    try:
+        runner = SimplePluginRunner()
+        with patch.object(runner, "_run_plugin"), patch.object(runner, "_generate_execution_id", side_effect=["e1", "e2", "e3"]):
+            runner.start_plugin("target_index_plugin", "run_1", "run")
+            runner.start_plugin("target_index_plugin", "run_2", "run")
+            runner.start_plugin("target_index_plugin", "run_1", "run")
+
+        assert [e.target_id for e in runner.get_executions_for_target("run_1")] == ["run_1", "run_1"]
+        assert runner.get_executions_for_target("run_1", scope="experiment") == []
+        assert runner.get_executions_for_target("missing") == []
+
+        for execution in runner.get_executions_for_target("run_1"):
+            execution.status = PluginStatus.COMPLETED
+            execution.completed_at = datetime(2000, 1, 1, tzinfo=timezone.utc)
+        runner.cleanup_completed_executions()
+        assert runner.get_executions_for_target("run_1") == []
+        assert len(runner.get_executions_for_target("run_2")) == 1
+    finally:
+        _global_registry.unregister("target_index_plugin")
+
+
+def test_finished_executions_read_from_db_are_cached():
+    """Test that finished executions are read from the database once, and running ones every time."""
+    from plugins.core.runner import SimplePluginRunner
+
+    with patch('plugins.core.runner.plugin_executions') as mock_executions:
+        find_one = mock_executions.collection.find_one
+        runner = SimplePluginRunner()
+
+        find_one.return_value = {"execution_id": "done", "status": "completed"}
+        assert runner.get_execution("done") == runner.get_execution("done")
+        assert find_one.call_count == 1
+
+        find_one.return_value = {"execution_id": "busy", "status": "running"}
+        runner.get_execution("busy")
+        runner.get_execution("busy")
+        assert find_one.call_count == 3
+
+        with patch.object(runner, "DB_CACHE_TTL", 0):
+            runner.get_execution("done")
+        assert find_one.call_count == 4
+
+
+def test_run_status_checks_share_one_query():
+    """Test that consecutive status checks of a run reuse one query until refreshed."""
+    from plugins.core.api import SimpleRun
+
+    with patch('plugins.core.api.get_db') as mock_get_db:
+        find_one = mock_get_db.return_value.runs.find_one
+        find_one.return_value = {"_id": "run_1", "status": "completed", "cli_flags": {"time_scale": 20}}
+        api = PluginAPI(PluginContext(plugin_name="test_plugin", scope="experiment", target_id="exp_1", settings={}))
+        run = SimpleRun("run_1", api)
+
+        assert not run.is_running()
+        assert run.is_completed()
+        assert run.get_status() == "completed"
+        assert run.config == {"time_scale": 20}
+        assert find_one.call_count == 1
+
+        find_one.return_value = {"_id": "run_1", "status": "running"}
+        run.refresh()
+        assert run.is_running()
+        assert find_one.call_count == 2
+
+
+def test_wait_for_steps_follows_run_log(tmp_path):
+    """Test that waiting for steps returns once the run's log reports enough training steps."""
+    from plugins.core.api import SimpleRun
+
+    log_file = tmp_path / "stdout.log"
+    log_file.write_text("[INFO] Agent. Step: 1000. Time Elapsed: 10.0 s. Mean Reward: 0.1\n")
+    progress = iter([2000, 3000, 4000])
+
+    def train(seconds):
+        with open(log_file, "a") as f:
+            f.write(f"[INFO] Agent. Step: {next(progress)}. Time Elapsed: 20.0 s. Mean Reward: 0.2\n")
+
+    with patch('plugins.core.api.get_db') as mock_get_db, \
+         patch('plugins.core.api.time.sleep', side_effect=train) as mock_sleep:
+        mock_get_db.return_value.runs.find_one.return_value = {
+            "_id": "run_1", "status": "running", "stdout_log_path": str(log_file)
+        }
+        api = PluginAPI(PluginContext(plugin_name="test_plugin", scope="run", target_id="run_1", settings={}))
+        run = SimpleRun("run_1", api)
+        api.wait(steps=2000, run=run)
+
+    assert run.get_step() == 3000
+    assert mock_sleep.call_count == 2
+
+
+def test_wait_for_steps_counts_from_the_first_reported_step(tmp_path):
+    """Test that a run with no step reported yet is waited on from its first step, not from 0."""
+    from plugins.core.api import SimpleRun
+
+    log_file = tmp_path / "stdout.log"
+    log_file.write_text("[INFO] Connected to Unity environment\n")
+    progress = iter([5000, 6000, 7000, 8000])
+
+    def train(seconds):
+        with open(log_file, "a") as f:
+            f.write(f"[INFO] Agent. Step: {next(progress)}. Time Elapsed: 20.0 s. Mean Reward: 0.2\n")
+
+    with patch('plugins.core.api.get_db') as mock_get_db, \
+         patch('plugins.core.api.time.sleep', side_effect=train) as mock_sleep:
+        mock_get_db.return_value.runs.find_one.return_value = {
+            "_id": "run_1", "status": "running", "stdout_log_path": str(log_file)
+        }
+        api = PluginAPI(PluginContext(plugin_name="test_plugin", scope="run", target_id="run_1", settings={}))
+        run = SimpleRun("run_1", api)
+        api.wait(steps=2000, run=run)
+
+    assert run.get_step() == 7000
+    assert mock_sleep.call_count == 3
+
+
+def test_wait_for_completion_polls_all_runs_in_one_query():
+    """Test that waiting polls all runs with one query per tick when change streams are unavailable."""
+    from pymongo.errors import OperationFailure
+    from plugins.core.api import SimpleRun
+
+    with patch('plugins.core.api.get_db') as mock_get_db, \
+         patch('plugins.core.api.time.sleep') as mock_sleep:
+        mock_db = MagicMock()
+        mock_db.runs.watch.side_effect = OperationFailure("The $changeStream stage is only supported on replica sets")
+        mock_db.runs.find_one.side_effect = [{"_id": "run_1"}, {"_id": "run_2"}, None]
+        mock_get_db.return_value = mock_db
+
+        api = PluginAPI(PluginContext(plugin_name="test_plugin", scope="experiment",
+                                      target_id="test_exp_id", settings={}))
+        api.wait_for_completion([SimpleRun(f"run_{i}", api) for i in range(32)])
+
+    assert mock_db.runs.find_one.call_count == 3
+    assert mock_db.runs.find_one.call_args[0][0]["_id"] == {"$in": [f"run_{i}" for i in range(32)]}
+    assert [c.args[0] for c in mock_sleep.call_args_list] == [2, 4]
+
+
+def test_parent_yaml_without_comments_uses_plain_objects(tmp_path):
+    """Test that YAML files without comments are loaded as plain objects and dumped without ruamel."""
+    from plugins.core import api as api_module
+
+    yaml_file = tmp_path / "config.yaml"
+    yaml_file.write_text("behaviors:\n  Agent:\n    learning_rate: 3.0e-4\n    threaded: \"yes\"\n")
+
+    config, handler = api_module._cached_load_yaml(str(yaml_file))
+
+    assert handler is None
+    assert type(config["behaviors"]["Agent"]) is dict
+    assert type(config["behaviors"]["Agent"]["learning_rate"]) is float
+    dumped = api_module._dump_yaml(config)
+    assert dumped.startswith("behaviors:\n  Agent:\n    learning_rate: 0.0003\n")
+    assert api_module.yaml_lib.safe_load(dumped) == config
+
+
+def test_plugin_execution_ttl_index_follows_retention_setting():
+    """Test that a changed retention updates the existing TTL index without blocking the other indexes."""
+    from pymongo.errors import OperationFailure
+    from plugins.core.database import PluginExecutionsCollection
+
+    with patch('db.get_db') as mock_get_db:
+        executions = PluginExecutionsCollection()
+    collection = executions.collection
+    collection.name = "plugin_executions"
+    collection.create_index.side_effect = OperationFailure("Index already exists with different options", code=85)
+
+    executions.ensure_indexes()
+
+    assert len(collection.create_indexes.call_args[0][0]) == 3
+    collection.create_index.assert_called_once_with(
+        [("completed_at", 1)], expireAfterSeconds=PluginExecutionsCollection.RETENTION_SECONDS
+    )
+    mock_get_db.return_value.command.assert_called_once_with({
+        "collMod": "plugin_executions",
+        "index": {"keyPattern": {"completed_at": 1}, "expireAfterSeconds": PluginExecutionsCollection.RETENTION_SECONDS},
+    })
+
+
+def test_unchanged_execution_status_is_not_rewritten(mock_db):
+    """Test that repeating a status matches nothing, and what update_status returns."""
+    from plugins.core.database import PluginExecutionsCollection
+
+    with patch('db.get_db', return_value=mock_db):
+        executions = PluginExecutionsCollection()
+    mock_db.plugin_executions.insert_one({"execution_id": "e1", "status": "pending"})
+
+    assert executions.update_status("e1", "running") is True
+    assert executions.update_status("e1", "running") is False
+    assert executions.update_status("missing", "running") is False
+    # With an error message or metadata the document is written even if the status is the same
+    assert executions.update_status("e1", "running", metadata={"step": 1}) is True
+    assert mock_db.plugin_executions.find_one({"execution_id": "e1"})["metadata"] == {"step": 1}
+
+    with patch.object(executions, "collection") as mock_collection:
+        mock_collection.update_one.return_value.modified_count = 0
+        executions.update_status("e1", "running")
+        assert mock_collection.update_one.call_args[0][0] == {"execution_id": "e1", "status": {"$ne": "running"}}
+        executions.update_status("e1", "running", error_message="boom")
+        assert mock_collection.update_one.call_args[0][0] == {"execution_id": "e1"}
+
+
+def test_unacknowledged_status_update_returns_true(mock_db):
+    """Test that acknowledged=False writes through the w=0 collection and reports True without a result."""
+    from plugins.core.database import PluginExecutionsCollection
+
+    with patch('db.get_db', return_value=mock_db):
+        executions = PluginExecutionsCollection()
+
+    assert executions._unacknowledged.write_concern.acknowledged is False
+    with patch.object(executions, "_unacknowledged") as mock_unacknowledged, \
+         patch.object(executions, "collection") as mock_collection:
+        mock_unacknowledged.update_one.return_value.modified_count = 0
+        assert executions.update_status("missing", "running", acknowledged=False) is True
+    mock_unacknowledged.update_one.assert_called_once()
+    mock_collection.update_one.assert_not_called()
+
+
+def test_execution_timestamps_are_set_by_the_server(mock_db):
+    """Test that status updates send $currentDate instead of client timestamps, also unacknowledged."""
+    from plugins.core.database import PluginExecutionsCollection
+
+    with patch('db.get_db', return_value=mock_db):
+        executions = PluginExecutionsCollection()
+    mock_db.plugin_executions.insert_one({"execution_id": "e1", "status": "running"})
+
+    with patch.object(executions, "collection", wraps=executions.collection) as spy:
+        executions.update_status("e1", "completed")
+    update = spy.update_one.call_args[0][1]
+    assert update == {"$set": {"status": "completed"}, "$currentDate": {"updated_at": True, "completed_at": True}}
+    doc = mock_db.plugin_executions.find_one({"execution_id": "e1"})
+    assert isinstance(doc["updated_at"], datetime) and isinstance(doc["completed_at"], datetime)
+
+    # The w=0 collection writes the same document without the server acknowledging it
+    assert executions._unacknowledged.write_concern.document == {"w": 0}
+    executions.update_status("e1", "running", acknowledged=False)
+    doc = mock_db.plugin_executions.find_one({"execution_id": "e1"})
+    assert doc["status"] == "running" and doc["updated_at"] >= doc["completed_at"]
+
+
+def test_bulk_plugin_helpers_batch_their_writes():
+    """Test that bulk enables push all plugins in one update and notes are grouped per target and collection."""
+    from pymongo import UpdateOne
+    from plugins.core import database
+
+    with patch.object(database, "experiments") as mock_experiments:
+        database.add_plugins_to_experiment_bulk("exp_1", {"a": {"x": 1}, "b": None})
+    query, update = mock_experiments.collection.update_one.call_args[0]
+    assert query == {"_id": "exp_1"}
+    pushed = update["$push"]["enabled_plugins"]["$each"]
+    assert [(p["name"], p["settings"], p["enabled"]) for p in pushed] == [("a", {"x": 1}, True), ("b", {}, True)]
+    assert pushed[0]["enabled_at"] == pushed[1]["enabled_at"] == update["$set"]["updated_at"]
+
+    mock_experiments, mock_runs = MagicMock(), MagicMock()
+    with patch.dict(database._NOTE_TARGETS, {"experiment": mock_experiments, "run": mock_runs}):
+        database.add_plugin_notes_bulk([
+            ("run_1", "run", "p", "first"),
+            ("run_2", "run", "p", "second"),
+            ("run_1", "run", "p", "third"),
+            ("exp_1", "experiment", "p", "only"),
+        ])
+
+    # A single target is one update_one, several targets one unordered bulk_write
+    query, update = mock_experiments.collection.update_one.call_args[0]
+    assert query == {"_id": "exp_1"}
+    assert [n["content"] for n in update["$push"]["plugin_notes"]["$each"]] == ["only"]
+    mock_experiments.collection.bulk_write.assert_not_called()
+    mock_runs.collection.update_one.assert_not_called()
+    requests = mock_runs.collection.bulk_write.call_args[0][0]
+    assert mock_runs.collection.bulk_write.call_args[1] == {"ordered": False}
+    timestamp = update["$push"]["plugin_notes"]["$each"][0]["timestamp"]
+
+    def push(*contents):
+        notes = [{"plugin_name": "p", "content": content, "timestamp": timestamp} for content in contents]
+        return {"$push": {"plugin_notes": {"$each": notes, "$slice": -database.MAX_PLUGIN_NOTES}}}
+
+    assert requests == [
+        UpdateOne({"_id": "run_1"}, push("first", "third")),
+        UpdateOne({"_id": "run_2"}, push("second")),
+    ]
+
+
+def test_plugin_notes_keep_only_the_newest(mock_db):
+    """Test that pushing past MAX_PLUGIN_NOTES drops the oldest notes, from the API buffer and the database helper."""
+    from plugins.core import database
+
+    mock_db.experiments.insert_one({"_id": "exp_1"})
+    mock_db.runs.insert_one({"_id": "run_1"})
+    total = database.MAX_PLUGIN_NOTES + 20
+
+    def apply_updates(requests, ordered=True):
+        # mongomock's bulk_write doesn't take pymongo's UpdateOne, apply them one by one
+        for request in requests:
+            mock_db.experiments.update_one(request._filter, request._doc)
+
+    with patch('plugins.core.api.get_db') as mock_get_db:
+        mock_get_db.return_value.experiments.bulk_write.side_effect = apply_updates
+        api = PluginAPI(PluginContext(plugin_name="test_plugin", scope="experiment", target_id="exp_1", settings={}))
+        for i in range(total):
+            api.add_note(f"note {i}")
+        api.flush_notes()
+    notes = mock_db.experiments.find_one({"_id": "exp_1"})["plugin_notes"]
+    assert len(notes) == database.MAX_PLUGIN_NOTES
+    assert notes[0].endswith("test_plugin: note 20") and notes[-1].endswith(f"test_plugin: note {total - 1}")
+
+    run_target = MagicMock(collection=mock_db.runs)
+    with patch.dict(database._NOTE_TARGETS, {"run": run_target}):
+        database.add_plugin_notes_bulk([("run_1", "run", "p", f"note {i}") for i in range(total - 1)])
+        database.add_plugin_note("run_1", "run", "p", f"note {total - 1}")
+    notes = mock_db.runs.find_one({"_id": "run_1"})["plugin_notes"]
+    assert len(notes) == database.MAX_PLUGIN_NOTES
+    assert notes[0]["content"] == "note 20" and notes[-1]["content"] == f"note {total - 1}"
+
+
+def test_hinted_execution_lookups_fall_back_without_the_index(mock_db):
+    """Test that a missing hinted index makes the lookup retry unhinted and return the same documents."""
+    import mongomock
+    from pymongo.errors import OperationFailure
+    from plugins.core.database import PluginExecutionsCollection
+
+    with patch('db.get_db', return_value=mock_db):
+        executions = PluginExecutionsCollection()
+    mock_db.plugin_executions.insert_many([
+        {"execution_id": "e1", "target_id": "run_1", "scope": "run", "status": "running"},
+        {"execution_id": "e2", "target_id": "run_1", "scope": "run", "status": "completed"},
+        {"execution_id": "e3", "target_id": "run_2", "scope": "run", "status": "pending"},
+    ])
+    hinted = (executions.find_by_target("run_1", "run"), executions.find_active())
+
+    missing_index = OperationFailure("error processing query: planner returned error :: caused by :: "
+                                     "hint provided does not correspond to an existing index", code=2)
+    with patch.object(mongomock.collection.Cursor, "hint", side_effect=missing_index) as mock_hint:
+        fallback = (executions.find_by_target("run_1", "run"), executions.find_active())
+
+    assert mock_hint.call_count == 2
+    assert fallback == hinted
+    assert [doc["execution_id"] for doc in fallback[0]] == ["e1", "e2"]
+    assert [doc["execution_id"] for doc in fallback[1]] == ["e1", "e3"]
+    assert all("_id" not in doc for doc in fallback[1])
+
+
 class TestPluginAPIRevisionMethods:
     """Test cases for PluginAPI revision creation methods using RevisionsService."""
 
@@ -308,6 +938,35 @@ class TestPluginAPIRevisionMethods:
         assert merge_call_args[0][1] == {"learning_rate": 0.001}
         assert merge_call_args[0][2] == "SpecificAgent"
 
+    @patch('utils.file_tools.ensure_workspace_path')
+    @patch('utils.yaml_tools.load_yaml_with_comments')
+    @patch('utils.yaml_tools.merge_hyperparameters_into_config')
+    @patch('utils.yaml_tools.validate_mlagents_config')
+    def test_unchanged_hyperparameters_reuse_revision(
+        self, mock_validate, mock_merge, mock_load_yaml, mock_ensure_path,
+        plugin_context, mock_revisions_service, mock_db_collections
+    ):
+        """Test that reapplying the same hyperparameters returns the revision they already produced."""
+        mock_ensure_path.return_value = "/workspace/config.yaml"
+        mock_yaml_handler = MagicMock()
+        mock_yaml_handler.dump = lambda data, stream: stream.write("behaviors: {}\n")
+        mock_load_yaml.return_value = ({"behaviors": {}}, mock_yaml_handler)
+        mock_merge.return_value = {"behaviors": {}}
+
+        api = PluginAPI(plugin_context)
+        first = api.create_revision_with_hyperparameters(name="Gen 1", hyperparameters={"learning_rate": 0.001})
+        # The new revision is now the latest one, reapplying the values to it changes nothing
+        mock_db_collections.revisions.find_one.return_value = {
+            **mock_db_collections.revisions.find_one.return_value, "_id": first
+        }
+        second = api.create_revision_with_hyperparameters(name="Gen 2", hyperparameters={"learning_rate": 0.001})
+        assert second == first
+        mock_revisions_service.create_revision.assert_called_once()
+
+        api.create_revision_with_hyperparameters(name="Gen 3", hyperparameters={"learning_rate": 0.001}, force=True)
+        api.create_revision_with_hyperparameters(name="Gen 4", hyperparameters={"learning_rate": 0.002})
+        assert mock_revisions_service.create_revision.call_count == 3
+
     def test_create_revision_with_hyperparameters_no_parent_revision(
         self, plugin_context, mock_revisions_service, mock_db_collections
     ):
@@ -324,6 +983,32 @@ class TestPluginAPIRevisionMethods:
 
         assert "No parent revision found" in str(exc_info.value)
 
+    @patch('utils.file_tools.ensure_workspace_path')
+    @patch('utils.yaml_tools.load_yaml_with_comments')
+    @patch('utils.yaml_tools.merge_hyperparameters_into_config')
+    @patch('utils.yaml_tools.validate_mlagents_config')
+    def test_repeated_revisions_reuse_experiment_lookup(
+        self, mock_validate, mock_merge, mock_load_yaml, mock_ensure_path,
+        plugin_context, mock_revisions_service, mock_db_collections
+    ):
+        """Test that the experiment is read once per execution and the latest revision after each creation."""
+        mock_ensure_path.return_value = "/workspace/config.yaml"
+        mock_yaml_handler = MagicMock()
+        mock_yaml_handler.dump = lambda data, stream: stream.write("behaviors: {}\n")
+        mock_load_yaml.return_value = ({"behaviors": {}}, mock_yaml_handler)
+        mock_merge.return_value = {"behaviors": {}}
+
+        api = PluginAPI(plugin_context)
+        for generation in range(3):
+            api.create_revision_with_hyperparameters(
+                name=f"Gen {generation}",
+                hyperparameters={"learning_rate": 0.001 * (generation + 1)}
+            )
+
+        assert mock_db_collections.experiments.find_one.call_count == 1
+        # Creating a revision invalidates the cached latest revision
+        assert mock_db_collections.revisions.find_one.call_count == 3
+
     @patch('utils.file_tools.ensure_workspace_path')
     @patch('utils.yaml_tools.load_yaml_with_comments')
     @patch('utils.yaml_tools.deep_merge_dict')
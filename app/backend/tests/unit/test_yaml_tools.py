@@ -15,6 +15,9 @@ from utils.yaml_tools import (
     merge_hyperparameters_into_config,
     load_yaml_with_comments,
     save_yaml_with_comments,
+    has_comments,
+    new_yaml_handler,
+    to_plain_config,
 )
 
 
@@ -246,6 +249,27 @@ class TestYamlFileOperations:
         finally:
             os.unlink(temp_path)
 
+    @pytest.mark.parametrize("text,commented", [
+        ("key: value\nnested:\n  item: 123\n", False),
+        ("# Comment\nkey: value\n", True),
+        ("key: value  # inline\n", True),
+        ("nested:\n  items:\n  - 1  # in a list\n", True),
+    ])
+    def test_has_comments(self, text, commented):
+        """Test that comments are found at any depth."""
+        assert has_comments(new_yaml_handler().load(text)) == commented
+
+    def test_to_plain_config(self):
+        """Test that round-trip types are converted to builtin types."""
+        config = new_yaml_handler().load('a:\n  b: 3.0e-4\n  c: "quoted"\n  d: [1, 0o17]\n  e: true\n')
+
+        plain = to_plain_config(config)
+
+        assert plain == {"a": {"b": 0.0003, "c": "quoted", "d": [1, 15], "e": True}}
+        assert type(plain["a"]) is dict and type(plain["a"]["d"]) is list
+        assert [type(v) for v in plain["a"].values()][:2] == [float, str]
+        assert type(plain["a"]["d"][1]) is int
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -8,6 +8,11 @@ from typing import Dict, List, Any
 from db import experiments, revisions, runs, environments
 
 
+# Only the fields reported in warnings are fetched
+REVISION_FIELDS = {"name": 1, "experiment_id": 1}
+RUN_FIELDS = {"name": 1, "status": 1}
+
+
 class DependencyWarning:
     """Represents a warning about dependencies that will be affected."""
 
@@ -38,7 +43,7 @@ def check_environment_dependencies(environment_id: str) -> List[DependencyWarnin
     warnings = []
 
     # Check for revisions using this environment
-    dependent_revisions = revisions.find_many({"environment_id": environment_id})
+    dependent_revisions = revisions.find_many({"environment_id": environment_id}, projection=REVISION_FIELDS)
 
     if dependent_revisions:
         revision_info = [
@@ -73,7 +78,7 @@ def check_revision_dependencies(revision_id: str) -> List[DependencyWarning]:
     warnings = []
 
     # Check for child revisions
-    child_revisions = revisions.find_many({"parent_revision_id": revision_id})
+    child_revisions = revisions.find_many({"parent_revision_id": revision_id}, projection=REVISION_FIELDS)
 
     if child_revisions:
         revision_info = [
@@ -93,7 +98,7 @@ def check_revision_dependencies(revision_id: str) -> List[DependencyWarning]:
         ))
 
     # Check for child runs
-    child_runs = runs.find_many({"parent_revision_id": revision_id})
+    child_runs = runs.find_many({"parent_revision_id": revision_id}, projection=RUN_FIELDS)
 
     if child_runs:
         run_info = [
@@ -128,7 +133,7 @@ def check_run_dependencies(run_id: str) -> List[DependencyWarning]:
     warnings = []
 
     # Check for revisions based on this run
-    dependent_revisions = revisions.find_many({"parent_run_id": run_id})
+    dependent_revisions = revisions.find_many({"parent_run_id": run_id}, projection=REVISION_FIELDS)
 
     if dependent_revisions:
         revision_info = [
@@ -148,7 +153,7 @@ def check_run_dependencies(run_id: str) -> List[DependencyWarning]:
         ))
 
     # Check for child runs
-    child_runs = runs.find_many({"parent_run_id": run_id})
+    child_runs = runs.find_many({"parent_run_id": run_id}, projection=RUN_FIELDS)
 
     if child_runs:
         run_info = [
@@ -183,7 +188,7 @@ def check_experiment_dependencies(experiment_id: str) -> List[DependencyWarning]
     warnings = []
 
     # Check for revisions
-    experiment_revisions = revisions.find_many({"experiment_id": experiment_id})
+    experiment_revisions = revisions.find_many({"experiment_id": experiment_id}, projection=REVISION_FIELDS)
 
     if experiment_revisions:
         revision_info = [
@@ -202,7 +207,7 @@ def check_experiment_dependencies(experiment_id: str) -> List[DependencyWarning]
         ))
 
     # Check for runs
-    experiment_runs = runs.find_many({"experiment_id": experiment_id})
+    experiment_runs = runs.find_many({"experiment_id": experiment_id}, projection=RUN_FIELDS)
 
     if experiment_runs:
         run_info = [
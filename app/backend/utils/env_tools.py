@@ -23,6 +23,9 @@ SUPPORTED_FORMATS = {
     '.tar': 'tar'
 }
 
+# Archives are copied to disk in 1 MiB chunks, shutil's default is 64 KiB
+COPY_CHUNK_SIZE = 1024 * 1024
+
 class EnvExtractionError(Exception):
     """Exception raised when environment extraction fails"""
     pass
@@ -66,7 +69,7 @@ def save_compressed_file(upload_file: UploadFile, env_base_dir: str) -> str:
     
     try:
         with open(compressed_file_path, "wb") as buffer:
-            shutil.copyfileobj(upload_file.file, buffer)
+            shutil.copyfileobj(upload_file.file, buffer, COPY_CHUNK_SIZE)
         
         logger.info(f"Saved compressed file: {compressed_file_path}")
         return compressed_file_path
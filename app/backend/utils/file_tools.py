@@ -421,6 +421,44 @@ def get_revision_path(experiment_id, revision_id, experiment_name=None, revision
     
     return f"experiments/{exp_dir_name}/revisions/{rev_dir_name}"
 
+def tail_file_lines(file_path: str, max_lines: int = 100, errors: str = "replace",
+                    chunk_size: int = 8192) -> List[str]:
+    """
+    Read the last N lines of a file without reading the whole file.
+    
+    Blocks are read backwards from the end of the file, doubling in size,
+    until enough line breaks are found, so the cost depends on the length of
+    the tail and not on the size of the file.
+    
+    Args:
+        file_path (str): Path to the file
+        max_lines (int): Maximum number of lines to return
+        errors (str): How undecodable UTF-8 bytes are handled
+        chunk_size (int): Size of the first block read from the end
+        
+    Returns:
+        List[str]: Last lines of the file, without line breaks
+    """
+    if max_lines <= 0:
+        return []
+    
+    with open(file_path, "rb") as f:
+        position = f.seek(0, os.SEEK_END)
+        data = b""
+        read_size = chunk_size
+        # One more line break than lines wanted, so the first kept line is complete
+        while position > 0 and data.count(b"\n") <= max_lines:
+            read_size = min(read_size, position)
+            position -= read_size
+            f.seek(position)
+            data = f.read(read_size) + data
+            read_size *= 2
+    
+    lines = data.split(b"\n")
+    if lines[-1] == b"":
+        lines.pop()  # Final line break
+    return [line.decode("utf-8", errors) for line in lines[-max_lines:]]
+
 class LogStreamer:
     """Unified log file streaming utility with tailing and status checking"""
     
@@ -449,9 +487,7 @@ class LogStreamer:
             if not os.path.exists(self.log_path):
                 return []
             
-            with open(self.log_path, 'r', encoding='utf-8', errors='ignore') as f:
-                lines = f.readlines()
-                return [line.rstrip() for line in lines[-max_lines:]]
+            return [line.rstrip() for line in tail_file_lines(self.log_path, max_lines, errors='ignore')]
         except Exception:
             return []
     
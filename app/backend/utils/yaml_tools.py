@@ -11,6 +11,8 @@ Provides tools for:
 import yaml
 from typing import Dict, Any, Optional, List
 from ruamel.yaml import YAML
+from ruamel.yaml.comments import CommentedBase
+from ruamel.yaml.scalarbool import ScalarBoolean
 import copy
 import logging
 
@@ -30,6 +32,15 @@ def ensure_yaml(text: str) -> str:
 	return text
 
 
+def new_yaml_handler() -> YAML:
+	"""Create the comment-preserving YAML handler used to load and dump configs."""
+	yaml_handler = YAML()
+	yaml_handler.preserve_quotes = True
+	yaml_handler.default_flow_style = False
+	yaml_handler.width = 4096  # Prevent line wrapping
+	return yaml_handler
+
+
 def load_yaml_with_comments(file_path: str) -> tuple:
 	"""
 	Load YAML file preserving comments and formatting.
@@ -37,10 +48,7 @@ def load_yaml_with_comments(file_path: str) -> tuple:
 	Returns:
 		tuple: (config_dict, yaml_handler) for later saving with preserved comments
 	"""
-	yaml_handler = YAML()
-	yaml_handler.preserve_quotes = True
-	yaml_handler.default_flow_style = False
-	yaml_handler.width = 4096  # Prevent line wrapping
+	yaml_handler = new_yaml_handler()
 
 	try:
 		with open(file_path, 'r') as f:
@@ -54,6 +62,36 @@ def load_yaml_with_comments(file_path: str) -> tuple:
 		return config, yaml_handler
 
 
+def has_comments(node: Any) -> bool:
+	"""Check whether a config loaded by load_yaml_with_comments carries any comment."""
+	if isinstance(node, CommentedBase):
+		ca = node.ca
+		if ca.comment or ca.items or getattr(ca, 'end', None):
+			return True
+	if isinstance(node, dict):
+		return any(has_comments(value) for value in node.values())
+	if isinstance(node, list):
+		return any(has_comments(value) for value in node)
+	return False
+
+
+def to_plain_config(node: Any) -> Any:
+	"""Convert a round-trip (ruamel) config to plain dicts, lists and scalars."""
+	if isinstance(node, dict):
+		return {to_plain_config(key): to_plain_config(value) for key, value in node.items()}
+	if isinstance(node, list):
+		return [to_plain_config(value) for value in node]
+	if isinstance(node, ScalarBoolean):
+		return bool(node)
+	if isinstance(node, bool) or node is None:
+		return node
+	# ScalarFloat, ScalarInt, ScalarString... subclass the builtin types
+	for plain_type in (int, float, str):
+		if isinstance(node, plain_type):
+			return plain_type(node)
+	return node
+
+
 def save_yaml_with_comments(config: dict, file_path: str, yaml_handler: YAML = None):
 	"""
 	Save YAML file preserving comments and formatting.
@@ -86,14 +124,16 @@ def deep_merge_dict(base: Dict[str, Any], updates: Dict[str, Any]) -> Dict[str,
 		updates: Updates to merge into base
 
 	Returns:
-		Merged dictionary (base is not modified)
+		Merged dictionary (base is not modified). Only the dictionaries on the
+		path to an updated key are copied, the rest is shared with base.
 
 	Example:
 		base = {"a": {"b": 1, "c": 2}}
 		updates = {"a": {"c": 3, "d": 4}}
 		result = {"a": {"b": 1, "c": 3, "d": 4}}
 	"""
-	result = copy.deepcopy(base)
+	# copy() keeps the type and comments of ruamel's CommentedMap
+	result = base.copy()
 
 	for key, value in updates.items():
 		if key in result and isinstance(result[key], dict) and isinstance(value, dict):
@@ -135,7 +175,8 @@ def merge_hyperparameters_into_config(
 		behavior_name: Specific behavior to update, or None to update all behaviors
 
 	Returns:
-		Updated configuration with hyperparameters merged
+		Updated configuration with hyperparameters merged (base_config is not
+		modified, only the dictionaries on the path to the hyperparameters are copied)
 
 	Example:
 		config = merge_hyperparameters_into_config(
@@ -145,12 +186,13 @@ def merge_hyperparameters_into_config(
 		)
 		# Result: config["behaviors"]["EnemyBehavior"]["hyperparameters"]["learning_rate"] = 0.001
 	"""
-	result = copy.deepcopy(base_config)
+	result = base_config.copy()
 
 	# Ensure behaviors section exists
 	if "behaviors" not in result or not isinstance(result["behaviors"], dict):
 		logger.warning("Config has no 'behaviors' section, cannot merge hyperparameters")
 		return result
+	result["behaviors"] = result["behaviors"].copy()
 
 	# Determine which behaviors to update
 	if behavior_name:
@@ -163,11 +205,14 @@ def merge_hyperparameters_into_config(
 
 	# Merge hyperparameters into each behavior
 	for name in behavior_names:
-		if "hyperparameters" not in result["behaviors"][name]:
-			result["behaviors"][name]["hyperparameters"] = {}
+		behavior = result["behaviors"][name] = result["behaviors"][name].copy()
+		if "hyperparameters" not in behavior:
+			behavior["hyperparameters"] = {}
+		else:
+			behavior["hyperparameters"] = behavior["hyperparameters"].copy()
 
 		# Merge hyperparameters
-		result["behaviors"][name]["hyperparameters"].update(hyperparameters)
+		behavior["hyperparameters"].update(hyperparameters)
 		logger.debug(f"Merged hyperparameters into behavior '{name}': {hyperparameters}")
 
 	return result
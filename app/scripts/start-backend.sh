@@ -1,7 +1,10 @@
 #!/bin/bash
 cd /app/backend
+# uvloop and httptools come with uvicorn[standard]; ask for them explicitly so a
+# broken install fails at startup instead of silently falling back to asyncio/h11
+UVICORN_OPTS="--host 0.0.0.0 --port 8000 --loop uvloop --http httptools"
 if [ "$BACKEND_MODE" = "dev" ]; then
-    exec python3 -m uvicorn app:app --host 0.0.0.0 --port 8000 --reload
+    exec python3 -m uvicorn app:app $UVICORN_OPTS --reload
 else
-    exec python3 -m uvicorn app:app --host 0.0.0.0 --port 8000
+    exec python3 -m uvicorn app:app $UVICORN_OPTS
 fi